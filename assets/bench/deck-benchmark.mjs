@@ -0,0 +1,132 @@
+// Page-weight, heap and frame-time benchmark for a built Slidev SPA.
+// Run via scripts/benchmark_deck.py, which copies it into the deck's .temp/ so
+// Node resolves the deck's own playwright-chromium:
+//   node deck-benchmark.mjs <base-url> <slide-count> [variant=query ...]
+// Prints one JSON report on stdout.
+import { chromium } from 'playwright-chromium'
+
+const [baseUrl, slideArg, ...variantArgs] = process.argv.slice(2)
+const slideCount = Number.parseInt(slideArg, 10) || 1
+const variants = variantArgs.length
+  ? variantArgs.map((arg) => {
+      // Split on the first '=' only: the query itself may be `key=value`.
+      const cut = arg.indexOf('=')
+      const name = cut < 0 ? arg : arg.slice(0, cut)
+      const query = cut < 0 ? '' : arg.slice(cut + 1)
+      return { name, query: query ? `?${query}` : '' }
+    })
+  : [{ name: 'eager', query: '?eager-charts' }, { name: 'lazy', query: '' }]
+
+// Frame durations from a requestAnimationFrame loop installed before the deck loads.
+function installFrameSampler() {
+  window.__frameTimes = []
+  let last = 0
+  const tick = (now) => {
+    if (last)
+      window.__frameTimes.push(now - last)
+    last = now
+    requestAnimationFrame(tick)
+  }
+  requestAnimationFrame(tick)
+}
+
+function frameStats(frames) {
+  const sorted = [...frames].sort((a, b) => a - b)
+  const pick = q => sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))] : 0
+  return {
+    frames: sorted.length,
+    frame_p50_ms: pick(0.5),
+    frame_p95_ms: pick(0.95),
+    frame_max_ms: sorted.at(-1) || 0,
+    // Frames over 50 ms are the ones felt as navigation jank.
+    long_frames: sorted.filter(ms => ms > 50).length,
+  }
+}
+
+async function metrics(client) {
+  const { metrics: list } = await client.send('Performance.getMetrics')
+  return Object.fromEntries(list.map(metric => [metric.name, metric.value]))
+}
+
+// DeckChart tags each drawn canvas with the renderer that actually drew it.
+async function collectRenderers(page, seen) {
+  const tagged = await page.evaluate(() =>
+    [...document.querySelectorAll('canvas[data-chart-renderer]')].map(canvas => [canvas.id, canvas.dataset.chartRenderer]))
+  for (const [id, renderer] of tagged)
+    seen.set(id, renderer)
+}
+
+function rendererCounts(seen) {
+  const counts = {}
+  for (const renderer of seen.values())
+    counts[renderer] = (counts[renderer] || 0) + 1
+  return counts
+}
+
+async function run(browser, variant) {
+  const page = await browser.newPage({ viewport: { width: 1280, height: 720 } })
+  const client = await page.context().newCDPSession(page)
+  await client.send('Performance.enable')
+  await page.addInitScript(installFrameSampler)
+
+  let bytes = 0
+  let chartRequests = 0
+  page.on('response', async (response) => {
+    if (response.url().includes('/data/'))
+      chartRequests += 1
+    try {
+      bytes += (await response.body()).length
+    }
+    catch {
+      // Redirects and aborted requests have no body.
+    }
+  })
+
+  const started = Date.now()
+  await page.goto(`${baseUrl}1${variant.query}`, { waitUntil: 'networkidle' })
+  const loadMs = Date.now() - started
+  await client.send('HeapProfiler.collectGarbage')
+  const atLoad = await metrics(client)
+  const loadBytes = bytes
+  const loadChartRequests = chartRequests
+
+  const renderers = new Map()
+  await collectRenderers(page, renderers)
+  await page.evaluate(() => { window.__frameTimes.length = 0 })
+  for (let slide = 1; slide < slideCount; slide++) {
+    await page.keyboard.press('ArrowRight')
+    await page.waitForTimeout(150)
+    await collectRenderers(page, renderers)
+  }
+  await page.waitForLoadState('networkidle')
+  await collectRenderers(page, renderers)
+  const frames = await page.evaluate(() => window.__frameTimes.slice())
+  await client.send('HeapProfiler.collectGarbage')
+  const afterWalk = await metrics(client)
+
+  const result = {
+    load_ms: loadMs,
+    load_bytes: loadBytes,
+    load_chart_requests: loadChartRequests,
+    total_bytes: bytes,
+    total_chart_requests: chartRequests,
+    heap_at_load: atLoad.JSHeapUsedSize,
+    heap_after_walk: afterWalk.JSHeapUsedSize,
+    dom_nodes_after_walk: afterWalk.Nodes,
+    renderers: rendererCounts(renderers),
+    ...frameStats(frames),
+  }
+  await page.close()
+  return result
+}
+
+const browser = await chromium.launch()
+try {
+  const report = { base_url: baseUrl, slides: slideCount, variants: {} }
+  for (const variant of variants)
+    report.variants[variant.name] = await run(browser, variant)
+  console.log(JSON.stringify(report))
+}
+finally {
+  await browser.close()
+}
@@ -0,0 +1,26 @@
+// Export render profile shared by DeckChart and DeckWaterfall.
+//
+// export-profile.json is written by scripts/export_deck.py. Under the
+// 'render' profile, printed slides (`slidev export`) draw charts without
+// animation and each chart sets `data-chart-rendered` on its canvas after
+// its first draw. Chart containers point Slidev's `data-waitfor` at that
+// attribute, so export waits for the charts on each slide rather than a
+// fixed per-slide delay.
+import profile from './export-profile.json'
+
+export const RENDERED_ATTR = 'data-chart-rendered'
+export const RENDERED_SELECTOR = `canvas[${RENDERED_ATTR}]`
+
+export const exportProfile = { animation: true, signalRendered: false, ...profile }
+
+export function markRendered(canvas) {
+  canvas?.setAttribute?.(RENDERED_ATTR, '')
+}
+
+// Chart.js plugin: flags the canvas once a frame has been drawn.
+export const renderedFlag = {
+  id: 'deckRenderedFlag',
+  afterRender(chart) {
+    markRendered(chart.canvas)
+  },
+}
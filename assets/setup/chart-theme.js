@@ -0,0 +1,37 @@
+// Runtime chart theming for DeckChart.
+//
+// With `runtime_theme`, generate_charts.py writes theme colours as CSS
+// variable references: `var(--slide-primary)`, optionally followed by a
+// two-digit hex alpha (`var(--slide-primary)20`). They are resolved against
+// the page's custom properties just before a chart is drawn, so the
+// brand.css swapped in at deploy time recolours every chart without a
+// rebuild. Brand colours must therefore be `#RRGGBB` hex values.
+const VAR_RE = /var\((--[\w-]+)\)/g
+
+function resolveValue(value, style) {
+  if (typeof value === 'string') {
+    if (!value.includes('var('))
+      return value
+    return value.replace(VAR_RE, (match, name) => style.getPropertyValue(name).trim() || match)
+  }
+  if (Array.isArray(value))
+    return value.map(item => resolveValue(item, style))
+  if (value && typeof value === 'object' && Object.getPrototypeOf(value) === Object.prototype)
+    return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, resolveValue(item, style)]))
+  return value
+}
+
+// Resolves colours in a Chart.js config; dataset `data` arrays are passed
+// through untouched so long series are not copied.
+export function resolveThemeColors(config) {
+  const style = getComputedStyle(document.documentElement)
+  const data = config.data || {}
+  return {
+    ...config,
+    data: {
+      ...data,
+      datasets: (data.datasets || []).map(({ data: values, ...dataset }) => ({ ...resolveValue(dataset, style), data: values })),
+    },
+    options: resolveValue(config.options || {}, style),
+  }
+}
@@ -0,0 +1,47 @@
+// Draws DeckChart `renderer="worker"` charts on OffscreenCanvases transferred
+// from the page. Copied into the deck's setup/ next to the generated
+// chart-registry.js, so the worker bundles the same Chart.js components.
+//
+// Chart.js picks its basic platform for OffscreenCanvas: there are no DOM
+// events (charts are static, no tooltips) and no resize detection, so the
+// page forwards size changes. Animations are off because Chart.js steps
+// them synchronously without `window.requestAnimationFrame`.
+import Chart from './chart-registry.js'
+
+const charts = new Map()
+
+function render({ id, canvas, config, width, height, pixelRatio }) {
+  canvas.width = width
+  canvas.height = height
+  charts.set(id, new Chart(canvas, {
+    ...config,
+    options: {
+      ...config.options,
+      responsive: false,
+      animation: false,
+      events: [],
+      devicePixelRatio: pixelRatio,
+    },
+  }))
+  self.postMessage({ type: 'rendered', id })
+}
+
+self.addEventListener('message', ({ data: message }) => {
+  try {
+    if (message.type === 'render') {
+      render(message)
+    }
+    else if (message.type === 'resize') {
+      charts.get(message.id)?.resize(message.width, message.height)
+    }
+    else if (message.type === 'destroy') {
+      charts.get(message.id)?.destroy()
+      charts.delete(message.id)
+    }
+  }
+  catch (error) {
+    self.postMessage({ type: 'error', id: message.id, error: String(error?.message || error) })
+  }
+})
+
+self.postMessage({ type: 'ready' })
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Benchmark a built Slidev SPA with the deck's playwright-chromium.
+
+Serves `dist/`, walks every slide in each variant (by default `eager`, with
+charts built on mount, and `lazy`, the viewport-lazy default) and reports
+page weight, JS heap and frame times. Variants are selected with query
+flags the deck components read, e.g. `eager-charts` or `chart-renderer`.
+
+`--synthetic N` builds a separate N-chart entry inside the deck and compares
+main-thread against worker rendering on it.
+"""
+
+import argparse
+import functools
+import json
+import random
+import shutil
+import subprocess
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from build_slides import inline_prop_json
+from generate_charts import generate_line_chart, resolve_colors
+from utils import save_json
+
+
+BENCH_SCRIPT = Path(__file__).parent.parent / 'assets' / 'bench' / 'deck-benchmark.mjs'
+REPORT_FILE = 'benchmark-report.json'
+SYNTHETIC_ENTRY = 'bench-synthetic.md'
+SYNTHETIC_DATA = Path('public') / 'data' / 'bench'
+SYNTHETIC_DIST = Path('.temp') / 'bench-dist'
+RENDERER_VARIANTS = ['main=chart-renderer=main', 'worker=chart-renderer=worker']
+
+
+class SpaHandler(SimpleHTTPRequestHandler):
+    """Static handler that falls back to index.html for client-side routes like `/12`."""
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        if not path.exists():
+            self.path = '/index.html'
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def count_slides(slides_md: Path) -> int:
+    """Count slides in a generated deck entry; every slide's frontmatter sets a layout."""
+    if not slides_md.exists():
+        return 1
+    lines = slides_md.read_text(encoding='utf-8').splitlines()
+    return max(1, sum(1 for line in lines if line.startswith('layout: ')))
+
+
+def write_synthetic_deck(deck_dir: Path, charts: int = 80, per_slide: int = 4, points: int = 240, seed: int = 7) -> Path:
+    """Write a Slidev entry of `charts` random-walk line charts, `per_slide` to a slide grid.
+
+    Data goes to `public/data/bench/` and the entry to `bench-synthetic.md`,
+    so the deck's own slides.md and charts are untouched.
+    """
+    colors = resolve_colors('consulting')
+    rng = random.Random(seed)
+    labels = [f'P{idx + 1}' for idx in range(points)]
+    data_dir = deck_dir / SYNTHETIC_DATA
+    parts = [f"---\ntheme: none\nlayout: DeckTitle\ntitle: Chart benchmark\n---\n\n{charts}-chart benchmark\n"]
+    for start in range(0, charts, per_slide):
+        cells = []
+        for idx in range(start, min(start + per_slide, charts)):
+            value, walk = 100.0, []
+            for _ in range(points):
+                value += rng.gauss(0, 2)
+                walk.append(round(value, 2))
+            name = f'chart_{idx + 1}.json'
+            save_json(data_dir / name, generate_line_chart(walk, labels, f'Series {idx + 1}', colors))
+            cells.append({'title': f'Chart {idx + 1}', 'data': f'/data/bench/{name}'})
+        parts.append(
+            f"---\nlayout: DeckChartFull\n---\n\n<template #chart>\n"
+            f"<DeckChartGrid type=\"line\" :charts='{inline_prop_json(cells)}' />\n</template>\n"
+        )
+    entry = deck_dir / SYNTHETIC_ENTRY
+    entry.write_text('\n'.join(parts), encoding='utf-8')
+    return entry
+
+
+def remove_synthetic_deck(deck_dir: Path) -> None:
+    (deck_dir / SYNTHETIC_ENTRY).unlink(missing_ok=True)
+    shutil.rmtree(deck_dir / SYNTHETIC_DATA, ignore_errors=True)
+
+
+def build_synthetic_deck(deck_dir: Path, charts: int, per_slide: int = 4) -> int:
+    """Write and build the synthetic entry to `.temp/bench-dist`; returns its slide count."""
+    from export_deck import resolve_slidev_runner
+
+    runner = resolve_slidev_runner()
+    entry = write_synthetic_deck(deck_dir, charts, per_slide)
+    try:
+        subprocess.run(
+            runner + ['build', entry.name, '--out', str(SYNTHETIC_DIST), '--base', '/'],
+            cwd=deck_dir, check=True, capture_output=True, text=True,
+        )
+        return count_slides(entry)
+    finally:
+        # The built SPA carries its own copy of the data.
+        remove_synthetic_deck(deck_dir)
+
+
+def run_benchmark(
+    deck_dir: Path,
+    slides: Optional[int] = None,
+    variants: Optional[List[str]] = None,
+    dist: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Serve `dist` (default `deck_dir/dist`), run the Playwright benchmark and save the report to `.temp`."""
+    dist = dist or deck_dir / 'dist'
+    if not (dist / 'index.html').exists():
+        raise RuntimeError(f"No built SPA at {dist}; run export with the 'spa' format first")
+    node = shutil.which('node')
+    if not node:
+        raise RuntimeError('node is required to run the Playwright benchmark')
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(SpaHandler, directory=str(dist)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+        # Node resolves imports next to the script, so run a copy inside the deck.
+        script = deck_dir / '.temp' / BENCH_SCRIPT.name
+        script.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(BENCH_SCRIPT, script)
+        cmd = [node, str(script), base_url, str(slides or count_slides(deck_dir / 'slides.md'))] + (variants or [])
+        result = subprocess.run(cmd, cwd=deck_dir, check=True, capture_output=True, text=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report_path = deck_dir / '.temp' / REPORT_FILE
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Benchmark: {report['slides']} slide(s)")
+    print(
+        f"  {'variant':<10} {'load ms':>8} {'load KiB':>9} {'total KiB':>10} {'charts@load':>12} "
+        f"{'heap MiB':>9} {'p95 frame':>10} {'long frames':>12}  renderers"
+    )
+    for name, result in report['variants'].items():
+        # Charts count under the renderer that drew them; a worker variant
+        # that fell back to the main thread shows up here.
+        renderers = ', '.join(f"{key} {count}" for key, count in sorted(result.get('renderers', {}).items())) or '-'
+        print(
+            f"  {name:<10} {result['load_ms']:>8} {result['load_bytes'] / 1024:>9.1f} "
+            f"{result['total_bytes'] / 1024:>10.1f} {result['load_chart_requests']:>12} "
+            f"{result['heap_after_walk'] / 1048576:>9.1f} {result['frame_p95_ms']:>10.1f} {result['long_frames']:>12}"
+            f"  {renderers}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark a built deck with playwright-chromium')
+    parser.add_argument('--deck-dir', required=True, help='Slidev project directory with a built dist/')
+    parser.add_argument('--slides', type=int, help='Slides to walk (default: counted from slides.md)')
+    parser.add_argument('--variant', action='append', dest='variants',
+                        help="name=query variant, e.g. 'eager=eager-charts' (repeatable)")
+    parser.add_argument('--synthetic', type=int, metavar='N',
+                        help='Build an N-chart synthetic entry and compare main-thread and worker rendering')
+    parser.add_argument('--per-slide', type=int, default=4, help='Charts per synthetic slide')
+    args = parser.parse_args()
+
+    deck_dir = Path(args.deck_dir)
+    try:
+        if args.synthetic:
+            slides = build_synthetic_deck(deck_dir, args.synthetic, args.per_slide)
+            report = run_benchmark(deck_dir, slides, args.variants or RENDERER_VARIANTS, deck_dir / SYNTHETIC_DIST)
+        else:
+            report = run_benchmark(deck_dir, args.slides, args.variants)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        detail = getattr(e, 'stderr', None) or str(e)
+        print(f"✗ Benchmark failed: {detail}", file=sys.stderr)
+        sys.exit(1)
+    print_report(report)
+    print(f"✓ Report saved to: {deck_dir / '.temp' / REPORT_FILE}")
+
+
+if __name__ == '__main__':
+    main()
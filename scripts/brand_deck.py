@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Apply a brand to a runtime-themed SPA build at deploy time.
+
+Decks created with `runtime_theme` read their colours from `brand.css`
+(CSS custom properties) when the page loads. One `dist/` therefore serves
+every brand: this script writes a brand's variables file into the build,
+or into a copy of it, without rebuilding.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Optional
+
+from create_slidev_project import brand_css, normalise_colors
+
+
+def brand_dist(dist_dir: Path, colors: dict, out_dir: Optional[Path] = None) -> Path:
+    """Write `colors` as the build's brand.css; with `out_dir`, brand a copy instead. Returns the branded build."""
+    if not (dist_dir / 'brand.css').exists():
+        raise ValueError(f"{dist_dir} has no brand.css; create the deck with runtime_theme and rebuild it")
+    if not normalise_colors(colors):
+        raise ValueError('No valid #RRGGBB colours to apply')
+    target = dist_dir
+    if out_dir:
+        dist, out = dist_dir.resolve(), out_dir.resolve()
+        if out == dist or out in dist.parents or dist in out.parents:
+            raise ValueError(f"--out {out_dir} overlaps the build {dist_dir}; choose a directory outside it")
+        if out_dir.exists():
+            shutil.rmtree(out_dir)
+        shutil.copytree(dist_dir, out_dir)
+        target = out_dir
+    (target / 'brand.css').write_text(brand_css(colors), encoding='utf-8')
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write brand colours into a runtime-themed SPA build')
+    parser.add_argument('--dist', required=True, help='Built SPA directory (slidev build output)')
+    parser.add_argument('--colors', required=True, help='JSON object of colours, or a path to a JSON file')
+    parser.add_argument('--out', help='Brand a copy of the build in this directory instead of editing it')
+    args = parser.parse_args()
+
+    try:
+        raw = args.colors if args.colors.lstrip().startswith('{') else Path(args.colors).read_text(encoding='utf-8')
+        target = brand_dist(Path(args.dist), json.loads(raw), Path(args.out) if args.out else None)
+    except (ValueError, OSError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Branded build: {target / 'brand.css'}")
+
+
+if __name__ == '__main__':
+    main()
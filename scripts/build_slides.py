@@ -10,6 +10,13 @@ import sys
 from pathlib import Path
 from jinja2 import Template
 
+from generate_charts import (
+    CHART_BUNDLE_FILE,
+    facet_manifest_name,
+    load_dataset_blob,
+    merge_options,
+    resolve_dataset_refs,
+)
 from validate_analysis import validate_analysis_payload
 from lint_slides import lint_analysis as lint_slides_analysis
 
@@ -39,6 +46,151 @@ def check_existing_images(slides: list, output_dir: Path) -> list:
     return updated_slides
 
 
+# Characters that would end the single-quoted Vue attribute or be read as
+# markup; JSON string escapes keep the literal valid JavaScript.
+INLINE_PROP_ESCAPES = str.maketrans({
+    "'": '\\u0027',
+    '<': '\\u003c',
+    '>': '\\u003e',
+    '&': '\\u0026',
+})
+
+
+def inline_prop_json(payload: dict) -> str:
+    """Serialise a chart config for a single-quoted `:config='...'` prop."""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).translate(INLINE_PROP_ESCAPES)
+
+
+def attach_chart_facets(slides: list, output_dir: Path) -> list:
+    """Expand faceted chart visuals into the facet list from their generated manifest.
+
+    The manifest decides, not the analysis `facet_key`: chart-overrides.json
+    can facet a chart the analysis does not, and generate_charts.py removes
+    the manifest once a chart is no longer faceted.
+    """
+    data_dir = output_dir / 'public' / 'data'
+
+    updated_slides = []
+    for slide in slides:
+        visual = slide.get('visual', {})
+        data_file = visual.get('data_file')
+
+        if visual.get('type') == 'chart' and data_file:
+            manifest_path = data_dir / facet_manifest_name(data_file)
+            if manifest_path.exists():
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                visual = visual.copy()
+                visual['facets'] = [dict(facet) for facet in manifest.get('facets', [])]
+                slide = slide.copy()
+                slide['visual'] = visual
+            elif visual.get('facet_key'):
+                print(f"  ⚠ Missing facet manifest for {data_file} (rendering a single chart)")
+
+        updated_slides.append(slide)
+
+    return updated_slides
+
+
+def chart_targets(visual: dict) -> list:
+    """Dicts carrying a `data_file` for a chart visual: its facets, else the visual itself."""
+    if visual.get('type') != 'chart':
+        return []
+    if visual.get('facets'):
+        return visual['facets']
+    return [visual] if visual.get('data_file') else []
+
+
+def attach_static_charts(slides: list, output_dir: Path) -> list:
+    """Point chart visuals (and facets) at their pre-rendered SVG, used by DeckChart in export mode."""
+    data_dir = output_dir / 'public' / 'data'
+
+    updated_slides = []
+    for slide in slides:
+        visual = slide.get('visual', {})
+
+        if chart_targets(visual):
+            visual = visual.copy()
+            if visual.get('facets'):
+                visual['facets'] = [dict(facet) for facet in visual['facets']]
+            for target in chart_targets(visual):
+                static_file = str(Path(target['data_file']).with_suffix('.svg'))
+                if (data_dir / static_file).exists():
+                    target['static_file'] = static_file
+            slide = slide.copy()
+            slide['visual'] = visual
+
+        updated_slides.append(slide)
+
+    return updated_slides
+
+
+def load_inline_config(data_dir: Path, data_file: str, defaults_cache: dict):
+    """Load a generated chart config ready for inlining, or None when it is missing."""
+    chart_path = data_dir / data_file
+    if not chart_path.exists():
+        print(f"  ⚠ Missing chart config: {data_file} (will be fetched at runtime)")
+        return None
+    with open(chart_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    extends = config.pop('extends', None)
+    if extends:
+        if extends not in defaults_cache:
+            with open(data_dir / extends, 'r', encoding='utf-8') as f:
+                defaults_cache[extends] = json.load(f)
+        base = defaults_cache[extends].get('types', {}).get(config.get('type'), {})
+        config['options'] = merge_options(base, config.get('options'))
+    config.pop('meta', None)
+    return resolve_dataset_refs(config, lambda digest: load_dataset_blob(data_dir, digest))
+
+
+def inline_chart_configs(slides: list, output_dir: Path) -> list:
+    """Attach generated chart configs to chart visuals for build-time inlining.
+
+    Compact configs are merged with their shared defaults, and deduplicated
+    dataset refs resolved, so the rendered component needs no runtime fetch. Facets carry their
+    config as a dict, serialised with the rest of the grid's `charts` prop.
+    """
+    data_dir = output_dir / 'public' / 'data'
+    defaults_cache = {}
+
+    updated_slides = []
+    for slide in slides:
+        visual = slide.get('visual', {})
+
+        if visual.get('type') == 'chart' and visual.get('facets'):
+            facets = []
+            for facet in visual['facets']:
+                config = load_inline_config(data_dir, facet['data_file'], defaults_cache)
+                facets.append({**facet, 'config': config} if config is not None else dict(facet))
+            visual = {**visual, 'facets': facets}
+            slide = {**slide, 'visual': visual}
+        elif visual.get('type') == 'chart' and visual.get('data_file'):
+            config = load_inline_config(data_dir, visual['data_file'], defaults_cache)
+            if config is not None:
+                visual = visual.copy()
+                visual['inline_config'] = inline_prop_json(config)
+                slide = slide.copy()
+                slide['visual'] = visual
+
+        updated_slides.append(slide)
+
+    return updated_slides
+
+
+def facet_grid_prop(visual: dict) -> str:
+    """Serialise a faceted visual's charts for the `<DeckChartGrid :charts='...'>` prop."""
+    charts = []
+    for facet in visual.get('facets', []):
+        chart = {'title': facet.get('title', ''), 'data': f"/data/{facet['data_file']}"}
+        if facet.get('static_file'):
+            chart['static'] = f"/data/{facet['static_file']}"
+        if facet.get('config') is not None:
+            chart['config'] = facet['config']
+        charts.append(chart)
+    return inline_prop_json(charts)
+
+
 def build(
     analysis_path: str,
     template_path: str,
@@ -51,8 +203,15 @@ def build(
     consulting_lint_threshold: int = 70,
     content_path: str = None,
     citation_trace_path: str = None,
+    inline_charts: bool = False,
+    chart_renderer: str = 'main',
 ) -> None:
-    """Build slides.md from analysis + template. Callable from pipeline or CLI."""
+    """Build slides.md from analysis + template. Callable from pipeline or CLI.
+
+    With `inline_charts`, generated chart configs are embedded as component
+    props so Vite bundles them and slides render without fetching data.
+    `chart_renderer='worker'` draws charts off the main thread.
+    """
     with open(template_path, 'r', encoding='utf-8') as f:
         template = Template(f.read())
 
@@ -106,11 +265,41 @@ def build(
 
     slides = analysis.get('slides', [])
 
+    chart_bundle = None
+    local_fonts = False
     if deck_dir:
         output_dir = Path(deck_dir)
         print(f"Checking for existing images in {output_dir}/public/images/...")
         slides = check_existing_images(slides, output_dir)
         print()
+        slides = attach_chart_facets(slides, output_dir)
+        faceted = sum(1 for slide in slides if slide.get('visual', {}).get('facets'))
+        if faceted:
+            print(f"✓ {faceted} faceted chart(s) will render as small multiples")
+        slides = attach_static_charts(slides, output_dir)
+        static_count = sum(
+            1 for slide in slides for target in chart_targets(slide.get('visual', {})) if target.get('static_file')
+        )
+        if static_count:
+            print(f"✓ {static_count} static SVG chart(s) will be used for export")
+        if inline_charts:
+            slides = inline_chart_configs(slides, output_dir)
+            inlined = sum(
+                1 for slide in slides
+                for target in chart_targets(slide.get('visual', {}))
+                if target.get('inline_config') or target.get('config') is not None
+            )
+            print(f"✓ {inlined} chart config(s) inlined")
+        if (output_dir / 'public' / 'data' / CHART_BUNDLE_FILE).exists():
+            chart_bundle = CHART_BUNDLE_FILE
+            print(f"✓ Charts will load from bundle: /data/{CHART_BUNDLE_FILE}")
+        # Vendored fonts (vendor_fonts.py): keep Slidev from fetching web fonts.
+        local_fonts = (output_dir / 'styles' / 'fonts.css').exists()
+
+    for slide in slides:
+        visual = slide.get('visual', {})
+        if visual.get('facets'):
+            slide['visual'] = {**visual, 'facets_prop': facet_grid_prop(visual)}
 
     rendered = template.render(
         title=analysis.get('title', 'Presentation'),
@@ -120,6 +309,9 @@ def build(
         theme=analysis.get('theme', 'consulting'),
         primary_color='#003366',
         secondary_color='#6699CC',
+        chart_bundle=chart_bundle,
+        chart_renderer=chart_renderer,
+        local_fonts=local_fonts,
     )
 
     out = Path(output_path)
@@ -148,6 +340,10 @@ def main():
     parser.add_argument('--consulting-lint-threshold', type=int, default=70, help='Consulting lint strict score threshold')
     parser.add_argument('--content', help='Optional content.json path for consulting-lint evidence checks')
     parser.add_argument('--citation-trace', help='Optional citation-trace.json for consulting-lint trace checks')
+    parser.add_argument('--inline-charts', action='store_true',
+                        help='Embed generated chart configs in slides.md (requires --deck-dir)')
+    parser.add_argument('--chart-renderer', choices=['main', 'worker'], default='main',
+                        help="Draw charts on the main thread or in a Web Worker via OffscreenCanvas")
     args = parser.parse_args()
 
     try:
@@ -163,6 +359,8 @@ def main():
             consulting_lint_threshold=args.consulting_lint_threshold,
             content_path=args.content,
             citation_trace_path=args.citation_trace,
+            inline_charts=args.inline_charts,
+            chart_renderer=args.chart_renderer,
         )
     except ValueError:
         sys.exit(1)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Generate a tree-shaken Chart.js registration module for a deck.
+
+`chart.js/auto` registers every controller, element, scale and plugin. The
+deck's components import `setup/chart-registry.js` instead, which this
+script writes with only the pieces the deck's chart types need, so Vite
+can drop the rest from the SPA bundle.
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from generate_charts import CHART_BUNDLE_FILE, CHART_DEFAULTS_FILE
+
+
+REGISTRY_FILE = Path('setup') / 'chart-registry.js'
+BUNDLE_REPORT_FILE = 'bundle-size-report.json'
+
+# Deck chart types (chart-types.json) and Chart.js config types -> components.
+TYPE_COMPONENTS: Dict[str, List[str]] = {
+    'line': ['LineController', 'LineElement', 'PointElement', 'CategoryScale', 'LinearScale', 'Filler'],
+    'bar': ['BarController', 'BarElement', 'CategoryScale', 'LinearScale'],
+    'horizontal_bar': ['BarController', 'BarElement', 'CategoryScale', 'LinearScale'],
+    'waterfall': ['BarController', 'BarElement', 'CategoryScale', 'LinearScale'],
+    'pie': ['PieController', 'ArcElement'],
+    'donut': ['DoughnutController', 'ArcElement'],
+    'doughnut': ['DoughnutController', 'ArcElement'],
+}
+# Time-axis line charts (see generate_time_line_chart).
+TIME_COMPONENTS = ['TimeScale', 'Decimation']
+# Plugins every generated config relies on.
+BASE_COMPONENTS = ['Legend', 'Tooltip']
+
+
+def deck_chart_types(chart_types: Dict[str, Any], data_dir: Optional[Path] = None) -> Set[str]:
+    """Chart types used by a deck: chart-types.json values plus generated config types.
+
+    Generated configs catch chart-type overrides and reveal time axes; the
+    `time` marker is added when any config uses a time scale.
+    """
+    used = {value for value in chart_types.values() if isinstance(value, str) and value in TYPE_COMPONENTS}
+    if data_dir and data_dir.is_dir():
+        for path in data_dir.glob('*.json'):
+            if path.name in (CHART_DEFAULTS_FILE, CHART_BUNDLE_FILE):
+                continue
+            try:
+                config = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if not isinstance(config, dict):
+                continue
+            if config.get('type') in TYPE_COMPONENTS:
+                used.add(config['type'])
+            scales = (config.get('options') or {}).get('scales') or {}
+            if any(isinstance(scale, dict) and scale.get('type') == 'time' for scale in scales.values()):
+                used.add('time')
+    elif 'line' in used:
+        # No generated configs to inspect: keep time-axis support for line charts.
+        used.add('time')
+    return used
+
+
+def registry_components(used: Iterable[str]) -> List[str]:
+    """Sorted Chart.js components to register for the given chart types."""
+    components = set(BASE_COMPONENTS)
+    for chart_type in used:
+        components.update(TYPE_COMPONENTS.get(chart_type, []))
+        if chart_type == 'time':
+            components.update(TIME_COMPONENTS)
+    return sorted(components)
+
+
+def registration_module(components: List[str]) -> str:
+    """JavaScript module registering `components`; falls back to chart.js/auto when empty."""
+    header = '// Generated by scripts/chart_registry.py from chart-types.json; do not edit.\n'
+    if not components:
+        return header + "import Chart from 'chart.js/auto'\nimport 'chartjs-adapter-date-fns'\n\nexport default Chart\n"
+    names = ',\n  '.join(components)
+    lines = [header, f"import {{\n  Chart,\n  {names},\n}} from 'chart.js'\n"]
+    if 'TimeScale' in components:
+        lines.append("import 'chartjs-adapter-date-fns'\n")
+    lines.append(f"\nChart.register(\n  {names},\n)\n\nexport default Chart\n")
+    return ''.join(lines)
+
+
+def write_registry(deck_dir: Path, components: List[str]) -> bool:
+    """Write the registration module into the deck; returns whether it changed."""
+    path = deck_dir / REGISTRY_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = registration_module(components)
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
+def generate_registry(deck_dir: Path, chart_types_path: Optional[str] = None) -> List[str]:
+    """Build the deck's registration module from chart-types.json and generated configs."""
+    chart_types: Dict[str, Any] = {}
+    if chart_types_path and Path(chart_types_path).exists():
+        with open(chart_types_path, 'r', encoding='utf-8') as f:
+            chart_types = json.load(f)
+    used = deck_chart_types(chart_types, deck_dir / 'public' / 'data')
+    components = registry_components(used) if used - {'time'} else []
+    write_registry(deck_dir, components)
+    if components:
+        print(f"✓ Chart.js registry: {len(components)} component(s) for {', '.join(sorted(used))}")
+    else:
+        print('✓ Chart.js registry: no chart types found, using chart.js/auto')
+    return components
+
+
+def js_payload(dist_dir: Path) -> Dict[str, int]:
+    """Total raw and gzip-compressed bytes of the JavaScript in a built SPA."""
+    raw, compressed = 0, 0
+    for path in dist_dir.rglob('*.js'):
+        data = path.read_bytes()
+        raw += len(data)
+        compressed += len(gzip.compress(data, compresslevel=9, mtime=0))
+    return {'js_bytes': raw, 'js_gzip_bytes': compressed}
+
+
+def compare_bundle_sizes(deck_dir: Path, components: List[str]) -> Dict[str, Any]:
+    """Build the SPA with chart.js/auto and with the tree-shaken registry; report JS sizes.
+
+    Builds go to `.temp/bundle-*` so the deck's own `dist` is untouched; the
+    tree-shaken module is left in place afterwards.
+    """
+    from export_deck import resolve_slidev_runner
+
+    runner = resolve_slidev_runner()
+    report: Dict[str, Any] = {}
+    for label, module_components in [('auto', []), ('registered', components)]:
+        write_registry(deck_dir, module_components)
+        out = deck_dir / '.temp' / f'bundle-{label}'
+        if out.exists():
+            shutil.rmtree(out)
+        subprocess.run(runner + ['build', '--out', str(out)], cwd=deck_dir, check=True, capture_output=True, text=True)
+        report[label] = js_payload(out)
+    write_registry(deck_dir, components)
+
+    saved = report['auto']['js_gzip_bytes'] - report['registered']['js_gzip_bytes']
+    report['saved_gzip_bytes'] = saved
+    report['components'] = components
+    with open(deck_dir / '.temp' / BUNDLE_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a tree-shaken Chart.js registration module')
+    parser.add_argument('--deck-dir', required=True, help='Slidev project directory')
+    parser.add_argument('--chart-types', help='Path to chart-types.json')
+    parser.add_argument('--compare-bundle', action='store_true',
+                        help='Build the SPA with chart.js/auto and with the registry and report JS sizes')
+    args = parser.parse_args()
+
+    deck_dir = Path(args.deck_dir)
+    components = generate_registry(deck_dir, args.chart_types)
+    if args.compare_bundle:
+        try:
+            report = compare_bundle_sizes(deck_dir, components)
+        except (RuntimeError, subprocess.CalledProcessError) as e:
+            detail = getattr(e, 'stderr', None) or str(e)
+            print(f"✗ Bundle comparison failed: {detail}", file=sys.stderr)
+            sys.exit(1)
+        for label in ('auto', 'registered'):
+            sizes = report[label]
+            print(f"  {label:<10} {sizes['js_bytes'] / 1024:8.1f} KiB JS, {sizes['js_gzip_bytes'] / 1024:8.1f} KiB gzip")
+        print(f"✓ Tree-shaking saved {report['saved_gzip_bytes'] / 1024:.1f} KiB gzip "
+              f"(report: {deck_dir / '.temp' / BUNDLE_REPORT_FILE})")
+
+
+if __name__ == '__main__':
+    main()
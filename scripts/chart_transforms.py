@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""Declarative data transforms applied to chart source records before config generation."""
+
+import heapq
+import math
+import re
+import statistics
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from chart_expressions import compile_expression
+from utils import to_float
+
+
+AGGREGATIONS: Dict[str, Callable[[List[float]], float]] = {
+    'sum': math.fsum,
+    'mean': statistics.fmean,
+    'count': lambda values: float(len(values)),
+    'min': min,
+    'max': max,
+    'median': statistics.median,
+}
+
+
+def as_key_list(value: Any) -> List[str]:
+    """Normalise a string or list of column names into a list."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value if item]
+
+
+def column(records: List[Dict[str, Any]], key: str) -> List[Any]:
+    """Return a single column from row records."""
+    return [row.get(key) for row in records]
+
+
+def aggregate_records(
+    records: List[Dict[str, Any]],
+    value_key: Union[str, List[str]],
+    group_keys: List[str],
+    agg: str = 'sum',
+) -> List[Dict[str, Any]]:
+    """Collapse records to one row per group, reducing `value_key` with `agg`.
+
+    `value_key` may be a list to reduce several columns in the same pass.
+    Groups keep first-seen order. `count` counts every row in the group;
+    the other aggregations ignore non-numeric values.
+    """
+    reducer = AGGREGATIONS.get(agg)
+    if reducer is None:
+        raise ValueError(f"Unsupported aggregation '{agg}'. Use one of: {', '.join(AGGREGATIONS)}")
+    if not group_keys:
+        raise ValueError('Aggregation requires at least one group key')
+
+    value_keys = as_key_list(value_key)
+    key_columns = [column(records, key) for key in group_keys]
+    if agg == 'count':
+        value_columns = [[0.0] * len(records) for _ in value_keys]
+    else:
+        value_columns = [[to_float(value) for value in column(records, key)] for key in value_keys]
+
+    groups: Dict[Tuple[Any, ...], List[List[float]]] = {}
+    for key, values in zip(zip(*key_columns), zip(*value_columns)):
+        if any(part is None for part in key):
+            continue
+        buckets = groups.get(key)
+        if buckets is None:
+            buckets = groups[key] = [[] for _ in value_keys]
+        for bucket, value in zip(buckets, values):
+            if value is not None:
+                bucket.append(value)
+
+    rows = []
+    for key, buckets in groups.items():
+        if not any(buckets):
+            continue
+        row = dict(zip(group_keys, key))
+        for name, bucket in zip(value_keys, buckets):
+            row[name] = reducer(bucket) if bucket else None
+        rows.append(row)
+    return rows
+
+
+JOIN_TYPES = ('inner', 'left')
+
+
+def join_specs(visual: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Normalise `visual.join` (one object or a list) into explicit join specs.
+
+    Each spec names a secondary `source_file` and either `on` (shared key
+    columns) or `left_on`/`right_on`. `how` is `inner` (default) or `left`,
+    `columns` optionally limits the right-hand columns brought in, and
+    clashing names get `suffix` (default `_<source stem>`).
+    """
+    raw = visual.get('join')
+    if not raw:
+        return []
+    specs = []
+    for item in raw if isinstance(raw, list) else [raw]:
+        if not isinstance(item, dict) or not isinstance(item.get('source_file'), str) or not item['source_file']:
+            raise ValueError('Each join requires a source_file')
+        left_on = as_key_list(item.get('left_on') or item.get('on'))
+        right_on = as_key_list(item.get('right_on') or item.get('on'))
+        if not left_on or len(left_on) != len(right_on):
+            raise ValueError(f"Join on '{item['source_file']}' needs matching key columns (on, or left_on/right_on)")
+        how = item.get('how', 'inner')
+        if how not in JOIN_TYPES:
+            raise ValueError(f"Unsupported join type '{how}'. Use one of: {', '.join(JOIN_TYPES)}")
+        stem = re.sub(r'\W+', '_', Path(item['source_file']).stem.lower()).strip('_')
+        specs.append({
+            'source_file': item['source_file'],
+            'left_on': left_on,
+            'right_on': right_on,
+            'how': how,
+            'columns': as_key_list(item.get('columns')) or None,
+            'suffix': item.get('suffix') or f'_{stem or "right"}',
+        })
+    return specs
+
+
+def validate_transforms(visual: Dict[str, Any]) -> None:
+    """Raise ValueError for an `agg` or `limit` that apply_visual_transforms cannot run."""
+    agg = visual.get('agg')
+    if agg is not None and (not isinstance(agg, str) or agg not in AGGREGATIONS):
+        raise ValueError(f"Unsupported aggregation {agg!r}. Use one of: {', '.join(AGGREGATIONS)}")
+    limit = visual.get('limit')
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError(f"limit must be a positive integer, not {limit!r}")
+
+
+def join_key(row: Dict[str, Any], keys: List[str]) -> Optional[Tuple[Any, ...]]:
+    """Build a comparable join key; numeric strings match numbers, blanks never match."""
+    parts = []
+    for key in keys:
+        value = row.get(key)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        numeric = to_float(value)
+        parts.append(numeric if numeric is not None else str(value).strip())
+    return tuple(parts)
+
+
+def hash_join(
+    left: List[Dict[str, Any]],
+    right: List[Dict[str, Any]],
+    left_on: List[str],
+    right_on: List[str],
+    how: str = 'inner',
+    columns: Optional[List[str]] = None,
+    suffix: str = '_right',
+) -> List[Dict[str, Any]]:
+    """Join two record lists with one build pass over `right` and one probe pass over `left`.
+
+    Cost is O(len(left) + len(right)) rather than nested loops. Duplicate
+    right keys fan out as in SQL; with `how='left'` unmatched left rows are
+    kept unchanged. Right columns that clash with left columns get `suffix`.
+    The join works on the record lists directly: keys are normalised per row
+    (so 2024 matches "2024"), which a DataFrame merge would need as well, and
+    the records would otherwise have to round-trip through a frame.
+    """
+    left_columns = set().union(*(row.keys() for row in left)) if left else set()
+    if columns is None:
+        seen: Dict[str, None] = {}
+        for row in right:
+            seen.update(dict.fromkeys(row))
+        columns = [name for name in seen if name not in right_on]
+    renames = [(name, name + suffix if name in left_columns else name) for name in columns]
+
+    index: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    for row in right:
+        key = join_key(row, right_on)
+        if key is not None:
+            index.setdefault(key, []).append({target: row.get(name) for name, target in renames})
+
+    joined = []
+    for row in left:
+        key = join_key(row, left_on)
+        matches = index.get(key) if key is not None else None
+        if matches:
+            joined.extend({**row, **match} for match in matches)
+        elif how == 'left':
+            joined.append(row)
+    return joined
+
+
+def partition_records(records: List[Dict[str, Any]], facet_key: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Split records by `facet_key` in one pass; facets keep first-seen order and blanks are dropped."""
+    partitions: Dict[str, List[Dict[str, Any]]] = {}
+    for row in records:
+        value = row.get(facet_key)
+        if value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        partitions.setdefault(str(value).strip(), []).append(row)
+    return partitions
+
+
+def _sort_value(value: Any) -> Tuple[int, Any]:
+    numeric = to_float(value)
+    if numeric is not None:
+        return (0, numeric)
+    return (1, str(value))
+
+
+def sort_records(records: List[Dict[str, Any]], spec: str, x_key: str, y_key: str) -> List[Dict[str, Any]]:
+    """Sort records by a column; `x`/`y` alias the chart keys and a leading `-` sorts descending."""
+    descending = spec.startswith('-')
+    name = spec.lstrip('-+')
+    key = {'x': x_key, 'y': y_key}.get(name, name)
+    return sorted(records, key=lambda row: _sort_value(row.get(key)), reverse=descending)
+
+
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+
+def x_order_key(records: List[Dict[str, Any]], x_key: str) -> Callable[[Dict[str, Any]], Any]:
+    """Sort key for rows along x: numbers, ISO dates, month names in calendar order, else natural text order."""
+    values = column(records, x_key)
+    if all(to_float(value) is not None for value in values):
+        return lambda row: to_float(row.get(x_key))
+    if all(parse_timestamp(value) is not None for value in values):
+        return lambda row: parse_timestamp(row.get(x_key))
+    if all(str(value).strip()[:3].lower() in MONTHS for value in values):
+        return lambda row: MONTHS.index(str(row.get(x_key)).strip()[:3].lower())
+    return lambda row: _sort_value(row.get(x_key))
+
+
+def expression_partitions(
+    records: List[Dict[str, Any]], x_key: str, series_key: Optional[str] = None,
+) -> List[List[int]]:
+    """Row indices per `series_key` value, each ordered along x, for evaluating window functions.
+
+    `pct_change`, `rolling` and the other window functions compare a row
+    with its neighbours, so each series is evaluated on its own rows in x
+    order rather than across the interleaved table.
+    """
+    groups: Dict[Any, List[int]] = {}
+    for idx, row in enumerate(records):
+        groups.setdefault(row.get(series_key) if series_key else None, []).append(idx)
+    order = x_order_key(records, x_key)
+    return [sorted(indices, key=lambda i: order(records[i])) for indices in groups.values()]
+
+
+def apply_visual_transforms(
+    records: List[Dict[str, Any]],
+    visual: Dict[str, Any],
+    x_key: str,
+    y_key: str,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Apply `agg`, `group_by`, `y_expr`, `sort` and `limit` from a visual spec.
+
+    With `y_expr`, aggregation reduces every column the expression reads
+    and the derived series is stored under `y_key` before sorting, with
+    window functions evaluated per `series_key` in x order (see
+    `expression_partitions`). Returns the
+    transformed records and a metadata dict describing the reduction
+    (empty when the visual declares no transforms).
+    """
+    agg = visual.get('agg')
+    group_by = as_key_list(visual.get('group_by'))
+    y_expr = visual.get('y_expr')
+    sort = visual.get('sort')
+    limit = visual.get('limit')
+    if not (agg or group_by or y_expr or sort or limit):
+        return records, {}
+
+    evaluate, expr_columns = compile_expression(y_expr) if y_expr else (None, ())
+    meta: Dict[str, Any] = {'source_rows': len(records)}
+    if agg or group_by:
+        agg = agg or 'sum'
+        keys = list(group_by)
+        for required in [x_key, visual.get('series_key')]:
+            if required and required not in keys:
+                keys.insert(0 if required == x_key else len(keys), required)
+        records = aggregate_records(records, list(expr_columns) or y_key, keys, agg)
+        meta['agg'] = agg
+        meta['group_by'] = keys
+
+    if evaluate is not None:
+        derived: List[Any] = [None] * len(records)
+        for indices in expression_partitions(records, x_key, visual.get('series_key')):
+            for idx, value in zip(indices, evaluate([records[i] for i in indices])):
+                derived[idx] = value
+        records = [{**row, y_key: value} for row, value in zip(records, derived)]
+        meta['y_expr'] = y_expr
+
+    if isinstance(sort, str) and sort.strip():
+        records = sort_records(records, sort.strip(), x_key, y_key)
+        meta['sort'] = sort.strip()
+
+    limit_value: Optional[int] = limit if isinstance(limit, int) and not isinstance(limit, bool) else None
+    if limit_value is not None and limit_value > 0:
+        records = records[:limit_value]
+        meta['limit'] = limit_value
+
+    meta['rows'] = len(records)
+    return records, meta
+
+
+def lttb_indices(values: List[float], threshold: int, xs: Optional[List[float]] = None) -> List[int]:
+    """Select indices with Largest-Triangle-Three-Buckets downsampling.
+
+    Points are spaced evenly on x (their index) unless `xs` gives their
+    positions, as on a time axis. The first and last points are always kept.
+    """
+    count = len(values)
+    if threshold < 3 or threshold >= count:
+        return list(range(count))
+    if xs is None:
+        xs = list(range(count))
+
+    selected = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        avg_x = math.fsum(xs[end:next_end]) / (next_end - end)
+        avg_y = math.fsum(values[end:next_end]) / (next_end - end)
+
+        anchor_x, anchor_y = xs[anchor], values[anchor]
+        best, best_area = start, -1.0
+        for idx in range(start, end):
+            area = abs((anchor_x - avg_x) * (values[idx] - anchor_y) - (anchor_x - xs[idx]) * (avg_y - anchor_y))
+            if area > best_area:
+                best, best_area = idx, area
+        selected.append(best)
+        anchor = best
+
+    selected.append(count - 1)
+    return selected
+
+
+def top_n_indices(values: List[float], n: int) -> List[int]:
+    """Return indices of the `n` largest values in their original order.
+
+    Uses a bounded heap selection rather than a full sort, so cost stays
+    O(len(values) * log n) for high-cardinality category lists.
+    """
+    if n <= 0 or n >= len(values):
+        return list(range(len(values)))
+    return sorted(heapq.nlargest(n, range(len(values)), key=values.__getitem__))
+
+
+def parse_timestamp(value: Any) -> Optional[int]:
+    """Parse an ISO-8601 date/datetime (or `YYYY-MM`) to epoch milliseconds.
+
+    Naive values are treated as UTC. Returns None for anything else, so
+    bare years and free-text labels stay categorical.
+    """
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, date):
+        moment = datetime(value.year, value.month, value.day)
+    elif isinstance(value, str):
+        text = value.strip()
+        if len(text) < 7 or not text[:4].isdigit() or text[4] != '-':
+            return None
+        if text.endswith(('Z', 'z')):
+            text = text[:-1] + '+00:00'
+        try:
+            moment = datetime.fromisoformat(text) if len(text) > 7 else datetime.strptime(text, '%Y-%m')
+        except ValueError:
+            return None
+    else:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(round(moment.timestamp() * 1000))
+
+
+def time_axis_values(records: List[Dict[str, Any]], x_key: str, x_type: Optional[str] = None) -> Optional[List[Optional[int]]]:
+    """Return x timestamps when `x_key` is time-like, otherwise None.
+
+    `x_type` of `time` or `category` overrides detection; by default every
+    non-empty x value must parse and at least two rows must be present.
+    """
+    if x_type == 'category' or not x_key:
+        return None
+    values = column(records, x_key)
+    stamps = [parse_timestamp(value) for value in values]
+    present = [stamp for stamp, value in zip(stamps, values) if value not in (None, '')]
+    if x_type == 'time':
+        return stamps if any(stamp is not None for stamp in present) else None
+    if len(present) < 2 or any(stamp is None for stamp in present):
+        return None
+    return stamps
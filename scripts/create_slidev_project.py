@@ -4,13 +4,21 @@ Create Slidev project structure with custom theme.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
 import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from chart_registry import REGISTRY_FILE, generate_registry
+from export_deck import EXPORT_PROFILE_FILE, EXPORT_PROFILES, write_export_profile
+from deck_workspace import VITE_CONFIG, attach_deck, ensure_workspace
+from scaffold_cache import default_cache_dir, ensure_scaffold, install_dependencies, materialise_scaffold, scaffold_key
 
 
 def resolve_theme_dir(skill_dir: Path, theme: str) -> Path:
@@ -36,7 +44,7 @@ HEX_COLOR_RE = re.compile(r"^#[0-9A-Fa-f]{6}$")
 
 def normalise_colors(colors: dict) -> dict:
     """Normalise and validate optional theme colour overrides."""
-    allowed = {'primary', 'secondary', 'accent', 'background', 'text', 'text-light'}
+    allowed = {'primary', 'secondary', 'accent', 'background', 'text', 'text-light', 'border', 'grid'}
     normalised = {}
     for key, value in colors.items():
         if key not in allowed:
@@ -95,92 +103,378 @@ def apply_color_overrides(output_dir: Path, colors: dict):
     uno_path.write_text(uno, encoding='utf-8')
 
 
-def create_project(output_dir: Path, theme: str, colors: dict, logo: Optional[str] = None):
-    """Create Slidev project structure."""
-    
-    # Create directories
-    dirs = ['public/images', 'public/data', 'components', 'layouts', 'styles', '.temp']
-    for d in dirs:
-        (output_dir / d).mkdir(parents=True, exist_ok=True)
-    
-    # Initialize with bun/npm
-    try:
-        subprocess.run(['bun', 'init', '-y'], cwd=output_dir, check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        try:
-            subprocess.run(['npm', 'init', '-y'], cwd=output_dir, check=True, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            detail = getattr(e, 'stderr', None) or str(e)
-            print(f"✗ Failed to initialize project with bun and npm: {detail}", file=sys.stderr)
-            sys.exit(1)
-    
-    # Install dependencies
-    deps = ['@slidev/cli', 'vue-chartjs', 'chart.js', 'chartjs-adapter-date-fns']
-    try:
-        subprocess.run(['bun', 'add'] + deps, cwd=output_dir, check=True, capture_output=True)
-        subprocess.run(['bun', 'add', '-d', 'playwright-chromium'], cwd=output_dir, check=True, capture_output=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        try:
-            subprocess.run(['npm', 'install'] + deps, cwd=output_dir, check=True, capture_output=True)
-            subprocess.run(['npm', 'install', '-D', 'playwright-chromium'], cwd=output_dir, check=True, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            detail = getattr(e, 'stderr', None) or str(e)
-            print(f"✗ Failed to install dependencies with bun and npm: {detail}", file=sys.stderr)
-            sys.exit(1)
-    
-    # Copy theme files
-    skill_dir = Path(__file__).parent.parent
-    theme_dir = resolve_theme_dir(skill_dir, theme)
-
-    shutil.copy(theme_dir / 'theme.css', output_dir / 'styles' / 'theme.css')
-    shutil.copy(theme_dir / 'uno.config.ts', output_dir / 'uno.config.ts')
-    
-    # Copy layouts and components
-    layouts_dir = skill_dir / 'assets' / 'layouts'
-    components_dir = skill_dir / 'assets' / 'components'
-    
-    if layouts_dir.exists():
-        for f in layouts_dir.glob('*.vue'):
-            shutil.copy(f, output_dir / 'layouts' / f.name)
-    
-    if components_dir.exists():
-        for f in components_dir.glob('*.vue'):
-            shutil.copy(f, output_dir / 'components' / f.name)
-    
-    # Apply colour overrides if provided
-    if colors:
-        apply_color_overrides(output_dir, colors)
-
-    # Copy logo
-    if logo and Path(logo).exists():
-        logo_path = Path(logo)
-        suffix = logo_path.suffix.lower() or '.svg'
-        shutil.copy(logo_path, output_dir / 'public' / f'logo{suffix}')
-    
-    # Create slidev.config.ts
-    config = f"""import {{ defineConfig }} from '@slidev/cli'
+def slidev_config(local_fonts: bool = False) -> str:
+    """slidev.config.ts source; `local_fonts` loads vendored @font-face rules and disables web font fetching."""
+    css = "'styles/theme.css', 'styles/fonts.css'" if local_fonts else "'styles/theme.css'"
+    provider = "\n    provider: 'none'," if local_fonts else ''
+    return f"""import {{ defineConfig }} from '@slidev/cli'
 
 export default defineConfig({{
   theme: 'none',
   fonts: {{
     sans: 'Inter',
-    serif: 'Georgia',
+    serif: 'Georgia',{provider}
   }},
-  css: ['styles/theme.css'],
+  css: [{css}],
 }})
 """
-    
-    with open(output_dir / 'slidev.config.ts', 'w') as f:
-        f.write(config)
-    
-    # Initialize git
+
+
+PROJECT_STATE = Path('.temp') / 'project-state.json'
+
+
+def files_digest(paths: Iterable[Path]) -> str:
+    """SHA-256 over the names and contents of `paths`, in name order."""
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=lambda p: p.name):
+        digest.update(path.name.encode('utf-8') + b'\0')
+        digest.update(path.read_bytes() if path.is_file() else b'<missing>')
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def payload_digest(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+INDEX_HTML = 'index.html'
+INDEX_MARKER = '<!-- Generated by scripts/create_slidev_project.py; do not edit. -->'
+BRAND_CSS = Path('public') / 'brand.css'
+# `%BASE_URL%` is Vite's HTML env replacement, so the link follows the build's
+# `--base`; `vite-ignore` stops Vite bundling brand.css, which must stay a
+# separate file for deploys to replace.
+BRAND_CSS_LINK = '<link rel="stylesheet" href="%BASE_URL%brand.css" vite-ignore>'
+FONT_MIME_TYPES = {'.woff2': 'font/woff2', '.woff': 'font/woff', '.ttf': 'font/ttf', '.otf': 'font/otf'}
+# Custom property behind each colour key, as patched by apply_color_overrides.
+CSS_VARIABLES = {
+    'primary': '--slide-primary',
+    'secondary': '--slide-secondary',
+    'accent': '--slide-accent',
+    'background': '--slide-bg',
+    'text': '--slide-text',
+    'text-light': '--slide-text-light',
+    'border': '--slide-border',
+    'grid': '--slide-grid',
+}
+# A brand's `grid` is the chart grid-line colour (see generate_charts.resolve_colors),
+# not the theme's `--slide-grid` tint. Runtime-themed charts read it from here;
+# it follows the border colour unless the brand sets it.
+CHART_GRID_VARIABLE = '--slide-chart-grid'
+
+
+def use_css_variables(output_dir: Path):
+    """Point the copied uno.config.ts colours at theme.css custom properties, for runtime theming."""
+    uno_path = output_dir / 'uno.config.ts'
+    uno = uno_path.read_text(encoding='utf-8')
+    for key, variable in CSS_VARIABLES.items():
+        uno = re.sub(
+            rf"((?:'{re.escape(key)}'|{re.escape(key)})\s*:\s*)'#[0-9A-Fa-f]{{6}}'",
+            rf"\1'var({variable})'",
+            uno,
+        )
+    uno_path.write_text(uno, encoding='utf-8')
+
+
+def brand_css(colors: dict) -> str:
+    """Per-brand variables file for runtime theming; deploys replace it in dist/."""
+    colors = normalise_colors(colors)
+    variables = {CSS_VARIABLES[key]: value for key, value in colors.items() if key != 'grid'}
+    variables[CHART_GRID_VARIABLE] = colors.get('grid', 'var(--slide-border)')
+    lines = ''.join(f"  {name}: {value};\n" for name, value in sorted(variables.items()))
+    # `html:root` outranks the theme's `:root`, whichever stylesheet loads last.
+    return f"/* Brand colours: #RRGGBB values for the theme's custom properties. */\nhtml:root {{\n{lines}}}\n"
+
+
+def index_html(deck_dir: Path) -> Optional[str]:
+    """Generated index.html head: the brand.css link and vendored font preloads; None when empty."""
+    links = []
+    if (deck_dir / BRAND_CSS).exists():
+        links.append(BRAND_CSS_LINK)
+    fonts_css = deck_dir / 'styles' / 'fonts.css'
+    if fonts_css.exists():
+        # Older fonts.css files use root-relative `/fonts/` URLs.
+        for name in re.findall(r"url\('(?:\.\./|/)fonts/([^']+)'\)", fonts_css.read_text(encoding='utf-8')):
+            mime = FONT_MIME_TYPES.get(Path(name).suffix, 'font/woff2')
+            links.append(f'<link rel="preload" href="%BASE_URL%fonts/{name}" as="font" type="{mime}" crossorigin vite-ignore>')
+    if not links:
+        return None
+    return '<head>\n  ' + '\n  '.join([INDEX_MARKER] + links) + '\n</head>\n'
+
+
+def write_index_html(deck_dir: Path) -> bool:
+    """Regenerate index.html; returns False, leaving it alone, when it was written by hand."""
+    path = deck_dir / INDEX_HTML
+    if path.exists() and INDEX_MARKER not in path.read_text(encoding='utf-8'):
+        return False
+    text = index_html(deck_dir)
+    if text is None:
+        if path.exists():
+            path.unlink()
+    else:
+        path.write_text(text, encoding='utf-8')
+    return True
+
+
+# Bump when the variant layout or colour patching changes to force a rebuild.
+THEME_CACHE_VERSION = 1
+THEME_FILES = (Path('styles') / 'theme.css', Path('uno.config.ts'))
+
+
+def default_theme_cache_dir() -> Path:
+    """Themed variants live beside the scaffold cache: `<cache>/themes`."""
+    return default_cache_dir().parent / 'themes'
+
+
+def theme_variant_key(theme_dir: Path, colors: dict, runtime: bool = False) -> str:
+    """Key for a themed variant: changes with the base theme files, the overrides or THEME_CACHE_VERSION."""
+    return payload_digest({
+        'version': THEME_CACHE_VERSION,
+        'theme': files_digest([theme_dir / 'theme.css', theme_dir / 'uno.config.ts']),
+        'colors': {} if runtime else normalise_colors(colors),
+        'runtime': runtime,
+    })[:12]
+
+
+def ensure_theme_variant(
+    theme_dir: Path, colors: dict, cache_dir: Optional[Path] = None, runtime: bool = False,
+) -> Path:
+    """Return the cached theme.css and uno.config.ts for (theme, colours), patching them on first use.
+
+    Runtime variants keep the theme's default colours and point
+    uno.config.ts at the CSS variables instead; brands come from brand.css.
+    Variants are built in a temporary sibling and renamed into place, as
+    scaffolds are, so a half-written variant is never reused.
+    """
+    cache_dir = cache_dir or default_theme_cache_dir()
+    variant_dir = cache_dir / f'{theme_dir.name}-{theme_variant_key(theme_dir, colors, runtime)}'
+    if all((variant_dir / path).exists() for path in THEME_FILES):
+        return variant_dir
+
+    staging = cache_dir / f'.{variant_dir.name}.tmp-{os.getpid()}'
+    (staging / 'styles').mkdir(parents=True, exist_ok=True)
+    try:
+        shutil.copy(theme_dir / 'theme.css', staging / 'styles' / 'theme.css')
+        shutil.copy(theme_dir / 'uno.config.ts', staging / 'uno.config.ts')
+        if runtime:
+            use_css_variables(staging)
+        else:
+            apply_color_overrides(staging, colors)
+        if variant_dir.exists():
+            shutil.rmtree(variant_dir)
+        staging.rename(variant_dir)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+    return variant_dir
+
+
+def read_project_state(output_dir: Path) -> Dict[str, str]:
+    """Fingerprints of the sub-steps last completed in `output_dir`."""
     try:
-        subprocess.run(['git', 'init'], cwd=output_dir, check=True, capture_output=True)
-        subprocess.run(['git', 'add', '.'], cwd=output_dir, check=True, capture_output=True)
-    except Exception as e:
-        print(f"⚠ Warning: Git initialization failed: {e}")
+        with open(output_dir / PROJECT_STATE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def write_project_state(output_dir: Path, state: Dict[str, str]):
+    path = output_dir / PROJECT_STATE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def create_project(
+    output_dir: Path,
+    theme: str,
+    colors: dict,
+    logo: Optional[str] = None,
+    chart_types_path: Optional[str] = None,
+    export_profile: str = 'standard',
+    scaffold_cache: Union[str, bool, None] = None,
+    workspace_root: Optional[Path] = None,
+    force: bool = False,
+    package_mirror: Optional[str] = None,
+    theme_cache: Union[str, bool, None] = None,
+    runtime_theme: bool = False,
+) -> List[Dict[str, Any]]:
+    """Create Slidev project structure.
+
+    Dependencies come from the prebuilt scaffold in `scaffold_cache` (a
+    directory, or None for the default cache) and are installed per deck
+    only when `scaffold_cache` is False. With `workspace_root`, they live
+    once in that root instead and the deck uses the shared toolchain.
+    Installs are offline extracts from `package_mirror` (default
+    `~/.cache/deck-generator/mirror`) when the skill ships a lockfile.
+    Themed files come from the variant cache in `theme_cache` (None for
+    `~/.cache/deck-generator/themes`, False to patch them in the deck).
+    With `runtime_theme`, colours are not baked in: uno.config.ts uses the
+    theme's CSS variables and `colors` go to `public/brand.css`, which a
+    built SPA loads at runtime, so one build serves every brand.
+
+    Components import Chart.js through `setup/chart-registry.js`, generated
+    from `chart_types_path` so only the chart types in use are bundled, and
+    read `setup/export-profile.json` for how charts behave during export.
+
+    Re-running is incremental: each sub-step records a fingerprint of its
+    inputs in `.temp/project-state.json` and is skipped while the
+    fingerprint matches and its outputs exist, unless `force` is set.
+    Returns one `{'step', 'skipped', 'seconds'}` entry per sub-step.
+    """
     
-    print(f"✓ Slidev project created at: {output_dir}")
+    # Create directories
+    dirs = ['public/images', 'public/data', 'components', 'layouts', 'styles', '.temp']
+    for d in dirs:
+        (output_dir / d).mkdir(parents=True, exist_ok=True)
+
+    skill_dir = Path(__file__).parent.parent
+    theme_dir = resolve_theme_dir(skill_dir, theme)
+    layouts = sorted((skill_dir / 'assets' / 'layouts').glob('*.vue'))
+    components = sorted((skill_dir / 'assets' / 'components').glob('*.vue'))
+    setup_modules = sorted((skill_dir / 'assets' / 'setup').glob('*.js'))
+    logo_path = Path(logo) if logo and Path(logo).exists() else None
+    logo_target = output_dir / 'public' / f"logo{logo_path.suffix.lower() or '.svg'}" if logo_path else None
+
+    state = {} if force else read_project_state(output_dir)
+    report: List[Dict[str, Any]] = []
+
+    def run_step(name: str, fingerprint: str, outputs: List[Path], action: Callable[[], None]):
+        if state.get(name) == fingerprint and all(path.exists() for path in outputs):
+            report.append({'step': name, 'skipped': True, 'seconds': 0.0})
+            return
+        started = time.perf_counter()
+        action()
+        state[name] = fingerprint
+        write_project_state(output_dir, state)
+        report.append({'step': name, 'skipped': False, 'seconds': time.perf_counter() - started})
+
+    # Dependencies: link the cached scaffold, or install from the registry.
+    mirror_dir = Path(package_mirror) if package_mirror else None
+
+    def dependencies():
+        started = time.perf_counter()
+        try:
+            if workspace_root:
+                ensure_workspace(workspace_root, scaffold_cache, mirror_dir)
+                attach_deck(workspace_root, output_dir)
+            elif scaffold_cache is False:
+                manager = install_dependencies(output_dir, mirror_dir)
+                print(f"✓ Installed dependencies with {manager} in {time.perf_counter() - started:.1f}s")
+            else:
+                scaffold_dir = ensure_scaffold(
+                    Path(scaffold_cache) if isinstance(scaffold_cache, str) else None, mirror_dir=mirror_dir,
+                )
+                mode = materialise_scaffold(scaffold_dir, output_dir)
+                print(f"✓ Materialised scaffold {scaffold_dir.name} ({mode}) in {time.perf_counter() - started:.1f}s")
+        except RuntimeError as e:
+            print(f"✗ {e}", file=sys.stderr)
+            sys.exit(1)
+
+    def copy_theme():
+        if theme_cache is False:
+            shutil.copy(theme_dir / 'theme.css', output_dir / 'styles' / 'theme.css')
+            shutil.copy(theme_dir / 'uno.config.ts', output_dir / 'uno.config.ts')
+            # Colour overrides patch the fresh copies, so they are re-applied together.
+            if runtime_theme:
+                use_css_variables(output_dir)
+            elif colors:
+                apply_color_overrides(output_dir, colors)
+        else:
+            variant_dir = ensure_theme_variant(
+                theme_dir, colors, Path(theme_cache) if isinstance(theme_cache, str) else None, runtime_theme,
+            )
+            for path in THEME_FILES:
+                shutil.copy(variant_dir / path, output_dir / path)
+
+        brand_path = output_dir / BRAND_CSS
+        if runtime_theme:
+            brand_path.write_text(brand_css(colors), encoding='utf-8')
+        elif brand_path.exists():
+            brand_path.unlink()
+        if not write_index_html(output_dir) and runtime_theme:
+            print(f"⚠ {output_dir / INDEX_HTML} is not generated; add {BRAND_CSS_LINK} to its <head>")
+
+    def copy_components():
+        for folder, files in (('layouts', layouts), ('components', components), ('setup', setup_modules)):
+            (output_dir / folder).mkdir(exist_ok=True)
+            for f in files:
+                shutil.copy(f, output_dir / folder / f.name)
+
+    def setup_modules_step():
+        write_export_profile(output_dir, export_profile)
+        generate_registry(output_dir, chart_types_path)
+
+    def write_config():
+        with open(output_dir / 'slidev.config.ts', 'w') as f:
+            f.write(slidev_config())
+
+    def init_git():
+        try:
+            subprocess.run(['git', 'init'], cwd=output_dir, check=True, capture_output=True)
+            subprocess.run(['git', 'add', '.'], cwd=output_dir, check=True, capture_output=True)
+        except Exception as e:
+            print(f"⚠ Warning: Git initialization failed: {e}")
+
+    run_step(
+        'dependencies',
+        payload_digest({
+            'key': scaffold_key(),
+            'mode': 'workspace' if workspace_root else 'install' if scaffold_cache is False else 'scaffold',
+            'workspace': str(workspace_root.resolve()) if workspace_root else None,
+        }),
+        [output_dir / VITE_CONFIG] if workspace_root else [output_dir / 'node_modules'],
+        dependencies,
+    )
+    run_step(
+        'theme',
+        payload_digest({
+            'files': files_digest([theme_dir / 'theme.css', theme_dir / 'uno.config.ts']),
+            'colors': colors,
+            'runtime': runtime_theme,
+        }),
+        [output_dir / 'styles' / 'theme.css', output_dir / 'uno.config.ts']
+        + ([output_dir / BRAND_CSS] if runtime_theme else []),
+        copy_theme,
+    )
+    run_step(
+        'components',
+        payload_digest([files_digest(layouts), files_digest(components), files_digest(setup_modules)]),
+        [output_dir / 'layouts' / f.name for f in layouts]
+        + [output_dir / 'components' / f.name for f in components]
+        + [output_dir / 'setup' / f.name for f in setup_modules],
+        copy_components,
+    )
+    # The registry also reads generated chart configs, so public/data is part of the fingerprint.
+    data_files = list((output_dir / 'public' / 'data').glob('*.json'))
+    run_step(
+        'setup',
+        payload_digest({
+            'profile': export_profile,
+            'chart_types': files_digest([Path(chart_types_path)]) if chart_types_path else None,
+            'data': files_digest(data_files),
+        }),
+        [output_dir / EXPORT_PROFILE_FILE, output_dir / REGISTRY_FILE],
+        setup_modules_step,
+    )
+    if logo_path:
+        run_step('logo', files_digest([logo_path]), [logo_target], lambda: shutil.copy(logo_path, logo_target))
+    # vendor_fonts rewrites slidev.config.ts after the build; an unchanged config is left alone.
+    run_step('config', payload_digest(slidev_config()), [output_dir / 'slidev.config.ts'], write_config)
+    # Re-stage whenever any other sub-step's recorded inputs moved on since the last `git add`.
+    run_step('git', payload_digest({k: v for k, v in state.items() if k != 'git'}), [output_dir / '.git'], init_git)
+    changed = [entry['step'] for entry in report if not entry['skipped']]
+
+    for entry in report:
+        if entry['skipped']:
+            print(f"  · {entry['step']}: skipped (unchanged)")
+        else:
+            print(f"  ✓ {entry['step']}: {entry['seconds']:.2f}s")
+    if changed:
+        print(f"✓ Slidev project created at: {output_dir}")
+    else:
+        print(f"✓ Slidev project up to date at: {output_dir}")
+    return report
 
 
 def main():
@@ -189,6 +483,18 @@ def main():
     parser.add_argument('--colors', help='JSON string of colors')
     parser.add_argument('--logo', help='Path to logo file')
     parser.add_argument('--output', required=True, help='Output directory')
+    parser.add_argument('--chart-types', help='Path to chart-types.json for the Chart.js registry')
+    parser.add_argument('--export-profile', choices=list(EXPORT_PROFILES), default='standard',
+                        help="'render' exports charts without animation and waits for them to signal readiness")
+    parser.add_argument('--scaffold-cache', help='Prebuilt scaffold cache directory (default: ~/.cache/deck-generator/scaffold)')
+    parser.add_argument('--no-scaffold-cache', action='store_true', help='Install dependencies into the deck directly')
+    parser.add_argument('--workspace', help='Workspace root with shared dependencies (deck should be a subfolder)')
+    parser.add_argument('--force', action='store_true', help='Redo every sub-step even if its inputs are unchanged')
+    parser.add_argument('--theme-cache', help='Themed variant cache directory (default: ~/.cache/deck-generator/themes)')
+    parser.add_argument('--no-theme-cache', action='store_true', help='Patch theme colours in the deck directly')
+    parser.add_argument('--runtime-theme', action='store_true',
+                        help='Keep colours in public/brand.css (CSS variables) so one build serves every brand')
+    parser.add_argument('--package-mirror', help='Package tarball mirror for offline installs (default: ~/.cache/deck-generator/mirror)')
     args = parser.parse_args()
     
     output_dir = Path(args.output)
@@ -199,7 +505,13 @@ def main():
         except json.JSONDecodeError:
             print("⚠ Invalid --colors JSON. Ignoring colour overrides.")
 
-    create_project(output_dir, args.theme, colors, args.logo)
+    scaffold_cache = False if args.no_scaffold_cache else args.scaffold_cache
+    workspace_root = Path(args.workspace) if args.workspace else None
+    create_project(
+        output_dir, args.theme, colors, args.logo, args.chart_types, args.export_profile, scaffold_cache, workspace_root,
+        args.force, args.package_mirror, False if args.no_theme_cache else args.theme_cache,
+        args.runtime_theme,
+    )
 
 
 if __name__ == '__main__':
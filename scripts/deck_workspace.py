@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Multi-deck workspace: one root with the shared toolchain, one folder per deck.
+
+The root holds `package.json`, the lockfile and `node_modules` (linked
+from the prebuilt scaffold) and a persistent `.vite/` cache. Deck folders
+(`<project>_deck/`) keep only deck files: slides.md, public/, styles/,
+components/, layouts/ and setup/. They have no package.json, so Node,
+npx and bunx resolve @slidev/cli and playwright-chromium from the root.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from scaffold_cache import ensure_scaffold, install_dependencies, materialise_scaffold
+
+
+WORKSPACE_FILE = 'deck-workspace.json'
+VITE_CACHE_DIR = '.vite'
+VITE_CONFIG = 'vite.config.ts'
+
+
+def read_workspace(root: Path) -> Dict[str, Any]:
+    try:
+        with open(root / WORKSPACE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def ensure_workspace(
+    root: Path, scaffold_cache: Union[str, bool, None] = None, mirror_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Set up the shared toolchain in `root`; a no-op when it already matches the current scaffold.
+
+    `scaffold_cache` follows create_project: a cache directory, None for the
+    default cache, or False to install into the root directly.
+    `mirror_dir` is the package mirror for offline installs.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    state = read_workspace(root)
+    started = time.perf_counter()
+
+    if scaffold_cache is False:
+        if (root / 'node_modules').is_dir():
+            return state
+        manager = install_dependencies(root, mirror_dir)
+        state = {'scaffold': None, 'link_mode': None, 'manager': manager}
+    else:
+        scaffold_dir = ensure_scaffold(
+            Path(scaffold_cache) if isinstance(scaffold_cache, str) else None, mirror_dir=mirror_dir,
+        )
+        if state.get('scaffold') == scaffold_dir.name and (root / 'node_modules').is_dir():
+            return state
+        mode = materialise_scaffold(scaffold_dir, root)
+        state = {'scaffold': scaffold_dir.name, 'link_mode': mode}
+
+    state['updated'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    (root / VITE_CACHE_DIR).mkdir(exist_ok=True)
+    with open(root / WORKSPACE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    print(f"✓ Workspace toolchain ready in {time.perf_counter() - started:.1f}s: {root}")
+    return state
+
+
+def vite_config(cache_dir: str) -> str:
+    # A plain object, so the config needs no import resolution of its own.
+    return (
+        '// Generated by scripts/deck_workspace.py; do not edit.\n'
+        '// Vite pre-bundles dependencies here, outside the deck, so the cache\n'
+        '// survives deck rebuilds and lives beside the shared node_modules.\n'
+        f"export default {{\n  cacheDir: '{cache_dir}',\n}}\n"
+    )
+
+
+def attach_deck(root: Path, deck_dir: Path) -> Path:
+    """Point the deck at the workspace: its Vite cache goes to `<root>/.vite/<deck>`.
+
+    Each deck keeps its own cache directory, because Vite invalidates a cache
+    whose config differs; sharing one directory would rebuild it on every
+    switch between decks.
+    """
+    if (deck_dir / 'package.json').exists():
+        print(f"⚠ {deck_dir / 'package.json'} shadows the workspace dependencies; remove it and node_modules to share them")
+    cache_dir = root / VITE_CACHE_DIR / deck_dir.name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    relative = Path(os.path.relpath(cache_dir, deck_dir)).as_posix()
+    (deck_dir / VITE_CONFIG).write_text(vite_config(relative), encoding='utf-8')
+    return cache_dir
+
+
+def list_decks(root: Path) -> List[Path]:
+    """Deck folders in the workspace (those with a slides.md)."""
+    return sorted(path for path in root.iterdir() if path.is_dir() and (path / 'slides.md').exists())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Set up or inspect a multi-deck workspace')
+    parser.add_argument('--root', required=True, help='Workspace root (the pipeline output_root)')
+    parser.add_argument('--scaffold-cache', help='Prebuilt scaffold cache directory')
+    parser.add_argument('--package-mirror', help='Package tarball mirror for offline installs')
+    parser.add_argument('--list', action='store_true', help='List decks in the workspace')
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if args.list:
+        for deck in list_decks(root):
+            print(deck.name)
+        return
+    try:
+        state = ensure_workspace(root, args.scaffold_cache, Path(args.package_mirror) if args.package_mirror else None)
+    except RuntimeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✓ Workspace {root} ({state.get('scaffold') or state.get('manager')}), {len(list_decks(root))} deck(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,16 +4,42 @@ Export presentation to multiple formats.
 """
 
 import argparse
+import json
 import shutil
 import subprocess
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from validate_analysis import validate_analysis_payload
 from utils import load_json
 
 
+EXPORT_PROFILE_FILE = Path('setup') / 'export-profile.json'
+# Settings read by setup/chart-export.js, plus the default per-slide wait.
+EXPORT_PROFILES = {
+    # Animated charts captured after a fixed per-slide delay.
+    'standard': {'animation': True, 'signalRendered': False, 'wait': 1000},
+    # Charts draw without animation and flag themselves rendered; Slidev
+    # waits on their `data-waitfor` selector, so no fixed delay is needed.
+    'render': {'animation': False, 'signalRendered': True, 'wait': 0},
+}
+
+
+def write_export_profile(deck_dir: Path, profile: str = 'standard') -> bool:
+    """Write the deck's setup/export-profile.json; returns whether it changed."""
+    if profile not in EXPORT_PROFILES:
+        raise ValueError(f"Unknown export profile: {profile}. Use one of: {', '.join(EXPORT_PROFILES)}")
+    settings = {key: value for key, value in EXPORT_PROFILES[profile].items() if key != 'wait'}
+    text = json.dumps({'profile': profile, **settings}, indent=2) + '\n'
+    path = deck_dir / EXPORT_PROFILE_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
 def resolve_slidev_runner() -> List[str]:
     """Resolve Slidev runner command from available tooling."""
     if shutil.which('bunx'):
@@ -27,12 +53,19 @@ def export_format(
     deck_dir: Path,
     format_type: str,
     timeout: int = 60000,
-    wait: int = 1000,
+    wait: Optional[int] = None,
     base: str = '/',
+    profile: str = 'standard',
 ):
-    """Export to specific format."""
+    """Export to specific format.
+
+    `wait` defaults to the profile's per-slide delay: 1000 ms for
+    'standard', none for 'render', which waits on chart readiness instead.
+    """
     output_name = deck_dir.name.replace('_deck', '')
     runner = resolve_slidev_runner()
+    if wait is None:
+        wait = EXPORT_PROFILES[profile]['wait']
 
     if format_type == 'pdf':
         cmd = runner + [
@@ -81,9 +114,14 @@ def export_all(
     analysis_path: str = None,
     base: str = '/',
     timeout: int = 60000,
-    wait: int = 1000,
+    wait: Optional[int] = None,
+    profile: str = 'standard',
 ) -> int:
-    """Export all requested formats. Callable from pipeline or CLI."""
+    """Export all requested formats. Callable from pipeline or CLI.
+
+    The export profile is written into the deck first, so switching
+    profiles does not need the project step re-run.
+    """
     dd = Path(deck_dir)
 
     if not dd.exists():
@@ -98,11 +136,14 @@ def export_all(
             print(msg, file=sys.stderr)
             raise ValueError(msg)
 
+    if write_export_profile(dd, profile):
+        print(f"✓ Export profile: {profile}")
+
     success = []
     failed = []
 
     for fmt in formats:
-        if export_format(dd, fmt, timeout, wait, base):
+        if export_format(dd, fmt, timeout, wait, base, profile):
             success.append(fmt)
         else:
             failed.append(fmt)
@@ -123,12 +164,15 @@ def main():
     parser.add_argument('--formats', nargs='+', default=['pdf', 'pptx', 'spa'],
                        help='Formats to export (pdf, pptx, spa)')
     parser.add_argument('--timeout', type=int, default=60000, help='Export timeout in ms')
-    parser.add_argument('--wait', type=int, default=1000, help='Per-slide render wait in ms for export')
+    parser.add_argument('--wait', type=int,
+                        help="Per-slide render wait in ms for export (default: 1000 for 'standard', 0 for 'render')")
+    parser.add_argument('--profile', choices=list(EXPORT_PROFILES), default='standard',
+                        help="'render' turns chart animations off and waits for charts to signal they are drawn")
     parser.add_argument('--base', default='/', help="Base path for SPA build (must start and end with '/')")
     parser.add_argument('--analysis', help='Optional analysis.json path to validate before export')
     args = parser.parse_args()
 
-    rc = export_all(args.deck_dir, args.formats, args.analysis, args.base, args.timeout, args.wait)
+    rc = export_all(args.deck_dir, args.formats, args.analysis, args.base, args.timeout, args.wait, args.profile)
     return rc
 
 
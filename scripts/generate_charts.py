@@ -4,14 +4,58 @@ Generate Chart.js configurations from data.
 """
 
 import argparse
+import gzip
+import hashlib
 import json
+import math
+import os
 import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from chart_expressions import compile_expression, expression_column
+from chart_transforms import (
+    apply_visual_transforms,
+    as_key_list,
+    hash_join,
+    join_specs,
+    lttb_indices,
+    partition_records,
+    time_axis_values,
+    top_n_indices,
+    validate_transforms,
+)
 from utils import build_content_index, extract_records, to_float
 
 
+OVERRIDE_VISUAL_KEYS = {
+    'source_file', 'x_key', 'y_key', 'series_key', 'data_file',
+    'agg', 'group_by', 'sort', 'limit', 'max_points', 'top_n', 'x_type', 'join',
+    'y_expr', 'y_name', 'facet_key', 'facet_limit',
+}
+
+DEFAULT_MAX_LINE_POINTS = 1000
+
+# Time-axis series longer than this draw no point markers, which keeps
+# Chart.js decimation and rendering cheap on long series.
+TIME_POINT_MARKER_LIMIT = 100
+
+# Categories kept before the long tail is folded into "Other". Pie and donut
+# stop at five so "Other" takes the last of the six palette colours.
+DEFAULT_TOP_N = {
+    'bar': 15,
+    'horizontal_bar': 15,
+    'pie': 5,
+    'donut': 5,
+}
+OTHER_LABEL = 'Other'
+
+# Small multiples beyond this are dropped; a grid of more is unreadable on a slide.
+DEFAULT_MAX_FACETS = 12
+
+
 def generate_bar_chart(data, labels, dataset_label, colors):
     """Generate bar chart configuration."""
     return {
@@ -80,6 +124,51 @@ def generate_line_chart(data, labels, dataset_label, colors):
     }
 
 
+def generate_time_line_chart(series, colors):
+    """Generate a time-axis line chart configuration from `(label, points)` series.
+
+    Points are pre-sorted `{x: epoch_ms, y}` objects, so Chart.js can skip
+    parsing and apply its LTTB decimation plugin.
+    """
+    palette = [colors['primary'], colors['secondary'], colors['accent'], '#666666']
+    datasets = []
+    for idx, (label, points) in enumerate(series):
+        tone = palette[idx % len(palette)]
+        datasets.append({
+            'label': label,
+            'data': points,
+            'borderColor': tone,
+            'backgroundColor': tone + '20',
+            'borderWidth': 3 if len(series) == 1 else 2,
+            'fill': True,
+            'tension': 0.3,
+            'pointRadius': 0 if len(points) > TIME_POINT_MARKER_LIMIT else 3,
+        })
+    return {
+        'type': 'line',
+        'data': {'datasets': datasets},
+        'options': {
+            'responsive': True,
+            'maintainAspectRatio': False,
+            'parsing': False,
+            'plugins': {
+                'legend': {'display': len(series) > 1},
+                'decimation': {'enabled': True, 'algorithm': 'lttb'},
+            },
+            'scales': {
+                'y': {
+                    'beginAtZero': False,
+                    'grid': {'color': colors['grid']}
+                },
+                'x': {
+                    'type': 'time',
+                    'grid': {'display': False}
+                }
+            }
+        }
+    }
+
+
 def generate_waterfall_chart(data, labels, colors):
     """Generate waterfall chart configuration."""
     return {
@@ -214,13 +303,153 @@ def build_multi_series(records: List[Dict[str, Any]], x_key: str, y_key: str, se
     return labels, datasets
 
 
-def chart_from_records(chart_type: str, records: List[Dict[str, Any]], visual: Dict[str, Any], colors: Dict[str, str]):
+def downsample_line_config(config: Dict[str, Any], max_points: int) -> Dict[str, Any]:
+    """Downsample a line config in place with LTTB.
+
+    Each dataset gets an equal share of the point budget and the union of
+    the selected indices is kept, so every series keeps its shape while
+    labels stay aligned. Returns metadata, or an empty dict when untouched.
+    """
+    labels = config.get('data', {}).get('labels') or []
+    datasets = config.get('data', {}).get('datasets') or []
+    if datasets and not labels:
+        return downsample_time_datasets(datasets, max_points)
+    if not max_points or max_points < 3 or len(labels) <= max_points or not datasets:
+        return {}
+
+    budget = max(3, max_points // len(datasets))
+    keep = set()
+    for ds in datasets:
+        keep.update(lttb_indices(ds['data'], budget))
+    indices = sorted(keep)
+
+    config['data']['labels'] = [labels[idx] for idx in indices]
+    for ds in datasets:
+        ds['data'] = [ds['data'][idx] for idx in indices]
+    return {
+        'method': 'lttb',
+        'max_points': max_points,
+        'source_points': len(labels),
+        'points': len(indices),
+    }
+
+
+def downsample_time_datasets(datasets: List[Dict[str, Any]], max_points: int) -> Dict[str, Any]:
+    """Downsample `{x, y}` time-axis datasets in place with LTTB.
+
+    Series carry their own x values, so each one is reduced independently
+    against its share of the budget using real time spacing.
+    """
+    source_points = sum(len(ds['data']) for ds in datasets)
+    if not max_points or max_points < 3 or source_points <= max_points:
+        return {}
+
+    budget = max(3, max_points // len(datasets))
+    for ds in datasets:
+        points = ds['data']
+        indices = lttb_indices([point['y'] for point in points], budget, [point['x'] for point in points])
+        ds['data'] = [points[idx] for idx in indices]
+        if len(ds['data']) <= TIME_POINT_MARKER_LIMIT and 'pointRadius' in ds:
+            ds['pointRadius'] = 3
+    return {
+        'method': 'lttb',
+        'max_points': max_points,
+        'source_points': source_points,
+        'points': sum(len(ds['data']) for ds in datasets),
+    }
+
+
+def fold_top_n_config(config: Dict[str, Any], top_n: int) -> Dict[str, Any]:
+    """Keep the `top_n` largest categories and fold the rest into "Other".
+
+    Categories are ranked by their total across datasets. Returns metadata,
+    or an empty dict when the config has no more than `top_n` categories.
+    """
+    labels = config.get('data', {}).get('labels') or []
+    datasets = config.get('data', {}).get('datasets') or []
+    if not top_n or top_n < 1 or len(labels) <= top_n + 1 or not datasets:
+        return {}
+
+    totals = [math.fsum(ds['data'][idx] for ds in datasets) for idx in range(len(labels))]
+    keep = top_n_indices(totals, top_n)
+    kept = set(keep)
+    folded = [idx for idx in range(len(labels)) if idx not in kept]
+
+    config['data']['labels'] = [labels[idx] for idx in keep] + [OTHER_LABEL]
+    for ds in datasets:
+        ds['data'] = [ds['data'][idx] for idx in keep] + [math.fsum(ds['data'][idx] for idx in folded)]
+        if isinstance(ds.get('backgroundColor'), list):
+            ds['backgroundColor'] = ds['backgroundColor'][:len(ds['data'])]
+    return {
+        'n': top_n,
+        'categories': len(labels),
+        'folded': len(folded),
+        'other_label': OTHER_LABEL,
+        'other_value': math.fsum(totals[idx] for idx in folded),
+    }
+
+
+def chart_from_records(
+    chart_type: str,
+    records: List[Dict[str, Any]],
+    visual: Dict[str, Any],
+    colors: Dict[str, str],
+    max_points: int = DEFAULT_MAX_LINE_POINTS,
+):
     """Generate a chart configuration from mapped records."""
-    x_key, y_key = infer_keys(records, visual.get('x_key'), visual.get('y_key'))
+    group_by = as_key_list(visual.get('group_by'))
+    x_hint = visual.get('x_key') or (group_by[0] if group_by else None)
+    y_expr = visual.get('y_expr')
+    expr_columns = compile_expression(y_expr)[1] if y_expr else ()
+    x_key, y_key = infer_keys(records, x_hint, expr_columns[0] if expr_columns else visual.get('y_key'))
     if not x_key or not y_key:
         return None
+    if y_expr:
+        y_key = expression_column(visual)
+
+    records, meta = apply_visual_transforms(records, visual, x_key, y_key)
+    config = build_config(chart_type, records, visual, colors, x_key, y_key)
+    if config is None:
+        return None
+
+    if chart_type == 'line':
+        limit = visual.get('max_points', max_points)
+        downsample = downsample_line_config(config, limit) if isinstance(limit, int) else {}
+        if downsample:
+            meta['downsample'] = downsample
+    if chart_type in DEFAULT_TOP_N:
+        top_n = visual.get('top_n', DEFAULT_TOP_N[chart_type])
+        folded = fold_top_n_config(config, top_n) if isinstance(top_n, int) else {}
+        if folded:
+            meta['top_n'] = folded
+    if meta:
+        config['meta'] = meta
+    return config
+
+
+def build_time_series(records, stamps, y_key, series_key=None):
+    """Group records into `(label, points)` series of x-sorted `{x, y}` points."""
+    fallback = y_key.replace('_', ' ').title()
+    series: Dict[str, List[Dict[str, float]]] = {}
+    for row, stamp in zip(records, stamps):
+        value = to_float(row.get(y_key))
+        name = row.get(series_key) if series_key else fallback
+        if stamp is None or value is None or name in (None, ''):
+            continue
+        series.setdefault(str(name), []).append({'x': stamp, 'y': value})
+    for points in series.values():
+        points.sort(key=lambda point: point['x'])
+    return list(series.items())
+
 
+def build_config(chart_type, records, visual, colors, x_key, y_key):
+    """Build a chart configuration from records whose x/y keys are resolved."""
     series_key = visual.get('series_key')
+    if chart_type == 'line':
+        stamps = time_axis_values(records, x_key, visual.get('x_type'))
+        if stamps is not None:
+            series = build_time_series(records, stamps, y_key, series_key)
+            return generate_time_line_chart(series, colors) if series else None
     if series_key:
         labels, dataset_rows = build_multi_series(records, x_key, y_key, series_key)
         if not labels or not dataset_rows:
@@ -285,6 +514,16 @@ THEME_PALETTES = {
 
 HEX_COLOR_RE = re.compile(r'^#[0-9A-Fa-f]{6}$')
 
+# Runtime theming: colours are theme.css custom properties that DeckChart
+# resolves when drawing, so a deploy-time brand.css recolours the charts.
+# Alpha suffixes (`+ '20'`) still apply because brand colours are #RRGGBB.
+CSS_VAR_COLORS = {
+    'primary': 'var(--slide-primary)',
+    'secondary': 'var(--slide-secondary)',
+    'accent': 'var(--slide-accent)',
+    'grid': 'var(--slide-chart-grid)',
+}
+
 
 def resolve_colors(theme: str, colors_json: str = None) -> dict:
     """Resolve chart colour palette from theme + optional JSON overrides."""
@@ -301,6 +540,422 @@ def resolve_colors(theme: str, colors_json: str = None) -> dict:
     return colors
 
 
+CHART_DEFAULTS_FILE = 'chart-defaults.json'
+CHART_BUNDLE_FILE = 'charts.bundle.json'
+
+
+def facet_file_name(output_name: str, index: int) -> str:
+    """Config file for the `index`-th (1-based) facet of a faceted chart."""
+    return f"{Path(output_name).stem}-{index}.json"
+
+
+def facet_manifest_name(output_name: str) -> str:
+    """Manifest listing a faceted chart's facet titles and config files."""
+    return f"{Path(output_name).stem}.facets.json"
+
+
+def chart_defaults(colors: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    """Shared per-type Chart.js options used as the base for compact configs."""
+    pie_options = generate_pie_chart([], [], colors)['options']
+    return {
+        'bar': generate_bar_chart([], [], '', colors)['options'],
+        'line': generate_line_chart([], [], '', colors)['options'],
+        'pie': pie_options,
+        'doughnut': pie_options,
+    }
+
+
+def options_delta(options: Dict[str, Any], defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the keys of `options` that differ from `defaults`.
+
+    Nested dicts are diffed recursively; keys present only in `defaults`
+    are emitted as None so the client merge can drop them.
+    """
+    delta = {}
+    for key, value in options.items():
+        base = defaults.get(key)
+        if isinstance(value, dict) and isinstance(base, dict):
+            nested = options_delta(value, base)
+            if nested:
+                delta[key] = nested
+        elif key not in defaults or value != base:
+            delta[key] = value
+    for key in defaults:
+        if key not in options:
+            delta[key] = None
+    return delta
+
+
+def merge_options(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply an options delta onto defaults; the inverse of `options_delta`."""
+    merged = dict(base or {})
+    for key, value in (delta or {}).items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_options(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def compact_config(config: Dict[str, Any], defaults: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Replace a config's options with a delta against the shared type defaults."""
+    base = defaults.get(config.get('type'))
+    if base is None:
+        return config
+    compacted = dict(config)
+    compacted['options'] = options_delta(config.get('options', {}), base)
+    compacted['extends'] = CHART_DEFAULTS_FILE
+    return compacted
+
+
+def round_numbers(payload: Any, precision: int) -> Any:
+    """Round floats to `precision` decimals, emitting whole numbers as ints."""
+    if isinstance(payload, float):
+        rounded = round(payload, precision)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(payload, dict):
+        return {key: round_numbers(value, precision) for key, value in payload.items()}
+    if isinstance(payload, list):
+        return [round_numbers(value, precision) for value in payload]
+    return payload
+
+
+def round_chart_data(config: Dict[str, Any], precision: int) -> Dict[str, Any]:
+    """Round the numbers in each dataset's `data`; styling such as `tension` keeps full precision."""
+    data = config.get('data')
+    if not isinstance(data, dict) or not data.get('datasets'):
+        return config
+    datasets = [
+        {**ds, 'data': round_numbers(ds['data'], precision)} if isinstance(ds, dict) and 'data' in ds else ds
+        for ds in data['datasets']
+    ]
+    return {**config, 'data': {**data, 'datasets': datasets}}
+
+
+def serialise_chart(payload: Any, compact: bool = False) -> str:
+    """Serialise a chart payload, minified in compact mode and indented otherwise."""
+    if compact:
+        return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+    return json.dumps(payload, indent=2)
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """Write `text` unless the file already holds it; returns whether it was written.
+
+    Leaving identical files untouched (mtime included) means Vite HMR and
+    browser caches only see real updates.
+    """
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return False
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
+def write_chart_json(path: Path, payload: Any, compact: bool = False) -> bool:
+    """Serialise and write a chart payload if its content changed."""
+    return write_text_if_changed(path, serialise_chart(payload, compact))
+
+
+# Bump when generator output changes so existing fingerprints are invalidated.
+FINGERPRINT_VERSION = 3
+
+
+def canonical_digest(payload: Any) -> str:
+    """SHA-256 of a payload's canonical JSON form."""
+    text = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def chart_fingerprint(
+    visual: Dict[str, Any],
+    slide_override: Dict[str, Any],
+    chart_type: str,
+    source_hash: Optional[str],
+    colors: Dict[str, str],
+    settings: Dict[str, Any],
+) -> str:
+    """Fingerprint every input that shapes a slide's chart config."""
+    return canonical_digest({
+        'version': FINGERPRINT_VERSION,
+        'visual': visual,
+        'override': slide_override,
+        'chart_type': chart_type,
+        'source': source_hash,
+        'colors': colors,
+        'settings': settings,
+    })
+
+
+def read_fingerprinted_chart(path: Path, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Return the existing chart config at `path` if it carries `fingerprint`."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    meta = existing.get('meta') if isinstance(existing, dict) else None
+    if isinstance(meta, dict) and meta.get('fingerprint') == fingerprint:
+        return existing
+    return None
+
+
+DATASET_DIR = 'datasets'
+DATASET_REF = '$dataset'
+# Shorter arrays stay inline; a reference would cost more than it saves.
+DEDUPE_MIN_VALUES = 8
+
+
+def dataset_digest(values: List[Any]) -> str:
+    """Content address of a data array: truncated SHA-256 of its canonical JSON."""
+    return canonical_digest(values)[:16]
+
+
+def _dataset_arrays(config: Dict[str, Any]):
+    """Yield `(container, key)` for the label and dataset arrays of a config."""
+    data = config.get('data')
+    if not isinstance(data, dict):
+        return
+    if 'labels' in data:
+        yield data, 'labels'
+    for ds in data.get('datasets') or []:
+        if isinstance(ds, dict) and 'data' in ds:
+            yield ds, 'data'
+
+
+def dedupe_datasets(config: Dict[str, Any], blobs: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """Return a copy of `config` whose large data arrays are `{"$dataset": digest}` refs.
+
+    Referenced arrays are added to `blobs` by digest, so identical series
+    across charts (and decks sharing a store) are stored once.
+    """
+    shipped = json.loads(json.dumps(config))
+    for container, key in _dataset_arrays(shipped):
+        values = container[key]
+        if isinstance(values, list) and len(values) >= DEDUPE_MIN_VALUES:
+            digest = dataset_digest(values)
+            blobs[digest] = values
+            container[key] = {DATASET_REF: digest}
+    return shipped
+
+
+def resolve_dataset_refs(config: Dict[str, Any], load) -> Dict[str, Any]:
+    """Return a copy of `config` with dataset refs replaced by `load(digest)`."""
+    resolved = json.loads(json.dumps(config))
+    for container, key in _dataset_arrays(resolved):
+        ref = container[key]
+        if isinstance(ref, dict) and DATASET_REF in ref:
+            container[key] = load(ref[DATASET_REF])
+    return resolved
+
+
+def load_dataset_blob(data_dir: Path, digest: str) -> List[Any]:
+    """Read a content-addressed dataset written by `publish_datasets`."""
+    with open(data_dir / DATASET_DIR / f"{digest}.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def publish_datasets(out: Path, blobs: Dict[str, List[Any]], store: Optional[str] = None) -> int:
+    """Write dataset blobs under `out/datasets` and drop blobs no chart references.
+
+    With `store`, blobs are written once to that shared directory and
+    hard-linked into the deck (copied where linking fails), so sibling
+    decks keep a single copy on disk. Returns the number of new blobs.
+    """
+    dataset_dir = out / DATASET_DIR
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    store_dir = Path(store) if store else None
+    if store_dir:
+        store_dir.mkdir(parents=True, exist_ok=True)
+
+    added = 0
+    for digest, values in blobs.items():
+        target = dataset_dir / f"{digest}.json"
+        if target.exists():
+            continue
+        text = json.dumps(values, separators=(',', ':'), ensure_ascii=False)
+        if store_dir:
+            shared = store_dir / target.name
+            if not shared.exists():
+                shared.write_text(text, encoding='utf-8')
+            try:
+                os.link(shared, target)
+            except OSError:
+                shutil.copyfile(shared, target)
+        else:
+            target.write_text(text, encoding='utf-8')
+        added += 1
+
+    for stale in dataset_dir.glob('*.json'):
+        if stale.stem not in blobs:
+            stale.unlink()
+    return added
+
+
+def sample_chart(chart_type: str, colors: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Placeholder config used when a slide has no mappable source data."""
+    if chart_type == 'line':
+        return generate_line_chart([1.8, 2.0, 2.2, 2.4], ['Q1', 'Q2', 'Q3', 'Q4'], 'Revenue (£M)', colors)
+    if chart_type == 'bar':
+        return generate_bar_chart([15, 23, 18, 12, 8], ['UK', 'Germany', 'France', 'Netherlands', 'Other'], 'Market Share (%)', colors)
+    if chart_type == 'waterfall':
+        return generate_waterfall_chart([100, 15, -5, 10, 120], ['Baseline', 'Volume', 'Price', 'Mix', 'Final'], colors)
+    if chart_type in ['pie', 'donut']:
+        config = generate_pie_chart([35, 25, 20, 12, 8], ['Product A', 'Product B', 'Product C', 'Product D', 'Other'], colors)
+        if chart_type == 'donut':
+            config['type'] = 'doughnut'
+        return config
+    return None
+
+
+# Per-process source state for chart workers. Each worker process receives
+# the content index once (init_chart_worker) and resolves, joins and facets
+# its own records, so tasks carry only visual specs rather than pickled rows.
+_worker_sources: Dict[str, Any] = {'content_index': {}, 'join_cache': {}, 'facets': {}}
+
+
+def resolve_source_records(
+    visual: Dict[str, Any],
+    content_index: Dict[str, Dict[str, Any]],
+    join_cache: Optional[Dict[Tuple[str, ...], List[Dict[str, Any]]]] = None,
+) -> List[Dict[str, Any]]:
+    """Load a visual's source records and apply its `join` chain.
+
+    Each joined result is cached under its source file plus the join specs
+    applied so far, so slides that join the same sources (or share a
+    prefix of joins) reuse the work within one run.
+    """
+    source_file = visual.get('source_file')
+    if not source_file:
+        return []
+    specs = join_specs(visual)
+    cache = join_cache if join_cache is not None else {}
+
+    records = None
+    cache_key: Tuple[str, ...] = (source_file,)
+    for spec in specs:
+        cache_key += (canonical_digest(spec),)
+        if cache_key in cache:
+            records = cache[cache_key]
+            continue
+        if records is None:
+            records = extract_records(content_index.get(source_file, {}))
+        right = extract_records(content_index.get(spec['source_file'], {}))
+        records = hash_join(
+            records, right, spec['left_on'], spec['right_on'], spec['how'], spec['columns'], spec['suffix'],
+        )
+        cache[cache_key] = records
+    if records is None:
+        records = extract_records(content_index.get(source_file, {}))
+    return records
+
+
+def load_content_index(content_path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not content_path:
+        return {}
+    with open(content_path, 'r', encoding='utf-8') as f:
+        return build_content_index(json.load(f))
+
+
+def init_chart_worker(content_index: Dict[str, Dict[str, Any]]) -> None:
+    """Process pool initializer: install the content index once per worker.
+
+    Forked workers inherit it without pickling; spawned workers unpickle it
+    once at start-up rather than once per task.
+    """
+    _worker_sources.update(content_index=content_index, join_cache={}, facets={})
+
+
+def facet_cache_key(visual: Dict[str, Any]) -> str:
+    return canonical_digest([visual.get('source_file'), join_specs(visual), visual.get('facet_key')])
+
+
+def task_records(visual: Dict[str, Any], sources: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Resolve a task's records from `sources`, narrowed to its facet if it has one."""
+    if 'facet_value' not in visual:
+        return resolve_source_records(visual, sources['content_index'], sources['join_cache'])
+    key = facet_cache_key(visual)
+    if key not in sources['facets']:
+        records = resolve_source_records(visual, sources['content_index'], sources['join_cache'])
+        sources['facets'][key] = partition_records(records, visual['facet_key'])
+    return sources['facets'][key].get(visual['facet_value'], [])
+
+
+def build_chart_task(task: Dict[str, Any], sources: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build, serialise and write one slide's chart. Runs in the caller or a worker process."""
+    records = task_records(task['visual'], sources or _worker_sources) if task['visual'].get('source_file') else []
+    config = None
+    if records:
+        config = chart_from_records(task['chart_type'], records, task['visual'], task['colors'], task['max_points'])
+    if config is None:
+        config = sample_chart(task['chart_type'], task['colors'])
+    if config is None:
+        return {'config': None, 'shipped': None, 'datasets': {}}
+
+    if task['compact']:
+        config = compact_config(config, task['defaults'])
+    if task['precision'] is not None:
+        config = round_chart_data(config, task['precision'])
+    config['meta'] = {**config.get('meta', {}), 'fingerprint': task['fingerprint']}
+    datasets: Dict[str, List[Any]] = {}
+    shipped = dedupe_datasets(config, datasets) if task.get('dedupe') else config
+    write_text_if_changed(Path(task['output_path']), serialise_chart(shipped, task['compact']))
+    return {'config': config, 'shipped': shipped, 'datasets': datasets}
+
+
+def run_chart_tasks(
+    tasks: List[Dict[str, Any]],
+    jobs: int = 1,
+    sources: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Run chart tasks, in worker processes when `jobs` > 1, returning results in task order.
+
+    `sources` holds the caller's content index and join/facet caches.
+    Sequential runs share them; each worker process gets the content index
+    once at start-up, then extracts, builds and writes its charts in
+    parallel, so only the finished (downsampled) configs come back.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        return [build_chart_task(task, sources) for task in tasks]
+
+    workers = min(jobs, len(tasks))
+    content_index = (sources or {}).get('content_index', {})
+    print(f"Generating {len(tasks)} chart(s) with {workers} worker process(es)")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_chart_worker, initargs=(content_index,)) as pool:
+        return list(pool.map(build_chart_task, tasks))
+
+
+def write_chart_bundle(
+    out: Path,
+    charts: Dict[str, Any],
+    defaults: Optional[Dict[str, Any]],
+    precompress: bool,
+    datasets: Optional[Dict[str, List[Any]]] = None,
+) -> Path:
+    """Write every chart config into one bundle keyed by data file name.
+
+    Deduplicated configs keep their dataset refs; each referenced array is
+    shipped once under `datasets`.
+
+    With `precompress`, a gzip sibling is written for hosts that serve
+    precompressed assets (e.g. nginx `gzip_static`).
+    """
+    bundle: Dict[str, Any] = {'charts': charts}
+    if defaults:
+        bundle['defaults'] = defaults
+    if datasets:
+        bundle['datasets'] = datasets
+    bundle_path = out / CHART_BUNDLE_FILE
+    changed = write_chart_json(bundle_path, bundle, compact=True)
+    gz_path = bundle_path.with_name(bundle_path.name + '.gz')
+    if precompress and (changed or not gz_path.exists()):
+        gz_path.write_bytes(gzip.compress(bundle_path.read_bytes(), compresslevel=9, mtime=0))
+    return bundle_path
+
+
 def generate_and_save(
     analysis_path: str,
     types_path: str,
@@ -309,18 +964,61 @@ def generate_and_save(
     theme: str = 'consulting',
     colors_json: str = None,
     overrides_path: str = None,
+    max_points: int = DEFAULT_MAX_LINE_POINTS,
+    compact: bool = False,
+    precision: Optional[int] = None,
+    bundle: bool = False,
+    precompress: bool = False,
+    force: bool = False,
+    jobs: int = 1,
+    svg: bool = False,
+    dedupe: bool = False,
+    dataset_store: Optional[str] = None,
+    runtime_theme: bool = False,
 ) -> None:
-    """Generate chart configs and write files. Callable from pipeline or CLI."""
-    colors = resolve_colors(theme, colors_json)
+    """Generate chart configs and write files. Callable from pipeline or CLI.
+
+    In compact mode configs are minified and store only their option deltas
+    against a shared `chart-defaults.json`, which `DeckChart` merges back in.
+    With `bundle`, all configs are also written to `charts.bundle.json` so
+    the deck fetches chart data once instead of once per chart.
+
+    Each chart records a fingerprint of its inputs in `meta.fingerprint`;
+    charts whose fingerprint is unchanged are reused without being
+    rebuilt or rewritten unless `force` is set.
+
+    With `jobs` > 1, stale charts are extracted, built and written by that
+    many worker processes (see `run_chart_tasks`); log lines are printed in
+    slide order.
+
+    With `svg`, a static `chart_N.svg` is rendered beside each config for
+    export mode (see render_chart_svg.py).
+
+    Visuals with a `join` are hash-joined against their secondary sources
+    once per run; later slides with the same joins reuse the result.
+
+    Visuals with a `facet_key` are partitioned in a single pass and emit one
+    config per facet (`chart_N-1.json`, ...) plus a `chart_N.facets.json`
+    manifest that build_slides.py turns into a `<DeckChartGrid>`.
+
+    With `dedupe`, label and data arrays are stored content-addressed in
+    `datasets/<digest>.json` and configs reference them, so a series shared
+    by several charts is written, shipped and parsed once. `dataset_store`
+    names a directory shared by sibling decks that blobs are linked from.
+
+    With `runtime_theme`, colours are written as `var(--slide-*)`
+    references (CSS_VAR_COLORS) instead of the theme palette, and static
+    SVGs are not rendered: an `<img>` cannot see the page's variables.
+    """
+    colors = dict(CSS_VAR_COLORS) if runtime_theme else resolve_colors(theme, colors_json)
+    if runtime_theme and svg:
+        print('⚠ Static SVG charts cannot follow runtime theme colours; skipping SVG rendering')
+        svg = False
 
     with open(analysis_path, 'r', encoding='utf-8') as f:
         analysis = json.load(f)
 
-    content_index = {}
-    if content_path:
-        with open(content_path, 'r', encoding='utf-8') as f:
-            content = json.load(f)
-        content_index = build_content_index(content)
+    content_index = load_content_index(content_path)
 
     overrides = {}
     if overrides_path:
@@ -337,6 +1035,27 @@ def generate_and_save(
     out = Path(output_dir)
     out.mkdir(parents=True, exist_ok=True)
 
+    defaults = chart_defaults(colors) if compact else {}
+    defaults_payload = {'theme': theme, 'types': defaults} if compact else None
+    if defaults_payload:
+        write_chart_json(out / CHART_DEFAULTS_FILE, defaults_payload, compact=True)
+
+    bundled: Dict[str, Any] = {}
+    shipped: Dict[str, Any] = {}
+    blobs: Dict[str, List[Any]] = {}
+    settings = {
+        'theme': theme,
+        'max_points': max_points,
+        'compact': compact,
+        'precision': precision,
+    }
+    if dedupe:
+        settings['dedupe'] = True
+    source_hashes: Dict[str, Optional[str]] = {}
+    sources: Dict[str, Any] = {'content_index': content_index, 'join_cache': {}, 'facets': {}}
+    regenerated, reused = 0, 0
+
+    plans: List[Dict[str, Any]] = []
     slides = analysis.get('slides', [])
     for i, slide in enumerate(slides):
         slide_id = f"slide_{i+1}"
@@ -347,45 +1066,152 @@ def generate_and_save(
             visual.update({
                 key: value
                 for key, value in slide_override.items()
-                if key in {'source_file', 'x_key', 'y_key', 'series_key', 'data_file'}
+                if key in OVERRIDE_VISUAL_KEYS
             })
             chart_type = slide_override.get('chart_type', chart_type)
 
         if chart_type == 'none':
             continue
 
-        records = []
         source_file = visual.get('source_file')
-        if source_file:
-            records = extract_records(content_index.get(source_file, {}))
+        try:
+            joins = join_specs(visual) if source_file else []
+            validate_transforms(visual)
+            if visual.get('y_expr'):
+                compile_expression(visual['y_expr'])
+        except ValueError as exc:
+            print(f"⚠ {exc} for {slide_id}; skipping")
+            continue
+        for name in [source_file] + [spec['source_file'] for spec in joins]:
+            if name and name not in source_hashes:
+                document = content_index.get(name)
+                source_hashes[name] = canonical_digest(document) if document else None
+        source_hash = source_hashes.get(source_file) if source_file else None
+        if joins:
+            source_hash = canonical_digest([source_hash] + [source_hashes[spec['source_file']] for spec in joins])
+
+        output_name = visual.get('data_file') or slide.get('data_file') or f"chart_{i+1}.json"
+        fingerprint_override = slide_override if isinstance(slide_override, dict) else {}
 
-        config = None
-        if records:
-            config = chart_from_records(chart_type, records, visual, colors)
-
-        if config is None:
-            if chart_type == 'line':
-                config = generate_line_chart([1.8, 2.0, 2.2, 2.4], ['Q1', 'Q2', 'Q3', 'Q4'], 'Revenue (£M)', colors)
-            elif chart_type == 'bar':
-                config = generate_bar_chart([15, 23, 18, 12, 8], ['UK', 'Germany', 'France', 'Netherlands', 'Other'], 'Market Share (%)', colors)
-            elif chart_type == 'waterfall':
-                config = generate_waterfall_chart([100, 15, -5, 10, 120], ['Baseline', 'Volume', 'Price', 'Mix', 'Final'], colors)
-            elif chart_type in ['pie', 'donut']:
-                config = generate_pie_chart([35, 25, 20, 12, 8], ['Product A', 'Product B', 'Product C', 'Product D', 'Other'], colors)
-                if chart_type == 'donut':
-                    config['type'] = 'doughnut'
+        def plan_chart(name, chart_visual):
+            plan = {'slide_id': slide_id, 'chart_type': chart_type, 'output_name': name}
+            fingerprint = chart_fingerprint(
+                chart_visual,
+                fingerprint_override,
+                chart_type,
+                source_hash,
+                colors,
+                settings,
+            )
+            existing = None if force else read_fingerprinted_chart(out / name, fingerprint)
+            if existing is not None and dedupe:
+                try:
+                    existing = resolve_dataset_refs(existing, lambda digest: load_dataset_blob(out, digest))
+                except (OSError, json.JSONDecodeError):
+                    existing = None
+            if existing is not None:
+                plan['existing'] = existing
             else:
-                print(f"⚠ Unsupported chart type '{chart_type}' for {slide_id}; skipping")
-                continue
+                plan['task'] = {
+                    'chart_type': chart_type,
+                    'visual': chart_visual,
+                    'output_path': str(out / name),
+                    'colors': colors,
+                    'max_points': max_points,
+                    'compact': compact,
+                    'defaults': defaults,
+                    'precision': precision,
+                    'fingerprint': fingerprint,
+                    'dedupe': dedupe,
+                }
+            plans.append(plan)
 
-        output_name = visual.get('data_file') or slide.get('data_file') or f"chart_{i+1}.json"
-        output_file = out / output_name
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2)
+        facet_key = visual.get('facet_key')
+        partitions = {}
+        if facet_key and source_file:
+            partitions = partition_records(
+                resolve_source_records(visual, content_index, sources['join_cache']), facet_key,
+            )
+            sources['facets'][facet_cache_key(visual)] = partitions
+            if not partitions:
+                print(f"⚠ No values for facet_key '{facet_key}' on {slide_id}; generating a single chart")
+        if partitions:
+            facet_limit = visual.get('facet_limit', DEFAULT_MAX_FACETS)
+            facets = list(partitions.items())
+            if isinstance(facet_limit, int) and 0 < facet_limit < len(facets):
+                print(f"⚠ {slide_id}: keeping the first {facet_limit} of {len(facets)} facets")
+                facets = facets[:facet_limit]
+            manifest = {'facet_key': facet_key, 'chart_type': chart_type, 'facets': []}
+            for index, (value, _) in enumerate(facets, start=1):
+                name = facet_file_name(output_name, index)
+                plan_chart(name, {**visual, 'facet_value': value})
+                manifest['facets'].append({'title': value, 'data_file': name})
+            write_text_if_changed(out / facet_manifest_name(output_name), serialise_chart(manifest, compact))
+            continue
+
+        # build_slides.py renders a grid whenever a manifest exists.
+        stale_manifest = out / facet_manifest_name(output_name)
+        if stale_manifest.exists():
+            stale_manifest.unlink()
+        plan_chart(output_name, visual)
+
+    results = iter(run_chart_tasks([plan['task'] for plan in plans if 'task' in plan], jobs, sources))
+    for plan in plans:
+        output_file = out / plan['output_name']
+        if 'existing' in plan:
+            bundled[plan['output_name']] = plan['existing']
+            shipped[plan['output_name']] = dedupe_datasets(plan['existing'], blobs) if dedupe else plan['existing']
+            reused += 1
+            print(f"✓ Reused: {output_file}")
+            continue
+
+        result = next(results)
+        if result['config'] is None:
+            print(f"⚠ Unsupported chart type '{plan['chart_type']}' for {plan['slide_id']}; skipping")
+            continue
+
+        bundled[plan['output_name']] = result['config']
+        shipped[plan['output_name']] = result['shipped']
+        blobs.update(result['datasets'])
+        regenerated += 1
 
         print(f"✓ Generated: {output_file}")
 
-    print(f"\n✓ All charts saved to: {output_dir}")
+    if svg:
+        from render_chart_svg import render_svg, svg_path_for
+
+        for output_name, config in bundled.items():
+            base = defaults.get(config.get('type'), {}) if config.get('extends') else None
+            resolved = {**config, 'options': merge_options(base, config.get('options'))} if base is not None else config
+            write_text_if_changed(svg_path_for(out / output_name), render_svg(resolved))
+        print(f"✓ Rendered {len(bundled)} static SVG chart(s)")
+    else:
+        for output_name in bundled:
+            stale = (out / output_name).with_suffix('.svg')
+            if stale.exists():
+                stale.unlink()
+
+    if dedupe:
+        refs = sum(
+            1 for config in shipped.values() for container, key in _dataset_arrays(config)
+            if isinstance(container[key], dict)
+        )
+        added = publish_datasets(out, blobs, dataset_store)
+        print(f"✓ Deduplicated {refs} data array(s) into {len(blobs)} dataset blob(s) ({added} new)")
+    elif (out / DATASET_DIR).is_dir():
+        publish_datasets(out, {})
+
+    bundle_path = out / CHART_BUNDLE_FILE
+    if bundle:
+        write_chart_bundle(out, shipped, defaults_payload, precompress, blobs if dedupe else None)
+        print(f"✓ Bundled {len(bundled)} chart(s): {bundle_path}")
+    else:
+        for stale in [bundle_path, bundle_path.with_name(bundle_path.name + '.gz')]:
+            if stale.exists():
+                stale.unlink()
+
+    print(f"\n✓ Charts: {regenerated} regenerated, {reused} reused")
+    print(f"✓ All charts saved to: {output_dir}")
 
 
 def main():
@@ -397,8 +1223,27 @@ def main():
     parser.add_argument('--colors', help='Optional JSON colour overrides')
     parser.add_argument('--content', help='Optional path to ingested content.json')
     parser.add_argument('--overrides', help='Optional path to chart-overrides.json')
+    parser.add_argument('--max-points', type=int, default=DEFAULT_MAX_LINE_POINTS,
+                        help='Target points per line chart before LTTB downsampling (0 disables)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write minified configs that extend a shared chart-defaults.json')
+    parser.add_argument('--precision', type=int, help='Optional decimal places to round chart numbers to')
+    parser.add_argument('--bundle', action='store_true', help='Also write all configs to charts.bundle.json')
+    parser.add_argument('--precompress', action='store_true', help='Write charts.bundle.json.gz alongside the bundle')
+    parser.add_argument('--force', action='store_true', help='Regenerate every chart even when its inputs are unchanged')
+    parser.add_argument('--jobs', type=int, default=1, help='Number of worker processes to generate charts with')
+    parser.add_argument('--svg', action='store_true', help='Also render static chart_N.svg files for export mode')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='Store label/data arrays once in content-addressed datasets/ blobs')
+    parser.add_argument('--dataset-store', help='Shared blob directory for --dedupe across sibling decks')
+    parser.add_argument('--runtime-theme', action='store_true',
+                        help='Write colours as var(--slide-*) references resolved in the browser')
     args = parser.parse_args()
-    generate_and_save(args.analysis, args.types, args.content, args.output, args.theme, args.colors, args.overrides)
+    generate_and_save(
+        args.analysis, args.types, args.content, args.output, args.theme, args.colors, args.overrides,
+        args.max_points, args.compact, args.precision, args.bundle, args.precompress, args.force,
+        args.jobs, args.svg, args.dedupe, args.dataset_store, args.runtime_theme,
+    )
 
 
 if __name__ == '__main__':
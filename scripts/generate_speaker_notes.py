@@ -13,12 +13,39 @@ def sentence(text: str) -> str:
     return text if text.endswith('.') else f'{text}.'
 
 
+def load_chart_meta(chart_dir: Path, slide: dict) -> dict:
+    """Load the `meta` block of a slide's generated chart config, if any."""
+    visual = slide.get('visual') or {}
+    data_file = visual.get('data_file') or slide.get('data_file')
+    if visual.get('type') != 'chart' or not data_file:
+        return {}
+    chart_path = chart_dir / data_file
+    if not chart_path.exists():
+        return {}
+    with open(chart_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f).get('meta')
+    return meta if isinstance(meta, dict) else {}
+
+
+def chart_notes(meta: dict) -> list:
+    """Describe data reductions applied to a chart so the presenter can explain them."""
+    notes = []
+    top_n = meta.get('top_n')
+    if isinstance(top_n, dict) and top_n.get('folded'):
+        notes.append(
+            f"- Chart cue: {top_n['folded']} smaller categories of {top_n.get('categories')} "
+            f"are grouped under '{top_n.get('other_label', 'Other')}'."
+        )
+    return notes
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate speaker notes markdown from analysis.json')
     parser.add_argument('--analysis', required=True, help='Path to analysis.json')
     parser.add_argument('--output', required=True, help='Output path for speaker-notes.md')
     parser.add_argument('--style', choices=['concise', 'detailed'], default='concise', help='Note verbosity')
     parser.add_argument('--max-points', type=int, default=3, help='Max bullet points per slide in concise mode')
+    parser.add_argument('--chart-dir', help='Optional public/data directory to read chart metadata from')
     args = parser.parse_args()
 
     with open(args.analysis, 'r', encoding='utf-8') as f:
@@ -67,6 +94,9 @@ def main():
         if slide.get('source'):
             lines.append(f'- Source cue: Reference {slide["source"]} when challenged on evidence.')
 
+        if args.chart_dir:
+            lines.extend(chart_notes(load_chart_meta(Path(args.chart_dir), slide)))
+
         lines.append('')
 
     output_path = Path(args.output)
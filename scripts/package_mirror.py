@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Offline installs from a pinned lockfile and a local tarball mirror.
+
+The skill ships `assets/packages/package.json`, which pins the exact
+version of each deck dependency, and the `package-lock.json` (npm lockfile
+v3) resolved from it, which pins every package in the deck toolchain with
+its `resolved` URL and `integrity` hash. The mirror is a flat directory of
+the corresponding tarballs. Installing means checking each tarball's
+integrity and extracting it to its lockfile path under `node_modules`, so
+no registry is contacted and every install is identical.
+
+Lifecycle scripts are not run. Playwright's Chromium comes from the
+shared `ms-playwright` browser cache, which must be populated separately
+on offline build nodes.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import urllib.request
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional
+
+
+LOCK_DIR = Path(__file__).parent.parent / 'assets' / 'packages'
+LOCKFILE = 'package-lock.json'
+PACKAGE_JSON = 'package.json'
+# Node's names for the current platform, as used by the lockfile's os/cpu fields.
+NODE_PLATFORMS = {'linux': 'linux', 'darwin': 'darwin', 'win32': 'win32', 'cygwin': 'win32'}
+NODE_ARCHES = {'x86_64': 'x64', 'amd64': 'x64', 'aarch64': 'arm64', 'arm64': 'arm64', 'i386': 'ia32', 'i686': 'ia32'}
+
+
+def read_lockfile(lock_dir: Path = LOCK_DIR) -> Optional[Dict[str, Any]]:
+    """The shipped lockfile, or None when there is none."""
+    try:
+        with open(lock_dir / LOCKFILE, 'r', encoding='utf-8') as f:
+            lock = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return lock if isinstance(lock.get('packages'), dict) else None
+
+
+def read_pins(lock_dir: Path = LOCK_DIR) -> Optional[Dict[str, Any]]:
+    """The shipped package.json with the pinned dependency versions, or None when there is none."""
+    try:
+        with open(lock_dir / PACKAGE_JSON, 'r', encoding='utf-8') as f:
+            pins = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return pins if isinstance(pins, dict) else None
+
+
+def lockfile_digest(lock_dir: Path = LOCK_DIR) -> Optional[str]:
+    """Digest of the shipped package.json and lockfile, or None when neither exists."""
+    digest = hashlib.sha256()
+    found = False
+    for name in (PACKAGE_JSON, LOCKFILE):
+        path = lock_dir / name
+        if path.exists():
+            digest.update(name.encode('utf-8') + b'\0' + path.read_bytes())
+            found = True
+    return digest.hexdigest()[:12] if found else None
+
+
+def package_name(key: str, entry: Dict[str, Any]) -> str:
+    """Package name for a lockfile key such as `node_modules/a/node_modules/@scope/b`."""
+    return entry.get('name') or key.rsplit('node_modules/', 1)[-1]
+
+
+def tarball_name(name: str, version: str) -> str:
+    """Mirror file name; `/` in scoped names becomes `+`, so `@slidev/cli` and `cli` never collide."""
+    return f"{name.replace('/', '+')}-{version}.tgz"
+
+
+def locked_packages(lock: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Installable lockfile entries: registry tarballs, excluding the root, links and bundled packages."""
+    packages = []
+    for key, entry in lock['packages'].items():
+        if not key or entry.get('link') or entry.get('inBundle') or not entry.get('resolved'):
+            continue
+        name = package_name(key, entry)
+        packages.append({**entry, 'path': key, 'name': name, 'file': tarball_name(name, entry['version'])})
+    return packages
+
+
+def current_libc() -> Optional[str]:
+    if sys.platform != 'linux':
+        return None
+    return 'glibc' if platform.libc_ver()[0] == 'glibc' else 'musl'
+
+
+def matches_platform(entry: Dict[str, Any]) -> bool:
+    """Whether an entry's os/cpu/libc constraints (`["linux"]`, `["!win32"]`) allow this machine."""
+    current = {
+        'os': NODE_PLATFORMS.get(sys.platform, sys.platform),
+        'cpu': NODE_ARCHES.get(platform.machine().lower(), platform.machine().lower()),
+        'libc': current_libc(),
+    }
+    for field, value in current.items():
+        allowed = entry.get(field)
+        if not allowed or value is None:
+            continue
+        if f'!{value}' in allowed:
+            return False
+        if any(not item.startswith('!') for item in allowed) and value not in allowed:
+            return False
+    return True
+
+
+def verify_integrity(path: Path, integrity: str) -> bool:
+    """Check `path` against an SRI string (`sha512-<base64>`, possibly several, space separated)."""
+    for token in integrity.split():
+        algorithm, _, expected = token.partition('-')
+        if algorithm not in ('sha512', 'sha384', 'sha256', 'sha1'):
+            continue
+        digest = hashlib.new(algorithm, path.read_bytes()).digest()
+        if base64.b64encode(digest).decode('ascii') == expected:
+            return True
+    return False
+
+
+def extract_tarball(tarball: Path, dest: Path):
+    """Extract an npm tarball into `dest`, dropping its top-level folder (usually `package/`)."""
+    with tarfile.open(tarball, 'r:gz') as tar:
+        members = []
+        for member in tar.getmembers():
+            parts = PurePosixPath(member.name).parts[1:]
+            if not parts or '..' in parts or not (member.isfile() or member.isdir()):
+                continue
+            member.name = str(PurePosixPath(*parts))
+            members.append(member)
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(dest, members=members, filter='data')
+        else:
+            tar.extractall(dest, members=members)
+
+
+def link_bins(project_dir: Path, package: Dict[str, Any]):
+    """Create `node_modules/.bin` entries beside the package, as npm does."""
+    bins = package.get('bin') or {}
+    if isinstance(bins, str):
+        bins = {package['name'].split('/')[-1]: bins}
+    package_dir = project_dir / package['path']
+    bin_dir = package_dir.parent.parent / '.bin' if package['name'].startswith('@') else package_dir.parent / '.bin'
+    for command, target in bins.items():
+        script = package_dir / target
+        if not script.exists():
+            continue
+        script.chmod(script.stat().st_mode | 0o111)
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        link = bin_dir / command
+        if link.is_symlink() or link.exists():
+            link.unlink()
+        os.symlink(os.path.relpath(script, bin_dir), link)
+
+
+def offline_install(project_dir: Path, mirror_dir: Path, lock_dir: Path = LOCK_DIR) -> int:
+    """Install the locked packages into `project_dir` from `mirror_dir`; returns the package count.
+
+    Every tarball is integrity-checked before anything is extracted. Raises
+    RuntimeError when the lockfile is missing, a tarball is absent from the
+    mirror or its hash does not match.
+    """
+    lock = read_lockfile(lock_dir)
+    if lock is None:
+        raise RuntimeError(f"No lockfile at {lock_dir / LOCKFILE}; run scaffold_cache.py --update-lock")
+    packages = [package for package in locked_packages(lock) if matches_platform(package)]
+    for package in packages:
+        tarball = mirror_dir / package['file']
+        if not tarball.exists():
+            raise RuntimeError(f"{package['file']} is missing from {mirror_dir}; run scaffold_cache.py --refresh-mirror")
+        if package.get('integrity') and not verify_integrity(tarball, package['integrity']):
+            raise RuntimeError(f"Integrity check failed for {tarball}")
+
+    modules = project_dir / 'node_modules'
+    if modules.exists():
+        shutil.rmtree(modules)
+    # Parents before children, so nested node_modules land inside their package.
+    for package in sorted(packages, key=lambda p: p['path'].count('node_modules/')):
+        extract_tarball(mirror_dir / package['file'], project_dir / package['path'])
+    for package in packages:
+        link_bins(project_dir, package)
+    shutil.copy2(lock_dir / PACKAGE_JSON, project_dir / PACKAGE_JSON)
+    shutil.copy2(lock_dir / LOCKFILE, project_dir / LOCKFILE)
+    return len(packages)
+
+
+def update_lockfile(lock_dir: Path, dependencies: List[str], dev_dependencies: List[str]):
+    """Resolve the lockfile with npm (needs the registry) and write it to `lock_dir`.
+
+    With a package.json already in `lock_dir`, its pinned versions are
+    locked as they are; edit the pins to upgrade. Otherwise the latest
+    versions of `dependencies` are resolved and pinned into a new one.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            if (lock_dir / PACKAGE_JSON).exists():
+                shutil.copy2(lock_dir / PACKAGE_JSON, Path(tmp) / PACKAGE_JSON)
+                subprocess.run(['npm', 'install', '--package-lock-only'], cwd=tmp, check=True, capture_output=True, text=True)
+            else:
+                subprocess.run(['npm', 'init', '-y'], cwd=tmp, check=True, capture_output=True, text=True)
+                subprocess.run(['npm', 'install', '--package-lock-only', '--save-exact'] + dependencies,
+                               cwd=tmp, check=True, capture_output=True, text=True)
+                subprocess.run(['npm', 'install', '--package-lock-only', '--save-exact', '-D'] + dev_dependencies,
+                               cwd=tmp, check=True, capture_output=True, text=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            detail = getattr(e, 'stderr', None) or str(e)
+            raise RuntimeError(f"Failed to resolve the lockfile with npm: {detail}") from e
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        for name in (PACKAGE_JSON, LOCKFILE):
+            shutil.copy2(Path(tmp) / name, lock_dir / name)
+
+
+def refresh_mirror(mirror_dir: Path, lock_dir: Path = LOCK_DIR) -> Dict[str, int]:
+    """Download every locked tarball, for all platforms, that the mirror lacks or holds corrupted.
+
+    Returns counts of `downloaded` and `cached` tarballs; tarballs no
+    longer in the lockfile are removed.
+    """
+    lock = read_lockfile(lock_dir)
+    if lock is None:
+        raise RuntimeError(f"No lockfile at {lock_dir / LOCKFILE}")
+    mirror_dir.mkdir(parents=True, exist_ok=True)
+    counts = {'downloaded': 0, 'cached': 0, 'removed': 0}
+    wanted = set()
+    for package in locked_packages(lock):
+        wanted.add(package['file'])
+        tarball = mirror_dir / package['file']
+        integrity = package.get('integrity')
+        if tarball.exists() and (not integrity or verify_integrity(tarball, integrity)):
+            counts['cached'] += 1
+            continue
+        partial = tarball.with_suffix('.part')
+        try:
+            with urllib.request.urlopen(package['resolved']) as response, open(partial, 'wb') as f:
+                shutil.copyfileobj(response, f)
+        except OSError as e:
+            if partial.exists():
+                partial.unlink()
+            raise RuntimeError(f"Failed to download {package['resolved']}: {e}") from e
+        if integrity and not verify_integrity(partial, integrity):
+            partial.unlink()
+            raise RuntimeError(f"Integrity check failed for {package['resolved']}")
+        partial.replace(tarball)
+        counts['downloaded'] += 1
+    for path in mirror_dir.glob('*.tgz'):
+        if path.name not in wanted:
+            path.unlink()
+            counts['removed'] += 1
+    return counts
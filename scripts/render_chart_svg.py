@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Render Chart.js configurations from generate_charts.py as static SVG.
+
+Export mode references these files instead of drawing on a canvas, so PDF
+and PPTX screenshots do not wait on Chart.js rendering or animation.
+"""
+
+import argparse
+import json
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from generate_charts import (
+    CHART_BUNDLE_FILE,
+    CHART_DEFAULTS_FILE,
+    load_dataset_blob,
+    merge_options,
+    resolve_dataset_refs,
+    write_text_if_changed,
+)
+
+
+WIDTH = 800
+HEIGHT = 400
+FONT = "Inter, 'Source Sans 3', Helvetica, Arial, sans-serif"
+TEXT_COLOR = '#333333'
+AXIS_COLOR = '#999999'
+MAX_CATEGORY_LABELS = 12
+FALLBACK_PALETTE = ['#003366', '#6699CC', '#FF6B35', '#666666', '#999999', '#CCCCCC']
+
+
+def format_number(value: float) -> str:
+    """Short tick label: 1.2k / 3.4M for large values, up to two decimals otherwise."""
+    magnitude = abs(value)
+    for threshold, suffix in [(1e9, 'B'), (1e6, 'M'), (1e3, 'k')]:
+        if magnitude >= threshold:
+            return f"{value / threshold:.1f}".rstrip('0').rstrip('.') + suffix
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.2f}".rstrip('0').rstrip('.')
+
+
+def nice_ticks(low: float, high: float, count: int = 6) -> List[float]:
+    """Evenly spaced, human-friendly axis ticks covering [low, high]."""
+    if low == high:
+        low, high = (low - 1, high + 1) if low else (0.0, 1.0)
+    raw_step = (high - low) / max(1, count - 1)
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(m for m in (1, 2, 2.5, 5, 10) if raw_step / magnitude <= m) * magnitude
+    start = math.floor(low / step) * step
+    end = math.ceil(high / step) * step
+    ticks = []
+    value = start
+    while value <= end + step * 1e-9:
+        ticks.append(round(value, 10))
+        value += step
+    return ticks
+
+
+def color_at(color: Any, index: int, fallback: str) -> str:
+    """Resolve a Chart.js colour option that may be a single value or per-point list."""
+    if isinstance(color, list):
+        return color[index % len(color)] if color else fallback
+    return color if isinstance(color, str) else fallback
+
+
+def numeric_points(data: List[Any]) -> List[Optional[float]]:
+    """Extract y values from a dataset, accepting plain numbers or {x, y} points."""
+    values = []
+    for point in data:
+        if isinstance(point, dict):
+            point = point.get('y')
+        values.append(float(point) if isinstance(point, (int, float)) and not isinstance(point, bool) else None)
+    return values
+
+
+def time_ticks(start: float, end: float, count: int = 6) -> List[Tuple[float, str]]:
+    """Evenly spaced epoch-millisecond ticks with a label format suited to the span."""
+    span_days = (end - start) / 86_400_000
+    fmt = '%b %Y' if span_days > 180 else '%d %b' if span_days > 2 else '%H:%M'
+    steps = max(1, count - 1) if end > start else 0
+    stamps = [start + (end - start) * idx / steps for idx in range(steps)] + [end] if steps else [start]
+    return [(stamp, datetime.fromtimestamp(stamp / 1000, tz=timezone.utc).strftime(fmt)) for stamp in stamps]
+
+
+def text(x: float, y: float, label: str, anchor: str = 'middle', size: int = 12, color: str = TEXT_COLOR) -> str:
+    return (
+        f'<text x="{x:.1f}" y="{y:.1f}" text-anchor="{anchor}" font-size="{size}" '
+        f'fill="{color}">{escape(str(label))}</text>'
+    )
+
+
+def sampled_labels(labels: List[Any]) -> List[Tuple[int, str]]:
+    """Thin category labels so at most MAX_CATEGORY_LABELS are drawn."""
+    step = max(1, math.ceil(len(labels) / MAX_CATEGORY_LABELS))
+    return [(idx, str(label)) for idx, label in enumerate(labels) if idx % step == 0]
+
+
+def render_legend(datasets: List[Dict[str, Any]], x: float, y: float) -> List[str]:
+    parts = []
+    for idx, ds in enumerate(datasets):
+        tone = color_at(ds.get('borderColor') or ds.get('backgroundColor'), 0, FALLBACK_PALETTE[idx % len(FALLBACK_PALETTE)])
+        parts.append(f'<rect x="{x:.1f}" y="{y - 9:.1f}" width="10" height="10" fill="{tone}"/>')
+        label = str(ds.get('label', f'Series {idx + 1}'))
+        parts.append(text(x + 14, y, label, anchor='start'))
+        x += 28 + 7 * len(label)
+    return parts
+
+
+def render_cartesian(config: Dict[str, Any], options: Dict[str, Any], width: int, height: int) -> List[str]:
+    """Render bar, horizontal bar (incl. waterfall) and line charts."""
+    data = config.get('data', {})
+    labels = data.get('labels') or []
+    datasets = data.get('datasets') or []
+    chart_type = config.get('type')
+    horizontal = options.get('indexAxis') == 'y'
+    scales = options.get('scales', {})
+    value_axis = scales.get('x' if horizontal else 'y', {})
+    show_legend = options.get('plugins', {}).get('legend', {}).get('display', len(datasets) > 1)
+    time_axis = chart_type == 'line' and scales.get('x', {}).get('type') == 'time'
+
+    series = [numeric_points(ds.get('data', [])) for ds in datasets]
+    if not labels:
+        labels = list(range(1, max((len(s) for s in series), default=0) + 1))
+    values = [v for s in series for v in s if v is not None]
+    if not values or not labels:
+        return [text(width / 2, height / 2, 'No chart data')]
+
+    low, high = min(values), max(values)
+    if chart_type == 'bar' or value_axis.get('beginAtZero'):
+        low, high = min(low, 0.0), max(high, 0.0)
+    ticks = nice_ticks(low, high)
+    low, high = ticks[0], ticks[-1]
+
+    top = 36 if show_legend else 16
+    left = 140 if horizontal else 56
+    plot = (left, top, width - 16, height - 40)
+    x0, y0, x1, y1 = plot
+    grid_color = value_axis.get('grid', {}).get('color', '#E5E5E5')
+
+    def value_pos(value: float) -> float:
+        ratio = (value - low) / (high - low)
+        return x0 + ratio * (x1 - x0) if horizontal else y1 - ratio * (y1 - y0)
+
+    parts: List[str] = []
+    if show_legend:
+        parts.extend(render_legend(datasets, x0, 18))
+
+    for tick in ticks:
+        pos = value_pos(tick)
+        if horizontal:
+            parts.append(f'<line x1="{pos:.1f}" y1="{y0}" x2="{pos:.1f}" y2="{y1}" stroke="{grid_color}"/>')
+            parts.append(text(pos, y1 + 18, format_number(tick)))
+        else:
+            parts.append(f'<line x1="{x0}" y1="{pos:.1f}" x2="{x1}" y2="{pos:.1f}" stroke="{grid_color}"/>')
+            parts.append(text(x0 - 8, pos + 4, format_number(tick), anchor='end'))
+
+    count = len(labels)
+    span = (y1 - y0) if horizontal else (x1 - x0)
+    band = span / count
+    baseline = value_pos(min(max(0.0, low), high))
+
+    if chart_type == 'line':
+        def category_pos(idx: int) -> float:
+            return x0 + (span * idx / (count - 1) if count > 1 else span / 2)
+
+        if time_axis:
+            stamps = [p['x'] for ds in datasets for p in ds.get('data', []) if isinstance(p, dict) and 'x' in p]
+            t0, t1 = (min(stamps), max(stamps)) if stamps else (0, 0)
+
+            def time_pos(stamp: float) -> float:
+                return x0 + (span * (stamp - t0) / (t1 - t0) if t1 > t0 else span / 2)
+
+        for ds_idx, (ds, points) in enumerate(zip(datasets, series)):
+            tone = color_at(ds.get('borderColor'), 0, FALLBACK_PALETTE[ds_idx % len(FALLBACK_PALETTE)])
+            if time_axis:
+                coords = [(time_pos(p['x']), value_pos(v)) for p, v in zip(ds.get('data', []), points) if v is not None]
+            else:
+                coords = [(category_pos(idx), value_pos(v)) for idx, v in enumerate(points) if v is not None]
+            if not coords:
+                continue
+            path = ' '.join(f'{x:.1f},{y:.1f}' for x, y in coords)
+            if ds.get('fill'):
+                fill = color_at(ds.get('backgroundColor'), 0, tone + '20')
+                area = f'{coords[0][0]:.1f},{baseline:.1f} {path} {coords[-1][0]:.1f},{baseline:.1f}'
+                parts.append(f'<polygon points="{area}" fill="{fill}" stroke="none"/>')
+            stroke_width = ds.get('borderWidth', 2)
+            parts.append(f'<polyline points="{path}" fill="none" stroke="{tone}" stroke-width="{stroke_width}" stroke-linejoin="round"/>')
+        if time_axis:
+            for stamp, label in time_ticks(t0, t1):
+                parts.append(text(time_pos(stamp), y1 + 18, label))
+        else:
+            for idx, label in sampled_labels(labels):
+                parts.append(text(category_pos(idx), y1 + 18, label))
+    else:
+        group = band * 0.8
+        bar = group / max(1, len(datasets))
+        for ds_idx, (ds, points) in enumerate(zip(datasets, series)):
+            fallback = FALLBACK_PALETTE[ds_idx % len(FALLBACK_PALETTE)]
+            for idx, value in enumerate(points):
+                if value is None:
+                    continue
+                tone = color_at(ds.get('backgroundColor'), idx, fallback)
+                offset = (y0 if horizontal else x0) + band * idx + (band - group) / 2 + bar * ds_idx
+                start, end = sorted([baseline, value_pos(value)])
+                if horizontal:
+                    parts.append(f'<rect x="{start:.1f}" y="{offset:.1f}" width="{end - start:.1f}" height="{bar:.1f}" fill="{tone}"/>')
+                else:
+                    parts.append(f'<rect x="{offset:.1f}" y="{start:.1f}" width="{bar:.1f}" height="{end - start:.1f}" fill="{tone}"/>')
+        for idx, label in sampled_labels(labels):
+            centre = (y0 if horizontal else x0) + band * (idx + 0.5)
+            if horizontal:
+                parts.append(text(x0 - 8, centre + 4, label, anchor='end'))
+            else:
+                parts.append(text(centre, y1 + 18, label))
+
+    axis = f'<line x1="{x0}" y1="{y0}" x2="{x0}" y2="{y1}" stroke="{AXIS_COLOR}"/>' if horizontal \
+        else f'<line x1="{x0}" y1="{y1}" x2="{x1}" y2="{y1}" stroke="{AXIS_COLOR}"/>'
+    parts.append(axis)
+    return parts
+
+
+def arc_point(cx: float, cy: float, radius: float, angle: float) -> Tuple[float, float]:
+    return cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+
+
+def render_pie(config: Dict[str, Any], options: Dict[str, Any], width: int, height: int) -> List[str]:
+    """Render pie and doughnut charts with a legend on the right."""
+    data = config.get('data', {})
+    labels = data.get('labels') or []
+    dataset = (data.get('datasets') or [{}])[0]
+    values = [max(0.0, v or 0.0) for v in numeric_points(dataset.get('data', []))]
+    total = math.fsum(values)
+    if total <= 0:
+        return [text(width / 2, height / 2, 'No chart data')]
+
+    cx, cy = height / 2 + 24, height / 2
+    outer = height / 2 - 24
+    inner = outer * 0.5 if config.get('type') == 'doughnut' else 0.0
+    border = dataset.get('borderColor', '#FFFFFF')
+    border_width = dataset.get('borderWidth', 2)
+
+    parts: List[str] = []
+    angle = -math.pi / 2
+    for idx, value in enumerate(values):
+        if value <= 0:
+            continue
+        tone = color_at(dataset.get('backgroundColor'), idx, FALLBACK_PALETTE[idx % len(FALLBACK_PALETTE)])
+        sweep = 2 * math.pi * value / total
+        if sweep >= 2 * math.pi - 1e-9:
+            parts.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{outer:.1f}" fill="{tone}"/>')
+            if inner:
+                parts.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{inner:.1f}" fill="#FFFFFF"/>')
+            break
+        end = angle + sweep
+        large = 1 if sweep > math.pi else 0
+        ox1, oy1 = arc_point(cx, cy, outer, angle)
+        ox2, oy2 = arc_point(cx, cy, outer, end)
+        if inner:
+            ix1, iy1 = arc_point(cx, cy, inner, end)
+            ix2, iy2 = arc_point(cx, cy, inner, angle)
+            path = (
+                f'M{ox1:.2f},{oy1:.2f} A{outer:.2f},{outer:.2f} 0 {large} 1 {ox2:.2f},{oy2:.2f} '
+                f'L{ix1:.2f},{iy1:.2f} A{inner:.2f},{inner:.2f} 0 {large} 0 {ix2:.2f},{iy2:.2f} Z'
+            )
+        else:
+            path = f'M{cx:.2f},{cy:.2f} L{ox1:.2f},{oy1:.2f} A{outer:.2f},{outer:.2f} 0 {large} 1 {ox2:.2f},{oy2:.2f} Z'
+        parts.append(f'<path d="{path}" fill="{tone}" stroke="{border}" stroke-width="{border_width}"/>')
+        angle = end
+
+    legend_x = cx + outer + 40
+    legend_y = cy - 10 * len(labels) + 10
+    for idx, label in enumerate(labels):
+        tone = color_at(dataset.get('backgroundColor'), idx, FALLBACK_PALETTE[idx % len(FALLBACK_PALETTE)])
+        y = legend_y + idx * 20
+        parts.append(f'<rect x="{legend_x:.1f}" y="{y - 9:.1f}" width="10" height="10" fill="{tone}"/>')
+        parts.append(text(legend_x + 16, y, label, anchor='start'))
+    return parts
+
+
+def render_svg(config: Dict[str, Any], width: int = WIDTH, height: int = HEIGHT) -> str:
+    """Render a resolved Chart.js config (options already merged) as an SVG document."""
+    options = config.get('options') or {}
+    if config.get('type') in ('pie', 'doughnut'):
+        parts = render_pie(config, options, width, height)
+    else:
+        parts = render_cartesian(config, options, width, height)
+    body = '\n  '.join(parts)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="{width}" height="{height}" font-family="{escape(FONT)}">\n  {body}\n</svg>\n'
+    )
+
+
+def resolve_config(config: Dict[str, Any], data_dir: Path, defaults_cache: Dict[str, Any]) -> Dict[str, Any]:
+    """Resolve dataset refs and merge a compact config's option delta with its shared defaults file."""
+    config = resolve_dataset_refs(config, lambda digest: load_dataset_blob(data_dir, digest))
+    extends = config.get('extends')
+    if not extends:
+        return config
+    if extends not in defaults_cache:
+        with open(data_dir / extends, 'r', encoding='utf-8') as f:
+            defaults_cache[extends] = json.load(f)
+    base = defaults_cache[extends].get('types', {}).get(config.get('type'), {})
+    return {**config, 'options': merge_options(base, config.get('options'))}
+
+
+def svg_path_for(chart_path: Path) -> Path:
+    return chart_path.with_suffix('.svg')
+
+
+def render_directory(data_dir: Path) -> int:
+    """Render an SVG beside every chart config in `data_dir`. Returns the count written."""
+    skip = {CHART_DEFAULTS_FILE, CHART_BUNDLE_FILE}
+    defaults_cache: Dict[str, Any] = {}
+    written = 0
+    for chart_path in sorted(data_dir.glob('*.json')):
+        if chart_path.name in skip:
+            continue
+        with open(chart_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        if not isinstance(config, dict) or 'data' not in config:
+            continue
+        svg = render_svg(resolve_config(config, data_dir, defaults_cache))
+        if write_text_if_changed(svg_path_for(chart_path), svg):
+            written += 1
+            print(f"✓ Rendered: {svg_path_for(chart_path)}")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render chart configs as static SVG')
+    parser.add_argument('--data-dir', required=True, help='Directory containing chart_N.json configs (public/data)')
+    args = parser.parse_args()
+    count = render_directory(Path(args.data_dir))
+    print(f"\n✓ {count} SVG chart(s) updated in: {args.data_dir}")
+
+
+if __name__ == '__main__':
+    main()
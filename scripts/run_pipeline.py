@@ -21,8 +21,10 @@ from analyze_content import prepare_analysis_request
 from detect_chart_type import detect_and_save
 from generate_charts import generate_and_save
 from create_slidev_project import create_project, normalise_colors
+from chart_registry import generate_registry
 from build_slides import build
 from export_deck import export_all
+from vendor_fonts import vendor_fonts
 
 
 STEP_ORDER = [
@@ -66,6 +68,29 @@ def defaulted_config(config: Dict) -> Dict:
     }
     execution.update(config.get("execution", {}))
 
+    charts = {
+        "max_line_points": 1000,
+        "compact": False,
+        "precision": None,
+        "bundle": False,
+        "precompress": False,
+        "inline": False,
+        "force": False,
+        "jobs": 1,
+        "svg": False,
+        "dedupe": False,
+        "dataset_store": None,
+        "renderer": "main",
+    }
+    charts.update(config.get("charts", {}))
+
+    fonts = {
+        "dir": None,
+        "display": "swap",
+        "subset": True,
+    }
+    fonts.update(config.get("fonts", {}))
+
     merged = {
         "theme": "consulting",
         "audience": "mixed",
@@ -73,10 +98,18 @@ def defaulted_config(config: Dict) -> Dict:
         "author": "",
         "export_formats": ["spa"],
         "export_base": "/",
+        "export_profile": "standard",
+        "scaffold_cache": None,
+        "workspace": False,
+        "package_mirror": None,
+        "theme_cache": None,
+        "runtime_theme": False,
         "colors": {},
         **config,
     }
     merged["execution"] = execution
+    merged["charts"] = charts
+    merged["fonts"] = fonts
     return merged
 
 
@@ -256,6 +289,20 @@ def main() -> int:
                     theme=config["theme"],
                     colors_json=json.dumps(config["colors"]) if config.get("colors") else None,
                     overrides_path=overrides_path,
+                    max_points=config["charts"]["max_line_points"],
+                    compact=bool(config["charts"]["compact"]),
+                    precision=config["charts"]["precision"],
+                    bundle=bool(config["charts"]["bundle"]),
+                    precompress=bool(config["charts"]["precompress"]),
+                    force=bool(config["charts"]["force"]),
+                    jobs=int(config["charts"]["jobs"]),
+                    svg=bool(config["charts"]["svg"]),
+                    dedupe=bool(config["charts"]["dedupe"]),
+                    dataset_store=(
+                        str(resolve_path(config["charts"]["dataset_store"], config_dir))
+                        if config["charts"]["dataset_store"] else None
+                    ),
+                    runtime_theme=bool(config["runtime_theme"]),
                 )
 
         # -- project scaffolding (still uses subprocess for npm/bun/git) --
@@ -265,7 +312,20 @@ def main() -> int:
             else:
                 colors = normalise_colors(config.get("colors", {}))
                 logo = str(resolve_path(config["logo_path"], config_dir)) if config.get("logo_path") else None
-                create_project(deck_dir, config["theme"], colors, logo)
+                scaffold_cache = config["scaffold_cache"]
+                if isinstance(scaffold_cache, str):
+                    scaffold_cache = str(resolve_path(scaffold_cache, config_dir))
+                package_mirror = (
+                    str(resolve_path(config["package_mirror"], config_dir)) if config["package_mirror"] else None
+                )
+                theme_cache = config["theme_cache"]
+                if isinstance(theme_cache, str):
+                    theme_cache = str(resolve_path(theme_cache, config_dir))
+                create_project(
+                    deck_dir, config["theme"], colors, logo, str(chart_types_json), config["export_profile"],
+                    scaffold_cache, output_root if config["workspace"] else None, package_mirror=package_mirror,
+                    theme_cache=theme_cache, runtime_theme=bool(config["runtime_theme"]),
+                )
 
         # -- build --
         if should_run("build", from_step, to_step):
@@ -273,6 +333,8 @@ def main() -> int:
             if dry_run:
                 print_dry("build", f"{analysis_path} -> {deck_dir / 'slides.md'}")
             else:
+                # Chart types can change without re-running the project step.
+                generate_registry(deck_dir, str(chart_types_json))
                 build(
                     analysis_path=str(analysis_path),
                     template_path=str(templates_dir / "slides.md.jinja2"),
@@ -284,7 +346,17 @@ def main() -> int:
                     consulting_lint_strict=execution.get("consulting_lint_strict", False),
                     consulting_lint_threshold=execution.get("consulting_lint_threshold", 70),
                     content_path=str(content_json) if execution.get("consulting_lint") else None,
+                    inline_charts=bool(config["charts"]["inline"]),
+                    chart_renderer=config["charts"]["renderer"],
                 )
+                # Subsetting needs the built slides.md, so fonts follow the build.
+                if config["fonts"]["dir"]:
+                    vendor_fonts(
+                        deck_dir,
+                        resolve_path(config["fonts"]["dir"], config_dir),
+                        display=config["fonts"]["display"],
+                        subset=bool(config["fonts"]["subset"]),
+                    )
 
         # -- export (still uses subprocess for slidev CLI) --
         if should_run("export", from_step, to_step):
@@ -297,6 +369,7 @@ def main() -> int:
                     formats=formats,
                     analysis_path=str(analysis_path),
                     base=config.get("export_base", "/"),
+                    profile=config["export_profile"],
                 )
 
         # -- commit --
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Prebuilt Slidev scaffold shared by every deck.
+
+A scaffold is an initialised project (`package.json`, lockfile and
+`node_modules`) with the deck dependencies installed. It is built once
+per dependency set into `<cache>/scaffold-<key>` and materialised into
+each new deck. Files are reflinked where the filesystem supports it, and
+hard-linked or copied otherwise, so deck creation needs neither a package
+registry nor a fresh install.
+
+When the skill ships a lockfile and the package mirror exists, the
+scaffold itself is built offline from the mirror (see package_mirror.py).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from package_mirror import (
+    LOCK_DIR,
+    LOCKFILE,
+    PACKAGE_JSON,
+    lockfile_digest,
+    offline_install,
+    read_lockfile,
+    read_pins,
+    refresh_mirror,
+    update_lockfile,
+)
+
+
+# Bump when the scaffold layout changes to force a rebuild.
+SCAFFOLD_VERSION = 1
+DEPENDENCIES = ['@slidev/cli', 'vue-chartjs', 'chart.js', 'chartjs-adapter-date-fns']
+DEV_DEPENDENCIES = ['playwright-chromium']
+MANIFEST_FILE = 'scaffold.json'
+LOCKFILES = ('bun.lock', 'bun.lockb', 'package-lock.json')
+LINK_MODES = ('reflink', 'hardlink', 'copy')
+# Linux FICLONE ioctl: copy-on-write clone on btrfs, XFS and similar filesystems.
+FICLONE = 0x40049409
+
+
+def default_cache_dir() -> Path:
+    """`$DECK_GENERATOR_CACHE`, else `$XDG_CACHE_HOME/deck-generator`, under which scaffolds live."""
+    if os.environ.get('DECK_GENERATOR_CACHE'):
+        return Path(os.environ['DECK_GENERATOR_CACHE']) / 'scaffold'
+    base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base / 'deck-generator' / 'scaffold'
+
+
+def default_mirror_dir() -> Path:
+    """Tarball mirror beside the scaffold cache: `<cache>/mirror`."""
+    return default_cache_dir().parent / 'mirror'
+
+
+def scaffold_key(dependencies: List[str] = DEPENDENCIES, dev_dependencies: List[str] = DEV_DEPENDENCIES) -> str:
+    """Version key for a scaffold: changes with the dependency set, the shipped pins and lockfile or SCAFFOLD_VERSION."""
+    payload = json.dumps({
+        'version': SCAFFOLD_VERSION,
+        'lockfile': lockfile_digest(),
+        'dependencies': sorted(dependencies),
+        'dev_dependencies': sorted(dev_dependencies),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def install_dependencies(project_dir: Path, mirror_dir: Optional[Path] = None, lock_dir: Path = LOCK_DIR) -> str:
+    """Install the deck dependencies into `project_dir`; returns how ('mirror', 'bun' or 'npm').
+
+    With the shipped lockfile and a mirror directory (`mirror_dir`, else
+    the default), this is an offline extract. With the lockfile alone,
+    bun or npm installs exactly the locked versions; with only the shipped
+    package.json, they install its pinned versions. Without either, they
+    resolve the latest versions. Raises RuntimeError on failure.
+    """
+    mirror_dir = mirror_dir or default_mirror_dir()
+    locked = read_lockfile(lock_dir) is not None
+    if locked and mirror_dir.is_dir():
+        count = offline_install(project_dir, mirror_dir, lock_dir)
+        print(f"✓ Extracted {count} locked package(s) from {mirror_dir}")
+        return 'mirror'
+    if read_pins(lock_dir) is not None:
+        shutil.copy2(lock_dir / PACKAGE_JSON, project_dir / PACKAGE_JSON)
+        if locked:
+            shutil.copy2(lock_dir / LOCKFILE, project_dir / LOCKFILE)
+        npm_command = ['npm', 'ci'] if locked else ['npm', 'install']
+        for manager, command in (('bun', ['bun', 'install']), ('npm', npm_command)):
+            try:
+                subprocess.run(command, cwd=project_dir, check=True, capture_output=True, text=True)
+                return manager
+            except (subprocess.CalledProcessError, FileNotFoundError) as e:
+                error = e
+        detail = getattr(error, 'stderr', None) or str(error)
+        raise RuntimeError(f"Failed to install the pinned dependencies with bun and npm: {detail}") from error
+
+    try:
+        subprocess.run(['bun', 'init', '-y'], cwd=project_dir, check=True, capture_output=True)
+        subprocess.run(['bun', 'add'] + DEPENDENCIES, cwd=project_dir, check=True, capture_output=True)
+        subprocess.run(['bun', 'add', '-d'] + DEV_DEPENDENCIES, cwd=project_dir, check=True, capture_output=True)
+        return 'bun'
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        pass
+    try:
+        subprocess.run(['npm', 'init', '-y'], cwd=project_dir, check=True, capture_output=True)
+        subprocess.run(['npm', 'install'] + DEPENDENCIES, cwd=project_dir, check=True, capture_output=True)
+        subprocess.run(['npm', 'install', '-D'] + DEV_DEPENDENCIES, cwd=project_dir, check=True, capture_output=True)
+        return 'npm'
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        detail = getattr(e, 'stderr', None) or str(e)
+        raise RuntimeError(f"Failed to install dependencies with bun and npm: {detail}") from e
+
+
+def read_manifest(scaffold_dir: Path) -> Optional[Dict[str, Any]]:
+    """The scaffold's manifest, or None when the scaffold is missing or incomplete."""
+    try:
+        with open(scaffold_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not (scaffold_dir / 'node_modules').is_dir():
+        return None
+    return manifest
+
+
+def ensure_scaffold(cache_dir: Optional[Path] = None, rebuild: bool = False, mirror_dir: Optional[Path] = None) -> Path:
+    """Return the cached scaffold for the current dependency set, building it if needed.
+
+    Builds happen in a temporary sibling directory that is renamed into place
+    only once installation succeeds, so an interrupted build is never reused.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    key = scaffold_key()
+    scaffold_dir = cache_dir / f'scaffold-{key}'
+    if not rebuild and read_manifest(scaffold_dir):
+        return scaffold_dir
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    staging = cache_dir / f'.scaffold-{key}.tmp-{os.getpid()}'
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir()
+    started = time.perf_counter()
+    try:
+        manager = install_dependencies(staging, mirror_dir)
+        with open(staging / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'key': key,
+                'version': SCAFFOLD_VERSION,
+                'manager': manager,
+                'dependencies': DEPENDENCIES,
+                'dev_dependencies': DEV_DEPENDENCIES,
+                'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            }, f, indent=2)
+        if scaffold_dir.exists():
+            shutil.rmtree(scaffold_dir)
+        staging.rename(scaffold_dir)
+    finally:
+        if staging.exists():
+            shutil.rmtree(staging, ignore_errors=True)
+    print(f"✓ Built scaffold {key} with {manager} in {time.perf_counter() - started:.1f}s: {scaffold_dir}")
+    return scaffold_dir
+
+
+def reflink_file(src: Path, dst: Path) -> None:
+    import fcntl
+
+    with open(src, 'rb') as source, open(dst, 'wb') as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    shutil.copymode(src, dst)
+
+
+def link_file(src: Path, dst: Path, mode: str) -> None:
+    if mode == 'reflink':
+        reflink_file(src, dst)
+    elif mode == 'hardlink':
+        os.link(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def probe_link_mode(src: Path, dst_dir: Path) -> str:
+    """Cheapest mode that works between the scaffold and the deck: reflink, hardlink, then copy."""
+    probe = dst_dir / '.scaffold-link-probe'
+    for mode in LINK_MODES:
+        try:
+            link_file(src, probe, mode)
+            return mode
+        except (OSError, ImportError):
+            continue
+        finally:
+            if probe.exists():
+                probe.unlink()
+    return 'copy'
+
+
+def link_tree(src: Path, dst: Path, mode: str) -> int:
+    """Recreate `src` under `dst` with `mode` links; symlinks (e.g. node_modules/.bin) are kept as symlinks."""
+    count = 0
+    for root, dirs, files in os.walk(src):
+        root_path = Path(root)
+        target_root = dst / root_path.relative_to(src)
+        target_root.mkdir(parents=True, exist_ok=True)
+        for name in list(dirs):
+            if (root_path / name).is_symlink():
+                dirs.remove(name)
+                files.append(name)
+        for name in files:
+            source, target = root_path / name, target_root / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+            else:
+                link_file(source, target, mode)
+            count += 1
+    return count
+
+
+def materialise_scaffold(scaffold_dir: Path, output_dir: Path) -> str:
+    """Populate `output_dir` from the scaffold; returns the link mode used.
+
+    Top-level files (package.json, lockfile, init output) are copied so the
+    deck can edit them, and package.json is renamed after the deck.
+    `node_modules` is linked, so decks share the scaffold's file contents.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for path in scaffold_dir.iterdir():
+        if path.is_file() and path.name != MANIFEST_FILE:
+            shutil.copy2(path, output_dir / path.name)
+
+    package_json = output_dir / 'package.json'
+    if package_json.exists():
+        with open(package_json, 'r', encoding='utf-8') as f:
+            package = json.load(f)
+        package['name'] = output_dir.resolve().name.lower().replace(' ', '-')
+        with open(package_json, 'w', encoding='utf-8') as f:
+            json.dump(package, f, indent=2)
+            f.write('\n')
+
+    modules = scaffold_dir / 'node_modules'
+    sample = next((path for path in modules.rglob('*') if path.is_file() and not path.is_symlink()), None)
+    mode = probe_link_mode(sample, output_dir) if sample else 'copy'
+    target = output_dir / 'node_modules'
+    if target.exists():
+        shutil.rmtree(target)
+    link_tree(modules, target, mode)
+    return mode
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or inspect the cached Slidev scaffold')
+    parser.add_argument('--cache-dir', help='Scaffold cache directory (default: ~/.cache/deck-generator/scaffold)')
+    parser.add_argument('--rebuild', action='store_true', help='Reinstall the scaffold even if it is cached')
+    parser.add_argument('--mirror-dir', help='Package tarball mirror (default: ~/.cache/deck-generator/mirror)')
+    parser.add_argument('--refresh-mirror', action='store_true', help='Download locked tarballs missing from the mirror')
+    parser.add_argument('--update-lock', action='store_true',
+                        help='Resolve assets/packages/package-lock.json from the pinned package.json with npm, '
+                             'then refresh the mirror')
+    args = parser.parse_args()
+
+    cache_dir = Path(args.cache_dir) if args.cache_dir else None
+    mirror_dir = Path(args.mirror_dir) if args.mirror_dir else default_mirror_dir()
+    try:
+        if args.update_lock:
+            update_lockfile(LOCK_DIR, DEPENDENCIES, DEV_DEPENDENCIES)
+            print(f"✓ Updated {LOCK_DIR / LOCKFILE}")
+        if args.refresh_mirror or args.update_lock:
+            counts = refresh_mirror(mirror_dir)
+            print(f"✓ Mirror {mirror_dir}: {counts['downloaded']} downloaded, "
+                  f"{counts['cached']} already present, {counts['removed']} removed")
+            return
+        scaffold_dir = ensure_scaffold(cache_dir, rebuild=args.rebuild, mirror_dir=mirror_dir)
+    except RuntimeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    manifest = read_manifest(scaffold_dir)
+    print(f"✓ Scaffold {manifest['key']} ({manifest['manager']}, built {manifest['created']}): {scaffold_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,9 @@ import json
 import sys
 from typing import List
 
+from chart_expressions import compile_expression
+from chart_transforms import AGGREGATIONS, join_specs
+
 
 VALID_LAYOUTS = {'title', 'section', 'content', 'two-col', 'chart-full', 'end'}
 VALID_VISUAL_TYPES = {'chart', 'image', 'none'}
@@ -57,6 +60,28 @@ def validate_analysis_payload(payload: dict) -> List[str]:
             chart_type = visual.get('chart_type')
             if not isinstance(chart_type, str) or not chart_type.strip():
                 errors.append(f'{path} chart visual requires visual.chart_type.')
+            agg = visual.get('agg')
+            if agg is not None and agg not in AGGREGATIONS:
+                errors.append(f'{path}.visual.agg must be one of: {", ".join(AGGREGATIONS)}.')
+            limit = visual.get('limit')
+            if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+                errors.append(f'{path}.visual.limit must be a positive integer.')
+            facet_limit = visual.get('facet_limit')
+            if facet_limit is not None and (not isinstance(facet_limit, int) or isinstance(facet_limit, bool) or facet_limit < 1):
+                errors.append(f'{path}.visual.facet_limit must be a positive integer.')
+            x_type = visual.get('x_type')
+            if x_type is not None and x_type not in ('time', 'category'):
+                errors.append(f'{path}.visual.x_type must be one of: time, category.')
+            try:
+                join_specs(visual)
+            except ValueError as exc:
+                errors.append(f'{path}.visual.join: {exc}.')
+            y_expr = visual.get('y_expr')
+            if y_expr is not None:
+                try:
+                    compile_expression(y_expr)
+                except ValueError as exc:
+                    errors.append(f'{path}.visual.y_expr: {exc}.')
 
         if vtype == 'image':
             filename = visual.get('filename')
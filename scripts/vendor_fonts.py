@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Vendor the deck's fonts from a local font directory.
+
+Finds files for every family the deck names (theme CSS, slidev.config.ts,
+slides.md headmatter), subsets them to the glyphs the deck uses and writes
+them to `public/fonts/`. `styles/fonts.css` declares them with
+`@font-face` and `font-display`, `index.html` preloads them, and Slidev's
+web font provider is switched off, so export never fetches fonts.
+
+Files are matched by name: `<Family>-<Weight>[Italic].<ext>`, with the
+family's spaces optional (`SourceSans3-SemiBold.woff2`,
+`Inter-Italic.ttf`). Variable fonts (`Inter[wght].ttf`,
+`Inter-VariableFont_wght.ttf`) cover weights 100-900. Subsetting needs
+fontTools (plus brotli for WOFF2); without it the files are copied whole.
+"""
+
+import argparse
+import importlib.util
+import json
+import re
+import shutil
+import string
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from create_slidev_project import INDEX_HTML, slidev_config, write_index_html
+
+
+FONTS_DIR = Path('public') / 'fonts'
+FONTS_CSS = Path('styles') / 'fonts.css'
+FONT_DISPLAYS = ('swap', 'block', 'fallback', 'optional', 'auto')
+
+# Extension -> CSS format(), in order of preference when a face has several files.
+FONT_FORMATS = {'.woff2': 'woff2', '.woff': 'woff', '.ttf': 'truetype', '.otf': 'opentype'}
+WEIGHTS = {
+    'thin': 100, 'hairline': 100, 'extralight': 200, 'ultralight': 200, 'light': 300,
+    'regular': 400, 'normal': 400, 'book': 400, 'medium': 500, 'semibold': 600,
+    'demibold': 600, 'bold': 700, 'extrabold': 800, 'ultrabold': 800, 'black': 900, 'heavy': 900,
+}
+GENERIC_FAMILIES = {
+    'serif', 'sans-serif', 'monospace', 'cursive', 'fantasy', 'system-ui', 'ui-serif',
+    'ui-sans-serif', 'ui-monospace', 'ui-rounded', 'emoji', 'math', 'inherit', 'initial',
+}
+# Always kept so edits after vendoring rarely need a re-run.
+BASE_GLYPHS = set(string.ascii_letters + string.digits + string.punctuation + ' ') | set('–—‘’“”…•·×€£%°±')
+
+
+def family_slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def split_families(value: str) -> List[str]:
+    """Named families from a CSS font-family list, without generics."""
+    families = []
+    for part in value.split(','):
+        name = part.strip().strip('\'"').strip()
+        if name and name.lower() not in GENERIC_FAMILIES and not name.startswith('var('):
+            families.append(name)
+    return families
+
+
+def deck_font_families(deck_dir: Path) -> List[str]:
+    """Families named by the deck's theme CSS, slidev.config.ts and slides.md, in first-seen order."""
+    found: List[str] = []
+    css = deck_dir / 'styles' / 'theme.css'
+    if css.exists():
+        for value in re.findall(r'font-family\s*:\s*([^;}]+)', css.read_text(encoding='utf-8')):
+            found.extend(split_families(value))
+    config = deck_dir / 'slidev.config.ts'
+    if config.exists():
+        found.extend(re.findall(r"\b(?:sans|serif|mono)\s*:\s*'([^']+)'", config.read_text(encoding='utf-8')))
+    slides = deck_dir / 'slides.md'
+    if slides.exists():
+        found.extend(re.findall(r'^\s+(?:sans|serif|mono):\s*(.+?)\s*$', slides.read_text(encoding='utf-8'), re.M))
+    return list(dict.fromkeys(name.strip('\'"') for name in found))
+
+
+def parse_font_file(path: Path, families: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Match a font file name to one of `families`; returns its face description."""
+    if path.suffix.lower() not in FONT_FORMATS:
+        return None
+    stem = family_slug(path.stem)
+    # Longest family first so 'Source Sans 3' wins over a hypothetical 'Source Sans'.
+    for family in sorted(families, key=lambda name: -len(family_slug(name))):
+        slug = family_slug(family)
+        if not slug or not stem.startswith(slug):
+            continue
+        rest = stem[len(slug):]
+        style = 'italic' if 'italic' in rest or 'oblique' in rest else 'normal'
+        rest = re.sub(r'italic|oblique', '', rest)
+        if 'variable' in rest or 'wght' in rest:
+            weight = '100 900'
+        elif rest in WEIGHTS or not rest:
+            weight = str(WEIGHTS.get(rest, 400))
+        elif rest.isdigit() and len(rest) == 3:
+            weight = rest
+        else:
+            continue
+        return {'family': family, 'weight': weight, 'style': style, 'source': path}
+    return None
+
+
+def discover_faces(font_dir: Path, families: Iterable[str]) -> List[Dict[str, Any]]:
+    """One face per (family, weight, style), preferring WOFF2 > WOFF > TTF > OTF sources."""
+    rank = {ext: idx for idx, ext in enumerate(FONT_FORMATS)}
+    faces: Dict[tuple, Dict[str, Any]] = {}
+    for path in sorted(font_dir.rglob('*')):
+        face = parse_font_file(path, families)
+        if not face:
+            continue
+        key = (face['family'], face['weight'], face['style'])
+        current = faces.get(key)
+        if current is None or rank[path.suffix.lower()] < rank[current['source'].suffix.lower()]:
+            faces[key] = face
+    return list(faces.values())
+
+
+def used_glyphs(deck_dir: Path) -> Set[str]:
+    """Characters in slides.md and chart configs, plus BASE_GLYPHS."""
+    glyphs = set(BASE_GLYPHS)
+    slides = deck_dir / 'slides.md'
+    if slides.exists():
+        glyphs.update(slides.read_text(encoding='utf-8'))
+    data_dir = deck_dir / 'public' / 'data'
+    if data_dir.is_dir():
+        for path in data_dir.rglob('*.json'):
+            # Chart labels and titles; escapes are decoded by json.loads.
+            try:
+                glyphs.update(json.dumps(json.loads(path.read_text(encoding='utf-8')), ensure_ascii=False))
+            except (OSError, json.JSONDecodeError):
+                continue
+    return {char for char in glyphs if char.isprintable()}
+
+
+def face_file_stem(face: Dict[str, Any]) -> str:
+    weight = face['weight'].replace(' ', '-')
+    italic = '-italic' if face['style'] == 'italic' else ''
+    return f"{family_slug(face['family'])}-{weight}{italic}"
+
+
+def subset_font(source: Path, dest_stem: Path, text: str) -> Optional[Path]:
+    """Subset `source` to `text` as WOFF2 (WOFF without brotli); None when fontTools is unavailable."""
+    try:
+        from fontTools import subset
+    except ImportError:
+        return None
+    options = subset.Options()
+    options.flavor = 'woff2' if importlib.util.find_spec('brotli') else 'woff'
+    options.layout_features = ['*']
+    font = subset.load_font(str(source), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    dest = dest_stem.with_suffix(f'.{options.flavor}')
+    subset.save_font(font, str(dest), options)
+    return dest
+
+
+def font_face_css(faces: List[Dict[str, Any]], display: str = 'swap') -> str:
+    """`@font-face` rules for styles/fonts.css.
+
+    URLs are relative to the stylesheet: the built CSS lands in `assets/`,
+    beside the copied `fonts/`, so they resolve under any base path.
+    """
+    rules = ['/* Generated by scripts/vendor_fonts.py; do not edit. */\n']
+    for face in faces:
+        rules.append(
+            "@font-face {\n"
+            f"  font-family: '{face['family']}';\n"
+            f"  src: url('../fonts/{face['file']}') format('{FONT_FORMATS[Path(face['file']).suffix]}');\n"
+            f"  font-weight: {face['weight']};\n"
+            f"  font-style: {face['style']};\n"
+            f"  font-display: {display};\n"
+            "}\n"
+        )
+    return '\n'.join(rules)
+
+
+def disable_font_provider(slides_md: Path) -> bool:
+    """Add `provider: none` to the slides.md `fonts:` headmatter; returns whether it changed."""
+    if not slides_md.exists():
+        return False
+    text = slides_md.read_text(encoding='utf-8')
+    if re.search(r'^fonts:\n(?:  .*\n)*?  provider:', text, re.M):
+        return False
+    patched, count = re.subn(r'^fonts:\n', 'fonts:\n  provider: none\n', text, count=1, flags=re.M)
+    if count:
+        slides_md.write_text(patched, encoding='utf-8')
+    return bool(count)
+
+
+def vendor_fonts(deck_dir: Path, font_dir: Path, display: str = 'swap', subset: bool = True) -> List[Dict[str, Any]]:
+    """Vendor, subset and declare the deck's fonts; returns the written faces."""
+    if display not in FONT_DISPLAYS:
+        raise ValueError(f"Unknown font-display: {display}. Use one of: {', '.join(FONT_DISPLAYS)}")
+    if not font_dir.is_dir():
+        raise FileNotFoundError(f"Font directory not found: {font_dir}")
+
+    families = deck_font_families(deck_dir)
+    faces = discover_faces(font_dir, families)
+    for family in families:
+        if not any(face['family'] == family for face in faces):
+            print(f"⚠ No files for font '{family}' in {font_dir}; it will use the next fallback")
+
+    out = deck_dir / FONTS_DIR
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    text = ''.join(sorted(used_glyphs(deck_dir))) if subset else ''
+    subset_count = 0
+    for face in faces:
+        stem = out / face_file_stem(face)
+        written = subset_font(face['source'], stem, text) if subset else None
+        if written:
+            subset_count += 1
+        else:
+            written = stem.with_suffix(face['source'].suffix.lower())
+            shutil.copyfile(face['source'], written)
+        face['file'] = written.name
+
+    css_path = deck_dir / FONTS_CSS
+    css_path.parent.mkdir(parents=True, exist_ok=True)
+    css_path.write_text(font_face_css(faces, display), encoding='utf-8')
+    # index.html preloads are derived from fonts.css, alongside any brand.css link.
+    if not write_index_html(deck_dir):
+        print(f"⚠ {deck_dir / INDEX_HTML} is not generated; add font preloads to it manually")
+    (deck_dir / 'slidev.config.ts').write_text(slidev_config(local_fonts=True), encoding='utf-8')
+    disable_font_provider(deck_dir / 'slides.md')
+
+    print(f"✓ Vendored {len(faces)} font face(s) into {out}")
+    if subset and faces and subset_count < len(faces):
+        print('⚠ fontTools not installed; fonts were copied without subsetting (pip install fonttools brotli)')
+    elif subset_count:
+        print(f"✓ Subset to {len(text)} glyph(s)")
+    return faces
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vendor and subset deck fonts from a local directory')
+    parser.add_argument('--deck-dir', required=True, help='Slidev project directory (after build)')
+    parser.add_argument('--font-dir', required=True, help='Directory of .woff2/.woff/.ttf/.otf files')
+    parser.add_argument('--display', choices=FONT_DISPLAYS, default='swap', help='@font-face font-display value')
+    parser.add_argument('--no-subset', action='store_true', help='Copy font files whole')
+    args = parser.parse_args()
+
+    try:
+        vendor_fonts(Path(args.deck_dir), Path(args.font_dir), args.display, not args.no_subset)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Tests for the Python side of the deck benchmark."""
+
+import functools
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from benchmark_deck import (
+    SYNTHETIC_DATA,
+    SpaHandler,
+    count_slides,
+    print_report,
+    remove_synthetic_deck,
+    run_benchmark,
+    write_synthetic_deck,
+)
+
+
+def test_count_slides_counts_layouts(tmp_path):
+    (tmp_path / 'slides.md').write_text(
+        '---\ntheme: ./theme\nlayout: cover\n---\n# Title\n\n---\nlayout: default\n---\n# Body\n',
+        encoding='utf-8',
+    )
+    assert count_slides(tmp_path / 'slides.md') == 2
+    assert count_slides(tmp_path / 'missing.md') == 1
+
+
+def test_synthetic_deck_writes_grid_slides(tmp_path):
+    entry = write_synthetic_deck(tmp_path, charts=10, per_slide=4, points=20)
+    text = entry.read_text(encoding='utf-8')
+    assert count_slides(entry) == 4
+    assert text.count('<DeckChartGrid type="line"') == 3
+    assert len(list((tmp_path / SYNTHETIC_DATA).glob('chart_*.json'))) == 10
+    assert not (tmp_path / 'slides.md').exists()
+    remove_synthetic_deck(tmp_path)
+    assert not entry.exists() and not (tmp_path / SYNTHETIC_DATA).exists()
+
+
+def test_spa_handler_falls_back_to_index(tmp_path):
+    (tmp_path / 'index.html').write_text('<html>deck</html>', encoding='utf-8')
+    (tmp_path / 'app.js').write_text('console.log(1)', encoding='utf-8')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(SpaHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        assert urllib.request.urlopen(f'{base}/12').read() == b'<html>deck</html>'
+        assert urllib.request.urlopen(f'{base}/app.js').read() == b'console.log(1)'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_run_benchmark_requires_built_spa(tmp_path):
+    with pytest.raises(RuntimeError, match='No built SPA'):
+        run_benchmark(tmp_path)
+
+
+def test_print_report(capsys):
+    variant = {
+        'load_ms': 800, 'load_bytes': 2048, 'total_bytes': 4096,
+        'load_chart_requests': 3, 'heap_after_walk': 10485760,
+        'frame_p95_ms': 16.7, 'long_frames': 2,
+    }
+    print_report({'slides': 5, 'variants': {'eager': variant, 'lazy': dict(variant, load_chart_requests=1)}})
+    out = capsys.readouterr().out
+    assert 'Benchmark: 5 slide(s)' in out
+    assert 'eager' in out and 'lazy' in out and '10.0' in out
+
+
+def test_print_report_shows_renderer_that_ran(capsys):
+    variant = {
+        'load_ms': 800, 'load_bytes': 2048, 'total_bytes': 4096,
+        'load_chart_requests': 3, 'heap_after_walk': 10485760,
+        'frame_p95_ms': 16.7, 'long_frames': 2,
+    }
+    print_report({'slides': 5, 'variants': {'worker': dict(variant, renderers={'main': 2, 'worker': 10})}})
+    assert 'main 2, worker 10' in capsys.readouterr().out
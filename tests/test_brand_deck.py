@@ -0,0 +1,47 @@
+"""Tests for branding a runtime-themed SPA build."""
+
+from pathlib import Path
+
+import pytest
+
+from brand_deck import brand_dist
+
+
+def test_brand_copy_leaves_build_untouched(tmp_path):
+    dist = tmp_path / 'dist'
+    dist.mkdir()
+    (dist / 'index.html').write_text('<link rel="stylesheet" href="/deck/brand.css">', encoding='utf-8')
+    (dist / 'brand.css').write_text('html:root {\n}\n', encoding='utf-8')
+
+    target = brand_dist(dist, {'primary': '#0b2a4a', 'unknown': '#FFFFFF'}, tmp_path / 'acme')
+    css = (target / 'brand.css').read_text(encoding='utf-8')
+    assert '--slide-primary: #0B2A4A;' in css and 'unknown' not in css
+    assert (target / 'index.html').exists()
+    assert (dist / 'brand.css').read_text(encoding='utf-8') == 'html:root {\n}\n'
+
+
+@pytest.mark.parametrize('out', ['dist', '.', 'dist/branded', 'dist/../dist'])
+def test_brand_copy_overlapping_build_rejected(tmp_path, monkeypatch, out):
+    dist = tmp_path / 'dist'
+    dist.mkdir()
+    (dist / 'brand.css').write_text('html:root {\n}\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError, match='overlaps the build'):
+        brand_dist(dist, {'primary': '#0B2A4A'}, Path(out))
+    assert (dist / 'brand.css').read_text(encoding='utf-8') == 'html:root {\n}\n'
+    assert not (dist / 'branded').exists()
+
+
+def test_grid_and_border_reach_brand_css(tmp_path):
+    (tmp_path / 'brand.css').write_text('html:root {\n}\n', encoding='utf-8')
+    css = (brand_dist(tmp_path, {'grid': '#DDDDDD', 'border': '#CCCCCC'}) / 'brand.css').read_text(encoding='utf-8')
+    assert '--slide-border: #CCCCCC;' in css and '--slide-chart-grid: #DDDDDD;' in css
+
+    css = (brand_dist(tmp_path, {'border': '#CCCCCC'}) / 'brand.css').read_text(encoding='utf-8')
+    assert '--slide-chart-grid: var(--slide-border);' in css
+
+
+def test_build_without_runtime_theme_rejected(tmp_path):
+    with pytest.raises(ValueError, match='runtime_theme'):
+        brand_dist(tmp_path, {'primary': '#0B2A4A'})
@@ -0,0 +1,108 @@
+"""Tests for slides.md rendering."""
+
+import json
+from pathlib import Path
+
+from build_slides import build, inline_chart_configs, inline_prop_json
+from utils import save_json
+
+TEMPLATE = Path(__file__).resolve().parent.parent / 'templates' / 'slides.md.jinja2'
+
+
+class TestInlinePropJson:
+    def test_escapes_attribute_breakers(self):
+        encoded = inline_prop_json({'label': "Q4's <b>&"})
+        assert "'" not in encoded
+        assert '<' not in encoded and '>' not in encoded and '&' not in encoded
+        assert json.loads(encoded) == {'label': "Q4's <b>&"}
+
+
+class TestInlineChartConfigs:
+    def test_compact_config_merged_with_defaults(self, tmp_path, sample_analysis):
+        data_dir = tmp_path / 'public' / 'data'
+        save_json(data_dir / 'chart-defaults.json', {'types': {'line': {'responsive': True, 'indexAxis': 'x'}}})
+        save_json(data_dir / 'chart_1.json', {
+            'type': 'line',
+            'data': {'labels': ['Q1'], 'datasets': [{'data': [1]}]},
+            'options': {'indexAxis': None},
+            'extends': 'chart-defaults.json',
+            'meta': {'source_rows': 4},
+        })
+        slides = inline_chart_configs(sample_analysis['slides'], tmp_path)
+        inlined = json.loads(slides[2]['visual']['inline_config'])
+        assert inlined['options'] == {'responsive': True}
+        assert 'extends' not in inlined and 'meta' not in inlined
+        assert 'inline_config' not in sample_analysis['slides'][2]['visual']
+
+    def test_dataset_refs_resolved(self, tmp_path, sample_analysis):
+        data_dir = tmp_path / 'public' / 'data'
+        save_json(data_dir / 'datasets' / 'abc123.json', ['Q1', 'Q2'])
+        save_json(data_dir / 'chart_1.json', {
+            'type': 'bar',
+            'data': {'labels': {'$dataset': 'abc123'}, 'datasets': [{'data': [1, 2]}]},
+            'options': {},
+        })
+        slides = inline_chart_configs(sample_analysis['slides'], tmp_path)
+        assert json.loads(slides[2]['visual']['inline_config'])['data']['labels'] == ['Q1', 'Q2']
+
+    def test_build_renders_config_prop(self, tmp_path, sample_analysis):
+        save_json(tmp_path / 'public' / 'data' / 'chart_1.json', {'type': 'line', 'data': {}, 'options': {}})
+        analysis_path = tmp_path / 'analysis.json'
+        # The template closes with its own DeckEnd slide.
+        save_json(analysis_path, {**sample_analysis, 'slides': sample_analysis['slides'][:-1]})
+        output = tmp_path / 'slides.md'
+        build(str(analysis_path), str(TEMPLATE), str(output), deck_dir=str(tmp_path), inline_charts=True)
+        rendered = output.read_text(encoding='utf-8')
+        assert """:config='{"type":"line","data":{},"options":{}}'""" in rendered
+
+    def test_build_without_deck_dir(self, tmp_path, sample_analysis):
+        analysis_path = tmp_path / 'analysis.json'
+        save_json(analysis_path, {**sample_analysis, 'slides': sample_analysis['slides'][:-1]})
+        output = tmp_path / 'slides.md'
+        build(str(analysis_path), str(TEMPLATE), str(output))
+        assert 'data="/data/chart_1.json" />' in output.read_text(encoding='utf-8')
+
+    def test_build_worker_renderer(self, tmp_path, sample_analysis):
+        analysis_path = tmp_path / 'analysis.json'
+        save_json(analysis_path, {**sample_analysis, 'slides': sample_analysis['slides'][:-1]})
+        output = tmp_path / 'slides.md'
+        build(str(analysis_path), str(TEMPLATE), str(output), chart_renderer='worker')
+        assert 'data="/data/chart_1.json" renderer="worker" />' in output.read_text(encoding='utf-8')
+
+
+class TestFacetGrid:
+    def test_build_renders_grid_from_manifest(self, tmp_path, sample_analysis):
+        data_dir = tmp_path / 'public' / 'data'
+        save_json(data_dir / 'chart_1.facets.json', {
+            'facet_key': 'unit',
+            'facets': [{'title': "R&D's", 'data_file': 'chart_1-1.json'}, {'title': 'Ops', 'data_file': 'chart_1-2.json'}],
+        })
+        save_json(data_dir / 'chart_1-1.json', {'type': 'line', 'data': {}, 'options': {}})
+        (data_dir / 'chart_1-2.svg').write_text('<svg/>', encoding='utf-8')
+        sample_analysis['slides'][2]['visual']['facet_key'] = 'unit'
+        analysis_path = tmp_path / 'analysis.json'
+        save_json(analysis_path, {**sample_analysis, 'slides': sample_analysis['slides'][:-1]})
+        output = tmp_path / 'slides.md'
+        build(str(analysis_path), str(TEMPLATE), str(output), deck_dir=str(tmp_path), inline_charts=True)
+        rendered = output.read_text(encoding='utf-8')
+        prop = rendered.split(":charts='", 1)[1].split("'", 1)[0]
+        assert '<DeckChartGrid type="line"' in rendered
+        assert json.loads(prop) == [
+            {'title': "R&D's", 'data': '/data/chart_1-1.json', 'config': {'type': 'line', 'data': {}, 'options': {}}},
+            {'title': 'Ops', 'data': '/data/chart_1-2.json', 'static': '/data/chart_1-2.svg'},
+        ]
+
+    def test_manifest_from_override_facet_key_is_used(self, tmp_path, sample_analysis):
+        # facet_key came from chart-overrides.json, so the analysis visual lacks it.
+        data_dir = tmp_path / 'public' / 'data'
+        save_json(data_dir / 'chart_1.facets.json', {
+            'facet_key': 'unit',
+            'facets': [{'title': 'Ops', 'data_file': 'chart_1-1.json'}],
+        })
+        analysis_path = tmp_path / 'analysis.json'
+        save_json(analysis_path, {**sample_analysis, 'slides': sample_analysis['slides'][:-1]})
+        output = tmp_path / 'slides.md'
+        build(str(analysis_path), str(TEMPLATE), str(output), deck_dir=str(tmp_path))
+        rendered = output.read_text(encoding='utf-8')
+        assert '<DeckChartGrid type="line"' in rendered
+        assert '/data/chart_1-1.json' in rendered and '/data/chart_1.json' not in rendered
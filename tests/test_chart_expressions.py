@@ -0,0 +1,65 @@
+"""Tests for derived-metric chart expressions."""
+
+import pytest
+
+from chart_expressions import compile_expression, expression_column
+
+
+def evaluate(text, records):
+    return compile_expression(text)[0](records)
+
+
+@pytest.fixture
+def monthly():
+    return [{'month': f'M{i}', 'revenue': value, 'cost': 50} for i, value in enumerate([100, 110, 121, None, 150])]
+
+
+class TestFunctions:
+    def test_pct_change(self, monthly):
+        assert evaluate('pct_change(revenue)', monthly)[:3] == [None, 10.0, 10.0]
+
+    def test_missing_values_propagate(self, monthly):
+        assert evaluate('diff(revenue)', monthly)[3:] == [None, None]
+
+    def test_share_and_rolling(self, monthly):
+        assert evaluate('share(cost)', monthly) == [20.0] * 5
+        assert evaluate('rolling(revenue, 2)', monthly) == [None, 105.0, 115.5, None, None]
+
+    def test_yoy_uses_periods(self, monthly):
+        assert evaluate('yoy(revenue, 2)', monthly)[2] == pytest.approx(21.0)
+
+    def test_arithmetic_and_col(self):
+        records = [{'Unit cost': '2', 'units': 3}, {'Unit cost': 0, 'units': 4}]
+        assert evaluate("units / col('Unit cost') * -1 + 10", records) == [8.5, None]
+
+    def test_columns_are_reported(self):
+        assert compile_expression('cumsum(a) - abs(b) + a')[1] == ('a', 'b')
+
+
+class TestSafety:
+    @pytest.mark.parametrize('text', [
+        "__import__('os')",
+        'revenue.real',
+        'revenue ** 2',
+        'rolling(revenue)',
+        'rolling(revenue, 0)',
+        'pct_change(revenue, periods=2)',
+        "'text'",
+        'lambda: 1',
+        '',
+    ])
+    def test_rejected(self, text):
+        with pytest.raises(ValueError):
+            compile_expression(text)
+
+    def test_non_string_rejected_with_value_error(self):
+        with pytest.raises(ValueError, match='non-empty string'):
+            compile_expression(['pct_change(revenue)'])
+
+    def test_compiled_once(self):
+        assert compile_expression('share(x)') is compile_expression('share(x)')
+
+
+def test_expression_column():
+    assert expression_column({'y_expr': 'pct_change(revenue)'}) == 'pct_change_revenue'
+    assert expression_column({'y_expr': 'share(x)', 'y_name': 'Share %'}) == 'Share %'
@@ -0,0 +1,62 @@
+"""Tests for the tree-shaken Chart.js registration module."""
+
+from chart_registry import (
+    REGISTRY_FILE,
+    deck_chart_types,
+    generate_registry,
+    js_payload,
+    registration_module,
+    registry_components,
+)
+from utils import save_json
+
+
+class TestRegistryComponents:
+    def test_bar_and_pie_only(self):
+        components = registry_components({'bar', 'pie'})
+        assert 'BarController' in components and 'PieController' in components
+        assert 'LineController' not in components and 'TimeScale' not in components
+        assert components == sorted(components)
+
+    def test_time_axis_adds_scale_and_decimation(self):
+        assert {'TimeScale', 'Decimation'} <= set(registry_components({'line', 'time'}))
+
+
+class TestDeckChartTypes:
+    def test_generated_configs_refine_types(self, tmp_path):
+        save_json(tmp_path / 'chart_1.json', {'type': 'doughnut', 'data': {}})
+        save_json(tmp_path / 'chart_2.json', {'type': 'line', 'options': {'scales': {'x': {'type': 'time'}}}})
+        save_json(tmp_path / 'chart-defaults.json', {'types': {'pie': {}}})
+        used = deck_chart_types({'slide_1': 'bar', 'slide_2': 'none'}, tmp_path)
+        assert used == {'bar', 'doughnut', 'line', 'time'}
+
+    def test_line_without_configs_keeps_time_support(self):
+        assert deck_chart_types({'slide_1': 'line'}) == {'line', 'time'}
+
+
+class TestRegistrationModule:
+    def test_registers_listed_components(self):
+        module = registration_module(['BarController', 'Legend'])
+        assert "from 'chart.js'" in module
+        assert 'Chart.register(\n  BarController,\n  Legend,\n)' in module
+        assert 'chart.js/auto' not in module and 'adapter' not in module
+
+    def test_empty_falls_back_to_auto(self):
+        assert "import Chart from 'chart.js/auto'" in registration_module([])
+
+    def test_generate_registry_writes_deck_module(self, tmp_path):
+        types_path = tmp_path / 'chart-types.json'
+        save_json(types_path, {'slide_3': 'waterfall'})
+        components = generate_registry(tmp_path, str(types_path))
+        module = (tmp_path / REGISTRY_FILE).read_text(encoding='utf-8')
+        assert 'BarController' in components
+        assert all(name in module for name in components)
+
+
+def test_js_payload_counts_js_only(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'assets' / 'index.js').write_text('console.log(1)\n' * 50, encoding='utf-8')
+    (tmp_path / 'index.html').write_text('<html></html>', encoding='utf-8')
+    sizes = js_payload(tmp_path)
+    assert sizes['js_bytes'] == 750
+    assert 0 < sizes['js_gzip_bytes'] < sizes['js_bytes']
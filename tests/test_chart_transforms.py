@@ -0,0 +1,210 @@
+"""Tests for declarative chart data transforms."""
+
+import pytest
+
+from chart_transforms import (
+    aggregate_records,
+    apply_visual_transforms,
+    hash_join,
+    join_specs,
+    lttb_indices,
+    parse_timestamp,
+    partition_records,
+    sort_records,
+    time_axis_values,
+    top_n_indices,
+)
+
+
+@pytest.fixture
+def ledger():
+    return [
+        {'month': 'Jan', 'region': 'UK', 'sales': 10},
+        {'month': 'Jan', 'region': 'DE', 'sales': '5'},
+        {'month': 'Feb', 'region': 'UK', 'sales': 20},
+        {'month': 'Feb', 'region': 'UK', 'sales': 'n/a'},
+        {'month': 'Mar', 'region': 'DE', 'sales': 7},
+    ]
+
+
+class TestAggregateRecords:
+    def test_sum_keeps_first_seen_order(self, ledger):
+        rows = aggregate_records(ledger, 'sales', ['month'], 'sum')
+        assert rows == [
+            {'month': 'Jan', 'sales': 15.0},
+            {'month': 'Feb', 'sales': 20.0},
+            {'month': 'Mar', 'sales': 7.0},
+        ]
+
+    def test_count_includes_non_numeric_rows(self, ledger):
+        rows = aggregate_records(ledger, 'sales', ['month'], 'count')
+        assert [r['sales'] for r in rows] == [2.0, 2.0, 1.0]
+
+    def test_multiple_group_keys(self, ledger):
+        rows = aggregate_records(ledger, 'sales', ['month', 'region'], 'mean')
+        assert {'month': 'Jan', 'region': 'DE', 'sales': 5.0} in rows
+        assert len(rows) == 4
+
+    def test_unknown_aggregation(self, ledger):
+        with pytest.raises(ValueError):
+            aggregate_records(ledger, 'sales', ['month'], 'avg')
+
+
+class TestSortRecords:
+    def test_descending_by_y_alias(self):
+        rows = [{'k': 'a', 'v': 1}, {'k': 'b', 'v': 3}, {'k': 'c', 'v': 2}]
+        assert [r['k'] for r in sort_records(rows, '-y', 'k', 'v')] == ['b', 'c', 'a']
+
+    def test_mixed_types_do_not_raise(self):
+        rows = [{'k': 'x'}, {'k': 2}, {'k': None}]
+        assert len(sort_records(rows, 'x', 'k', 'v')) == 3
+
+
+class TestApplyVisualTransforms:
+    def test_no_transforms_is_passthrough(self, ledger):
+        records, meta = apply_visual_transforms(ledger, {}, 'month', 'sales')
+        assert records is ledger
+        assert meta == {}
+
+    def test_group_sort_limit(self, ledger):
+        visual = {'agg': 'sum', 'sort': '-y', 'limit': 2}
+        records, meta = apply_visual_transforms(ledger, visual, 'month', 'sales')
+        assert [r['month'] for r in records] == ['Feb', 'Jan']
+        assert meta == {
+            'source_rows': 5,
+            'agg': 'sum',
+            'group_by': ['month'],
+            'sort': '-y',
+            'limit': 2,
+            'rows': 2,
+        }
+
+    def test_group_by_defaults_to_sum_and_keeps_series(self, ledger):
+        visual = {'group_by': 'month', 'series_key': 'region'}
+        records, meta = apply_visual_transforms(ledger, visual, 'month', 'sales')
+        assert meta['agg'] == 'sum'
+        assert meta['group_by'] == ['month', 'region']
+        assert len(records) == 4
+
+    def test_window_expression_per_series_in_x_order(self):
+        rows = [
+            {'q': q, 'region': region, 'rev': base * 1.1 ** idx}
+            for idx, q in enumerate(['2024-01', '2024-02', '2024-03'])
+            for region, base in [('US', 1000), ('EU', 100)]
+        ]
+        visual = {'series_key': 'region', 'y_expr': 'pct_change(rev)', 'sort': 'y', 'limit': 4}
+        records, _ = apply_visual_transforms(list(reversed(rows)), visual, 'q', 'growth')
+        assert len(records) == 4
+        assert all(row['growth'] == pytest.approx(10.0) for row in records)
+        assert {row['region'] for row in records} == {'US', 'EU'}
+
+
+class TestHashJoin:
+    def test_inner_join_matches_numeric_strings(self):
+        left = [{'year': 2023, 'revenue': 10}, {'year': 2024, 'revenue': 12}, {'year': 2025, 'revenue': 15}]
+        right = [{'year': '2024', 'headcount': 40}, {'year': '2023', 'headcount': 35}]
+        joined = hash_join(left, right, ['year'], ['year'])
+        assert joined == [
+            {'year': 2023, 'revenue': 10, 'headcount': 35},
+            {'year': 2024, 'revenue': 12, 'headcount': 40},
+        ]
+
+    def test_left_join_keeps_unmatched_and_fans_out(self):
+        left = [{'k': 'a'}, {'k': 'b'}]
+        right = [{'k': 'a', 'v': 1}, {'k': 'a', 'v': 2}]
+        joined = hash_join(left, right, ['k'], ['k'], how='left')
+        assert joined == [{'k': 'a', 'v': 1}, {'k': 'a', 'v': 2}, {'k': 'b'}]
+
+    def test_clashing_columns_get_suffix(self):
+        left = [{'id': 1, 'value': 'L'}]
+        right = [{'ref': 1, 'value': 'R', 'other': 'x'}]
+        joined = hash_join(left, right, ['id'], ['ref'], columns=['value'], suffix='_hr')
+        assert joined == [{'id': 1, 'value': 'L', 'value_hr': 'R'}]
+
+
+class TestJoinSpecs:
+    def test_defaults(self):
+        specs = join_specs({'join': {'source_file': 'HR Data.xlsx', 'on': 'quarter'}})
+        assert specs == [{
+            'source_file': 'HR Data.xlsx',
+            'left_on': ['quarter'],
+            'right_on': ['quarter'],
+            'how': 'inner',
+            'columns': None,
+            'suffix': '_hr_data',
+        }]
+
+    @pytest.mark.parametrize('join', [
+        {'on': 'quarter'},
+        {'source_file': 'hr.csv'},
+        {'source_file': 'hr.csv', 'left_on': ['a', 'b'], 'right_on': 'a'},
+        {'source_file': 'hr.csv', 'on': 'quarter', 'how': 'outer'},
+    ])
+    def test_invalid_specs(self, join):
+        with pytest.raises(ValueError):
+            join_specs({'join': join})
+
+
+def test_partition_records_keeps_first_seen_order(ledger):
+    partitions = partition_records(ledger + [{'region': None}], 'region')
+    assert list(partitions) == ['UK', 'DE']
+    assert len(partitions['UK']) == 3
+
+
+class TestLttbIndices:
+    def test_keeps_endpoints_and_threshold(self):
+        values = [float(i % 13) for i in range(500)]
+        indices = lttb_indices(values, 50)
+        assert len(indices) == 50
+        assert indices[0] == 0 and indices[-1] == 499
+        assert indices == sorted(set(indices))
+
+    def test_short_series_returned_whole(self):
+        assert lttb_indices([1.0, 2.0, 3.0], 10) == [0, 1, 2]
+
+    def test_preserves_spike(self):
+        values = [0.0] * 1000
+        values[421] = 100.0
+        assert 421 in lttb_indices(values, 20)
+
+    def test_uses_explicit_x_positions(self):
+        xs = [float(i) for i in range(100)] + [1000.0 + i for i in range(100)]
+        values = [1.0] * 200
+        values[150] = 50.0
+        indices = lttb_indices(values, 10, xs)
+        assert 150 in indices
+        assert indices[0] == 0 and indices[-1] == 199
+
+
+class TestTimeAxis:
+    def test_parse_iso_formats(self):
+        assert parse_timestamp('1970-01-02') == 86_400_000
+        assert parse_timestamp('1970-01-01T00:00:01Z') == 1000
+        assert parse_timestamp('1970-02') == 31 * 86_400_000
+
+    def test_non_dates_stay_categorical(self):
+        assert parse_timestamp('2024') is None
+        assert parse_timestamp('Jan 2024') is None
+        assert parse_timestamp(20240101) is None
+
+    def test_detects_time_column(self):
+        records = [{'day': '2024-01-01'}, {'day': '2024-01-02'}, {'day': ''}]
+        stamps = time_axis_values(records, 'day')
+        assert stamps[0] < stamps[1] and stamps[2] is None
+
+    def test_mixed_column_is_not_time(self):
+        records = [{'day': '2024-01-01'}, {'day': 'Total'}]
+        assert time_axis_values(records, 'day') is None
+        assert time_axis_values(records, 'day', 'time') is not None
+
+    def test_category_override(self):
+        records = [{'day': '2024-01-01'}, {'day': '2024-01-02'}]
+        assert time_axis_values(records, 'day', 'category') is None
+
+
+class TestTopNIndices:
+    def test_original_order_kept(self):
+        assert top_n_indices([5.0, 1.0, 9.0, 3.0, 7.0], 3) == [0, 2, 4]
+
+    def test_n_larger_than_values(self):
+        assert top_n_indices([1.0, 2.0], 5) == [0, 1]
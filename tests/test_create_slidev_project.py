@@ -0,0 +1,87 @@
+"""Tests for incremental Slidev project creation."""
+
+import json
+from pathlib import Path
+
+from create_slidev_project import (
+    BRAND_CSS,
+    INDEX_HTML,
+    PROJECT_STATE,
+    create_project,
+    ensure_theme_variant,
+    resolve_theme_dir,
+)
+from scaffold_cache import MANIFEST_FILE, scaffold_key
+
+
+def make_scaffold(cache_dir):
+    scaffold = cache_dir / f'scaffold-{scaffold_key()}'
+    (scaffold / 'node_modules' / 'chart.js').mkdir(parents=True)
+    (scaffold / 'node_modules' / 'chart.js' / 'index.js').write_text('export {}', encoding='utf-8')
+    (scaffold / 'package.json').write_text('{"name": "staging"}', encoding='utf-8')
+    (scaffold / MANIFEST_FILE).write_text(json.dumps({'key': scaffold_key(), 'manager': 'npm'}), encoding='utf-8')
+    return scaffold
+
+
+def ran(report):
+    return [entry['step'] for entry in report if not entry['skipped']]
+
+
+def test_rerun_skips_unchanged_sub_steps(tmp_path):
+    make_scaffold(tmp_path / 'cache')
+    deck = tmp_path / 'deck'
+    cache, themes = str(tmp_path / 'cache'), str(tmp_path / 'themes')
+
+    first = create_project(deck, 'consulting', {}, scaffold_cache=cache, theme_cache=themes)
+    assert ran(first) == ['dependencies', 'theme', 'components', 'setup', 'config', 'git']
+    assert (deck / PROJECT_STATE).exists()
+    assert (deck / 'components' / 'DeckChart.vue').exists()
+
+    assert ran(create_project(deck, 'consulting', {}, scaffold_cache=cache, theme_cache=themes)) == []
+
+    recoloured = create_project(deck, 'consulting', {'primary': '#123456'}, scaffold_cache=cache, theme_cache=themes)
+    assert ran(recoloured) == ['theme', 'git']
+    assert '#123456' in (deck / 'styles' / 'theme.css').read_text(encoding='utf-8')
+
+    (deck / 'layouts' / 'DeckContent.vue').unlink()
+    assert ran(create_project(deck, 'consulting', {'primary': '#123456'}, scaffold_cache=cache, theme_cache=themes)) == ['components']
+    assert (deck / 'layouts' / 'DeckContent.vue').exists()
+
+    forced = create_project(deck, 'consulting', {'primary': '#123456'}, scaffold_cache=cache, theme_cache=themes, force=True)
+    assert all(not entry['skipped'] for entry in forced)
+
+
+def test_theme_variant_shared_across_decks(tmp_path):
+    make_scaffold(tmp_path / 'cache')
+    themes = tmp_path / 'themes'
+    colors = {'primary': '#123456'}
+    for name in ('a_deck', 'b_deck'):
+        create_project(tmp_path / name, 'consulting', colors, scaffold_cache=str(tmp_path / 'cache'), theme_cache=str(themes))
+
+    variants = [path for path in themes.iterdir()]
+    assert len(variants) == 1 and variants[0].name.startswith('consulting-')
+    assert ensure_theme_variant(resolve_theme_dir(Path(__file__).parent.parent, 'consulting'), colors, themes) == variants[0]
+    for name in ('a_deck', 'b_deck'):
+        assert "primary: '#123456'" in (tmp_path / name / 'uno.config.ts').read_text(encoding='utf-8')
+    assert (tmp_path / 'b_deck' / 'styles' / 'theme.css').read_text(encoding='utf-8') == \
+        (variants[0] / 'styles' / 'theme.css').read_text(encoding='utf-8')
+
+    direct = tmp_path / 'c_deck'
+    create_project(direct, 'consulting', colors, scaffold_cache=str(tmp_path / 'cache'), theme_cache=False)
+    assert (direct / 'uno.config.ts').read_text(encoding='utf-8') == (variants[0] / 'uno.config.ts').read_text(encoding='utf-8')
+
+
+def test_runtime_theme_keeps_colours_in_brand_css(tmp_path):
+    make_scaffold(tmp_path / 'cache')
+    deck = tmp_path / 'deck'
+    options = {'scaffold_cache': str(tmp_path / 'cache'), 'theme_cache': str(tmp_path / 'themes')}
+
+    create_project(deck, 'consulting', {'primary': '#123456'}, runtime_theme=True, **options)
+    assert "primary: 'var(--slide-primary)'" in (deck / 'uno.config.ts').read_text(encoding='utf-8')
+    assert '--slide-primary: #003366;' in (deck / 'styles' / 'theme.css').read_text(encoding='utf-8')
+    assert '--slide-primary: #123456;' in (deck / BRAND_CSS).read_text(encoding='utf-8')
+    assert 'href="%BASE_URL%brand.css"' in (deck / INDEX_HTML).read_text(encoding='utf-8')
+
+    create_project(deck, 'consulting', {'primary': '#123456'}, **options)
+    assert not (deck / BRAND_CSS).exists() and not (deck / INDEX_HTML).exists()
+    assert "primary: '#123456'" in (deck / 'uno.config.ts').read_text(encoding='utf-8')
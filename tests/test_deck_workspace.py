@@ -0,0 +1,43 @@
+"""Tests for the multi-deck workspace layout."""
+
+import json
+
+from deck_workspace import VITE_CONFIG, WORKSPACE_FILE, attach_deck, ensure_workspace, list_decks
+from scaffold_cache import MANIFEST_FILE, scaffold_key
+
+
+def make_scaffold(cache_dir):
+    scaffold = cache_dir / f'scaffold-{scaffold_key()}'
+    (scaffold / 'node_modules' / '@slidev' / 'cli').mkdir(parents=True)
+    (scaffold / 'node_modules' / '@slidev' / 'cli' / 'package.json').write_text('{}', encoding='utf-8')
+    (scaffold / 'package.json').write_text('{"name": "staging"}', encoding='utf-8')
+    (scaffold / MANIFEST_FILE).write_text(json.dumps({'key': scaffold_key(), 'manager': 'npm'}), encoding='utf-8')
+    return scaffold
+
+
+def test_workspace_shares_scaffold_once(tmp_path, capsys):
+    scaffold = make_scaffold(tmp_path / 'cache')
+    root = tmp_path / 'decks'
+
+    state = ensure_workspace(root, str(tmp_path / 'cache'))
+    assert state['scaffold'] == scaffold.name
+    assert (root / 'node_modules' / '@slidev' / 'cli' / 'package.json').exists()
+    assert json.loads((root / WORKSPACE_FILE).read_text(encoding='utf-8'))['scaffold'] == scaffold.name
+    assert (root / '.vite').is_dir()
+
+    capsys.readouterr()
+    assert ensure_workspace(root, str(tmp_path / 'cache')) == state
+    assert 'Workspace toolchain ready' not in capsys.readouterr().out
+
+
+def test_attach_deck_points_vite_cache_at_root(tmp_path):
+    root = tmp_path / 'decks'
+    deck = root / 'q3_deck'
+    deck.mkdir(parents=True)
+    (deck / 'slides.md').write_text('# Q3\n', encoding='utf-8')
+    (root / 'notes').mkdir()
+
+    cache_dir = attach_deck(root, deck)
+    assert cache_dir == root / '.vite' / 'q3_deck' and cache_dir.is_dir()
+    assert "cacheDir: '../.vite/q3_deck'" in (deck / VITE_CONFIG).read_text(encoding='utf-8')
+    assert list_decks(root) == [deck]
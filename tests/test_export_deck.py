@@ -0,0 +1,21 @@
+"""Tests for export profiles."""
+
+import json
+
+import pytest
+
+from export_deck import EXPORT_PROFILE_FILE, write_export_profile
+
+
+def test_render_profile_disables_animation(tmp_path):
+    assert write_export_profile(tmp_path, 'render') is True
+    written = json.loads((tmp_path / EXPORT_PROFILE_FILE).read_text(encoding='utf-8'))
+    assert written == {'profile': 'render', 'animation': False, 'signalRendered': True}
+    assert write_export_profile(tmp_path, 'render') is False
+    assert write_export_profile(tmp_path, 'standard') is True
+
+
+def test_unknown_profile_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown export profile'):
+        write_export_profile(tmp_path, 'fast')
+    assert not (tmp_path / EXPORT_PROFILE_FILE).exists()
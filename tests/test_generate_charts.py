@@ -0,0 +1,497 @@
+"""Tests for Chart.js config generation."""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+
+from generate_charts import (
+    chart_defaults,
+    chart_from_records,
+    compact_config,
+    generate_and_save,
+    generate_bar_chart,
+    options_delta,
+    resolve_colors,
+    resolve_source_records,
+    round_chart_data,
+    round_numbers,
+)
+from utils import build_content_index, load_json, save_json
+
+
+COLORS = resolve_colors('consulting')
+
+
+def write_inputs(tmp_path, analysis, content, chart_types=None):
+    """Write analysis, chart-types and content files; return their paths in generate_and_save order."""
+    analysis_path = tmp_path / 'analysis.json'
+    types_path = tmp_path / 'types.json'
+    content_path = tmp_path / 'content.json'
+    save_json(analysis_path, analysis)
+    save_json(types_path, chart_types or {'slide_3': 'line'})
+    save_json(content_path, content)
+    return str(analysis_path), str(types_path), str(content_path)
+
+
+class TestChartFromRecords:
+    def test_plain_mapping(self, sample_content):
+        records = sample_content['contents']['data.csv']['data']
+        config = chart_from_records('line', records, {'x_key': 'quarter', 'y_key': 'revenue'}, COLORS)
+        assert config['type'] == 'line'
+        assert config['data']['labels'] == ['Q1', 'Q2', 'Q3', 'Q4']
+        assert 'meta' not in config
+
+    def test_aggregates_transactional_rows(self):
+        records = [
+            {'month': 'Jan', 'amount': 1},
+            {'month': 'Feb', 'amount': 4},
+            {'month': 'Jan', 'amount': 2},
+        ]
+        visual = {'x_key': 'month', 'y_key': 'amount', 'agg': 'sum'}
+        config = chart_from_records('bar', records, visual, COLORS)
+        assert config['data']['labels'] == ['Jan', 'Feb']
+        assert config['data']['datasets'][0]['data'] == [3.0, 4.0]
+        assert config['meta']['source_rows'] == 3
+        assert config['meta']['rows'] == 2
+
+    def test_y_expr_after_aggregation(self):
+        records = [
+            {'month': 'Jan', 'amount': 50},
+            {'month': 'Jan', 'amount': 50},
+            {'month': 'Feb', 'amount': 150},
+        ]
+        visual = {'x_key': 'month', 'agg': 'sum', 'y_expr': 'pct_change(amount)'}
+        config = chart_from_records('bar', records, visual, COLORS)
+        assert config['data']['labels'] == ['Feb']
+        assert config['data']['datasets'][0]['label'] == 'Pct Change Amount'
+        assert config['data']['datasets'][0]['data'] == [50.0]
+        assert config['meta']['y_expr'] == 'pct_change(amount)'
+
+    def test_group_by_supplies_x_key(self):
+        records = [{'id': 1, 'team': 'A', 'cost': 5}, {'id': 2, 'team': 'A', 'cost': 6}]
+        config = chart_from_records('bar', records, {'group_by': 'team', 'y_key': 'cost'}, COLORS)
+        assert config['data']['labels'] == ['A']
+        assert config['data']['datasets'][0]['data'] == [11.0]
+
+
+class TestLineDownsampling:
+    def test_long_series_is_downsampled(self):
+        records = [{'minute': f't{i}', 'load': (i % 50) * 1.5} for i in range(5000)]
+        visual = {'x_key': 'minute', 'y_key': 'load', 'max_points': 200}
+        config = chart_from_records('line', records, visual, COLORS)
+        assert len(config['data']['labels']) == 200
+        assert config['data']['labels'][0] == 't0'
+        assert config['data']['labels'][-1] == 't4999'
+        assert config['meta']['downsample'] == {
+            'method': 'lttb',
+            'max_points': 200,
+            'source_points': 5000,
+            'points': 200,
+        }
+
+    def test_short_series_untouched(self, sample_content):
+        records = sample_content['contents']['data.csv']['data']
+        config = chart_from_records('line', records, {'x_key': 'quarter', 'y_key': 'revenue'}, COLORS, max_points=3)
+        assert len(config['data']['labels']) == 3
+        config = chart_from_records('line', records, {'x_key': 'quarter', 'y_key': 'revenue'}, COLORS, max_points=0)
+        assert len(config['data']['labels']) == 4
+
+    def test_multi_series_labels_stay_aligned(self):
+        records = []
+        for i in range(1000):
+            records.append({'t': i, 'series': 'a', 'v': i % 7})
+            records.append({'t': i, 'series': 'b', 'v': -(i % 11)})
+        visual = {'x_key': 't', 'y_key': 'v', 'series_key': 'series', 'max_points': 100}
+        config = chart_from_records('line', records, visual, COLORS)
+        points = len(config['data']['labels'])
+        assert points <= 100
+        assert all(len(ds['data']) == points for ds in config['data']['datasets'])
+
+
+class TestTimeAxisLines:
+    def _records(self, hours):
+        start = datetime(2024, 1, 1)
+        return [{'date': (start + timedelta(hours=i)).isoformat(), 'load': i % 9} for i in range(hours)]
+
+    def test_iso_dates_emit_time_points(self):
+        records = list(reversed(self._records(5)))
+        config = chart_from_records('line', records, {'x_key': 'date', 'y_key': 'load'}, COLORS)
+        assert 'labels' not in config['data']
+        points = config['data']['datasets'][0]['data']
+        assert [point['y'] for point in points] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert points[1]['x'] - points[0]['x'] == 3_600_000
+        options = config['options']
+        assert options['parsing'] is False
+        assert options['scales']['x']['type'] == 'time'
+        assert options['plugins']['decimation'] == {'enabled': True, 'algorithm': 'lttb'}
+
+    def test_series_key_splits_datasets(self):
+        records = [
+            {'date': '2024-01-01', 'region': 'EU', 'sales': 1},
+            {'date': '2024-01-02', 'region': 'US', 'sales': 2},
+            {'date': '2024-01-03', 'region': 'EU', 'sales': 3},
+        ]
+        visual = {'x_key': 'date', 'y_key': 'sales', 'series_key': 'region'}
+        config = chart_from_records('line', records, visual, COLORS)
+        datasets = {ds['label']: ds['data'] for ds in config['data']['datasets']}
+        assert [point['y'] for point in datasets['EU']] == [1.0, 3.0]
+        assert len(datasets['US']) == 1
+        assert config['options']['plugins']['legend']['display'] is True
+
+    def test_long_time_series_downsampled(self):
+        records = self._records(336)
+        visual = {'x_key': 'date', 'y_key': 'load', 'max_points': 50}
+        config = chart_from_records('line', records, visual, COLORS)
+        ds = config['data']['datasets'][0]
+        assert len(ds['data']) == 50
+        assert ds['pointRadius'] == 3
+        assert config['meta']['downsample']['source_points'] == 336
+
+    def test_x_type_category_keeps_labels(self):
+        visual = {'x_key': 'date', 'y_key': 'load', 'x_type': 'category'}
+        config = chart_from_records('line', self._records(3), visual, COLORS)
+        assert config['data']['labels'][0] == '2024-01-01T00:00:00'
+
+    def test_bar_charts_stay_categorical(self):
+        config = chart_from_records('bar', self._records(3), {'x_key': 'date', 'y_key': 'load'}, COLORS)
+        assert 'labels' in config['data']
+
+
+class TestTopNFolding:
+    def _records(self, count):
+        return [{'name': f'c{i}', 'value': i + 1} for i in range(count)]
+
+    def test_pie_defaults_to_five_plus_other(self):
+        config = chart_from_records('pie', self._records(40), {'x_key': 'name', 'y_key': 'value'}, COLORS)
+        assert config['data']['labels'] == ['c35', 'c36', 'c37', 'c38', 'c39', 'Other']
+        dataset = config['data']['datasets'][0]
+        assert dataset['data'][-1] == sum(range(1, 36))
+        assert len(dataset['backgroundColor']) == 6
+        assert config['meta']['top_n']['folded'] == 35
+
+    def test_visual_override_and_disable(self):
+        visual = {'x_key': 'name', 'y_key': 'value', 'top_n': 3}
+        config = chart_from_records('horizontal_bar', self._records(10), visual, COLORS)
+        assert config['data']['labels'] == ['c7', 'c8', 'c9', 'Other']
+
+        visual['top_n'] = 0
+        config = chart_from_records('bar', self._records(30), visual, COLORS)
+        assert len(config['data']['labels']) == 30
+        assert 'meta' not in config
+
+    def test_small_charts_untouched(self, composition_data):
+        config = chart_from_records('donut', composition_data, {'x_key': 'segment', 'y_key': 'share'}, COLORS)
+        assert config['data']['labels'] == ['A', 'B', 'C', 'D']
+
+
+class TestCompactEncoding:
+    def test_delta_is_empty_for_default_options(self):
+        defaults = chart_defaults(COLORS)
+        config = generate_bar_chart([1.0], ['a'], 'Value', COLORS)
+        compacted = compact_config(config, defaults)
+        assert compacted['options'] == {}
+        assert compacted['extends'] == 'chart-defaults.json'
+        assert config['options']['responsive'] is True
+
+    def test_delta_keeps_overrides_and_marks_removals(self):
+        defaults = {'plugins': {'legend': {'display': False}}, 'indexAxis': 'x'}
+        options = {'plugins': {'legend': {'display': True}}}
+        assert options_delta(options, defaults) == {
+            'plugins': {'legend': {'display': True}},
+            'indexAxis': None,
+        }
+
+    def test_round_numbers(self):
+        payload = {'data': [1.23456, 2.0, True, 'x'], 'n': 3}
+        assert round_numbers(payload, 2) == {'data': [1.23, 2, True, 'x'], 'n': 3}
+
+    def test_precision_rounds_only_data(self):
+        config = {
+            'type': 'line',
+            'data': {
+                'labels': [0.125, 'b'],
+                'datasets': [{'data': [1.26, {'x': 1, 'y': 2.44}, [0.05, 0.96]], 'tension': 0.3, 'borderWidth': 1.5}],
+            },
+            'options': {'layout': {'padding': 0.4}},
+        }
+        rounded = round_chart_data(config, 0)
+        dataset = rounded['data']['datasets'][0]
+        assert dataset['data'] == [1, {'x': 1, 'y': 2}, [0, 1]]
+        assert dataset['tension'] == 0.3 and dataset['borderWidth'] == 1.5
+        assert rounded['data']['labels'] == [0.125, 'b'] and rounded['options'] == config['options']
+
+    def test_generate_and_save_compact(self, tmp_path, sample_analysis, sample_content):
+        out = tmp_path / 'data'
+        generate_and_save(
+            *write_inputs(tmp_path, sample_analysis, sample_content), str(out),
+            compact=True, precision=1,
+        )
+        raw = (out / 'chart_1.json').read_text(encoding='utf-8')
+        assert '\n' not in raw
+        chart = load_json(out / 'chart_1.json')
+        assert chart['extends'] == 'chart-defaults.json'
+        assert chart['data']['datasets'][0]['data'] == [100, 120, 140, 160]
+        defaults = load_json(out / 'chart-defaults.json')
+        assert defaults['theme'] == 'consulting'
+        assert 'line' in defaults['types']
+
+
+class TestChartBundle:
+    def test_bundle_keyed_by_data_file(self, tmp_path, sample_analysis, sample_content):
+        out = tmp_path / 'data'
+        generate_and_save(
+            *write_inputs(tmp_path, sample_analysis, sample_content), str(out),
+            compact=True, bundle=True, precompress=True,
+        )
+        bundle = load_json(out / 'charts.bundle.json')
+        assert bundle['charts']['chart_1.json'] == load_json(out / 'chart_1.json')
+        assert bundle['defaults'] == load_json(out / 'chart-defaults.json')
+        with gzip.open(out / 'charts.bundle.json.gz', 'rt', encoding='utf-8') as f:
+            assert json.load(f) == bundle
+
+    def test_stale_bundle_removed_when_disabled(self, tmp_path, sample_analysis, sample_content):
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(out), bundle=True)
+        assert (out / 'charts.bundle.json').exists()
+        generate_and_save(*inputs, str(out))
+        assert not (out / 'charts.bundle.json').exists()
+
+
+class TestDatasetDedupe:
+    def _inputs(self, tmp_path, sample_analysis, sample_content):
+        sample_content['contents']['data.csv']['data'] = [{'quarter': f'Q{i}', 'revenue': i * 10} for i in range(12)]
+        appendix = json.loads(json.dumps(sample_analysis['slides'][2]))
+        appendix['visual']['data_file'] = 'chart_appendix.json'
+        sample_analysis['slides'].append(appendix)
+        slide_id = f"slide_{len(sample_analysis['slides'])}"
+        return write_inputs(tmp_path, sample_analysis, sample_content, {'slide_3': 'line', slide_id: 'bar'})
+
+    def test_shared_series_stored_once(self, tmp_path, sample_analysis, sample_content):
+        out = tmp_path / 'data'
+        generate_and_save(*self._inputs(tmp_path, sample_analysis, sample_content), str(out), dedupe=True, bundle=True)
+        line, bar = load_json(out / 'chart_1.json'), load_json(out / 'chart_appendix.json')
+        assert line['data']['labels'] == bar['data']['labels']
+        assert set(line['data']['labels']) == {'$dataset'}
+        blobs = sorted((out / 'datasets').glob('*.json'))
+        assert len(blobs) == 2
+        bundle = load_json(out / 'charts.bundle.json')
+        assert sorted(bundle['datasets']) == [path.stem for path in blobs]
+        assert bundle['charts']['chart_1.json'] == line
+
+    def test_reuse_resolves_blobs_and_disable_cleans_up(self, tmp_path, sample_analysis, sample_content, capsys):
+        out = tmp_path / 'data'
+        inputs = self._inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(out), dedupe=True)
+        capsys.readouterr()
+        generate_and_save(*inputs, str(out), dedupe=True, svg=True)
+        assert '0 regenerated, 2 reused' in capsys.readouterr().out
+        assert 'Q11' in (out / 'chart_1.svg').read_text(encoding='utf-8')
+
+        generate_and_save(*inputs, str(out))
+        assert load_json(out / 'chart_1.json')['data']['labels'][0] == 'Q0'
+        assert not list((out / 'datasets').glob('*.json'))
+
+    def test_dataset_store_shared_between_decks(self, tmp_path, sample_analysis, sample_content):
+        store = tmp_path / 'store'
+        inputs = self._inputs(tmp_path, sample_analysis, sample_content)
+        for deck in ['a', 'b']:
+            generate_and_save(*inputs, str(tmp_path / deck), dedupe=True, dataset_store=str(store))
+        shared = sorted(store.glob('*.json'))
+        assert len(shared) == 2
+        linked = tmp_path / 'b' / 'datasets' / shared[0].name
+        assert linked.read_text(encoding='utf-8') == shared[0].read_text(encoding='utf-8')
+
+
+class TestIncrementalGeneration:
+    def test_unchanged_inputs_are_reused(self, tmp_path, sample_analysis, sample_content, capsys):
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(out))
+        chart_path = out / 'chart_1.json'
+        assert load_json(chart_path)['meta']['fingerprint']
+        first_mtime = chart_path.stat().st_mtime_ns
+
+        capsys.readouterr()
+        generate_and_save(*inputs, str(out))
+        assert '0 regenerated, 1 reused' in capsys.readouterr().out
+        assert chart_path.stat().st_mtime_ns == first_mtime
+
+    def test_title_change_reuses_but_data_change_regenerates(self, tmp_path, sample_analysis, sample_content, capsys):
+        out = tmp_path / 'data'
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, sample_content), str(out))
+
+        sample_analysis['slides'][2]['title'] = 'A different headline.'
+        capsys.readouterr()
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, sample_content), str(out))
+        assert '0 regenerated, 1 reused' in capsys.readouterr().out
+
+        sample_content['contents']['data.csv']['data'][0]['revenue'] = 999
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, sample_content), str(out))
+        assert '1 regenerated, 0 reused' in capsys.readouterr().out
+        assert load_json(out / 'chart_1.json')['data']['datasets'][0]['data'][0] == 999
+
+    def test_force_regenerates(self, tmp_path, sample_analysis, sample_content, capsys):
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(out))
+        capsys.readouterr()
+        generate_and_save(*inputs, str(out), force=True)
+        assert '1 regenerated, 0 reused' in capsys.readouterr().out
+
+
+class TestRuntimeTheme:
+    def test_runtime_theme_writes_css_variables(self, tmp_path, sample_analysis, sample_content, capsys):
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(out), svg=True, runtime_theme=True)
+        config = load_json(out / 'chart_1.json')
+        assert 'var(--slide-primary)' in json.dumps(config['data']['datasets'][0])
+        assert 'var(--slide-chart-grid)' in json.dumps(config['options'])
+        assert not (out / 'chart_1.svg').exists()
+        assert 'skipping SVG rendering' in capsys.readouterr().out
+
+
+class TestSourceJoins:
+    def _content(self, sample_content):
+        sample_content['contents']['hr.csv'] = {
+            'filename': 'hr.csv',
+            'type': 'csv',
+            'data': [{'quarter': q, 'headcount': 10 + i} for i, q in enumerate(['Q1', 'Q2', 'Q3'])],
+        }
+        return sample_content
+
+    def test_resolve_records_joins_and_caches(self, sample_content):
+        index = build_content_index(self._content(sample_content))
+        visual = {'source_file': 'data.csv', 'join': {'source_file': 'hr.csv', 'on': 'quarter'}}
+        cache = {}
+        records = resolve_source_records(visual, index, cache)
+        assert records[0] == {'quarter': 'Q1', 'revenue': 100, 'headcount': 10}
+        assert len(records) == 3
+        assert resolve_source_records(dict(visual), index, cache) is records
+
+    def test_joined_chart_tracks_secondary_source(self, tmp_path, sample_analysis, sample_content, capsys):
+        content = self._content(sample_content)
+        sample_analysis['slides'][2]['visual'].update({
+            'y_key': 'headcount',
+            'join': {'source_file': 'hr.csv', 'on': 'quarter'},
+        })
+        out = tmp_path / 'data'
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, content), str(out))
+        config = load_json(out / 'chart_1.json')
+        assert config['data']['labels'] == ['Q1', 'Q2', 'Q3']
+        assert config['data']['datasets'][0]['data'] == [10.0, 11.0, 12.0]
+
+        content['contents']['hr.csv']['data'][0]['headcount'] = 99
+        capsys.readouterr()
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, content), str(out))
+        assert '1 regenerated, 0 reused' in capsys.readouterr().out
+
+    def test_invalid_agg_or_limit_skips_only_that_slide(self, tmp_path, sample_analysis, sample_content, capsys):
+        chart_slide = sample_analysis['slides'][2]
+        slides = [
+            {**chart_slide, 'visual': {**chart_slide['visual'], 'data_file': f'chart_{idx + 1}.json'}}
+            for idx in range(3)
+        ]
+        analysis, types = {**sample_analysis, 'slides': slides}, {f'slide_{idx + 1}': 'bar' for idx in range(3)}
+        overrides = tmp_path / 'overrides.json'
+        save_json(overrides, {'slide_1': {'agg': 'avg'}, 'slide_2': {'limit': 'ten'}})
+        out = tmp_path / 'data'
+        generate_and_save(*write_inputs(tmp_path, analysis, sample_content, types), str(out), overrides_path=str(overrides))
+        log = capsys.readouterr().out
+        assert "Unsupported aggregation 'avg'" in log and 'for slide_1; skipping' in log
+        assert "limit must be a positive integer, not 'ten' for slide_2; skipping" in log
+        assert sorted(path.name for path in out.glob('chart_*.json')) == ['chart_3.json']
+
+    def test_invalid_join_skips_slide(self, tmp_path, sample_analysis, sample_content, capsys):
+        sample_analysis['slides'][2]['visual']['join'] = {'source_file': 'hr.csv'}
+        out = tmp_path / 'data'
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, sample_content), str(out))
+        assert 'needs matching key columns' in capsys.readouterr().out
+        assert not (out / 'chart_1.json').exists()
+
+
+class TestFacets:
+    def _content(self, sample_content):
+        rows = []
+        for unit in ['Retail', 'Wholesale', 'Online']:
+            for quarter, base in [('Q1', 10), ('Q2', 20)]:
+                rows.append({'unit': unit, 'quarter': quarter, 'revenue': base + len(unit)})
+        rows.append({'unit': '', 'quarter': 'Q1', 'revenue': 999})
+        sample_content['contents']['data.csv']['data'] = rows
+        return sample_content
+
+    def test_one_config_per_facet_and_manifest(self, tmp_path, sample_analysis, sample_content):
+        sample_analysis['slides'][2]['visual']['facet_key'] = 'unit'
+        out = tmp_path / 'data'
+        generate_and_save(*write_inputs(tmp_path, sample_analysis, self._content(sample_content)), str(out))
+        manifest = load_json(out / 'chart_1.facets.json')
+        assert [facet['title'] for facet in manifest['facets']] == ['Retail', 'Wholesale', 'Online']
+        assert [facet['data_file'] for facet in manifest['facets']] == ['chart_1-1.json', 'chart_1-2.json', 'chart_1-3.json']
+        retail = load_json(out / 'chart_1-1.json')
+        assert retail['data']['labels'] == ['Q1', 'Q2']
+        assert retail['data']['datasets'][0]['data'] == [16.0, 26.0]
+        assert not (out / 'chart_1.json').exists()
+
+    def test_facet_limit_and_reuse(self, tmp_path, sample_analysis, sample_content, capsys):
+        sample_analysis['slides'][2]['visual'].update({'facet_key': 'unit', 'facet_limit': 2})
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, self._content(sample_content))
+        generate_and_save(*inputs, str(out))
+        assert 'keeping the first 2 of 3 facets' in capsys.readouterr().out
+        assert len(load_json(out / 'chart_1.facets.json')['facets']) == 2
+        generate_and_save(*inputs, str(out))
+        assert '0 regenerated, 2 reused' in capsys.readouterr().out
+
+    def test_override_facet_key_and_stale_manifest(self, tmp_path, sample_analysis, sample_content):
+        overrides = tmp_path / 'overrides.json'
+        save_json(overrides, {'slide_3': {'facet_key': 'unit'}})
+        out = tmp_path / 'data'
+        inputs = write_inputs(tmp_path, sample_analysis, self._content(sample_content))
+        generate_and_save(*inputs, str(out), overrides_path=str(overrides))
+        assert (out / 'chart_1.facets.json').exists()
+        generate_and_save(*inputs, str(out))
+        assert not (out / 'chart_1.facets.json').exists()
+        assert (out / 'chart_1.json').exists()
+
+
+class TestParallelGeneration:
+    def _many_chart_analysis(self, sample_analysis, count):
+        chart_slide = sample_analysis['slides'][2]
+        slides = []
+        for idx in range(count):
+            slide = json.loads(json.dumps(chart_slide))
+            slide['visual']['data_file'] = f'chart_{idx + 1}.json'
+            slide['visual']['y_key'] = 'revenue' if idx % 2 else None
+            slides.append(slide)
+        types = {f'slide_{idx + 1}': 'bar' if idx % 3 else 'line' for idx in range(count)}
+        return {**sample_analysis, 'slides': slides}, types
+
+    def test_jobs_match_sequential_output(self, tmp_path, sample_analysis, sample_content, capsys):
+        analysis, types = self._many_chart_analysis(sample_analysis, 12)
+        inputs = write_inputs(tmp_path, analysis, sample_content, types)
+
+        generate_and_save(*inputs, str(tmp_path / 'seq'))
+        sequential_log = capsys.readouterr().out.replace(str(tmp_path / 'seq'), '<out>')
+        out = tmp_path / 'jobs'
+        generate_and_save(*inputs, str(out), jobs=4)
+        log = capsys.readouterr().out.replace(str(out), '<out>')
+        assert 'with 4 worker process(es)' in log
+        assert [l for l in log.splitlines() if l.startswith('✓ Generated')] == \
+            [l for l in sequential_log.splitlines() if l.startswith('✓ Generated')]
+        for idx in range(12):
+            name = f'chart_{idx + 1}.json'
+            assert (out / name).read_text() == (tmp_path / 'seq' / name).read_text()
+
+    def test_workers_resolve_facets_from_specs(self, tmp_path, sample_analysis, sample_content):
+        sample_content['contents']['data.csv']['data'] = [
+            {'unit': unit, 'quarter': quarter, 'revenue': base + len(unit)}
+            for unit in ['Retail', 'Online'] for quarter, base in [('Q1', 10), ('Q2', 20)]
+        ]
+        sample_analysis['slides'][2]['visual']['facet_key'] = 'unit'
+        inputs = write_inputs(tmp_path, sample_analysis, sample_content)
+        generate_and_save(*inputs, str(tmp_path / 'seq'))
+        generate_and_save(*inputs, str(tmp_path / 'jobs'), jobs=2)
+        for name in ['chart_1-1.json', 'chart_1-2.json']:
+            assert (tmp_path / 'jobs' / name).read_text() == (tmp_path / 'seq' / name).read_text()
+        assert load_json(tmp_path / 'jobs' / 'chart_1-2.json')['data']['datasets'][0]['data'] == [16.0, 26.0]
@@ -0,0 +1,109 @@
+"""Tests for offline installs from the pinned lockfile and tarball mirror."""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import tarfile
+
+import pytest
+
+from package_mirror import (
+    LOCKFILE,
+    locked_packages,
+    matches_platform,
+    offline_install,
+    read_lockfile,
+    read_pins,
+    refresh_mirror,
+    tarball_name,
+    verify_integrity,
+)
+
+
+def make_tarball(path, files):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, text in files.items():
+            data = text.encode('utf-8')
+            info = tarfile.TarInfo(f'package/{name}')
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return 'sha512-' + base64.b64encode(hashlib.sha512(path.read_bytes()).digest()).decode('ascii')
+
+
+def make_mirror(tmp_path):
+    """A mirror with a scoped CLI package, a nested dependency and a package for another OS."""
+    mirror, lock_dir = tmp_path / 'mirror', tmp_path / 'packages'
+    mirror.mkdir()
+    lock_dir.mkdir()
+    packages = {'': {'name': 'deck', 'dependencies': {'@slidev/cli': '1.0.0'}}}
+    specs = [
+        ('node_modules/@slidev/cli', '@slidev/cli', '1.0.0', {'bin/slidev.js': '#!/usr/bin/env node'}, {'bin': {'slidev': 'bin/slidev.js'}}),
+        ('node_modules/dep', 'dep', '2.0.0', {'index.js': 'v2'}, {}),
+        ('node_modules/@slidev/cli/node_modules/dep', 'dep', '1.0.0', {'index.js': 'v1'}, {}),
+        ('node_modules/native-aix', 'native-aix', '1.0.0', {'index.js': ''}, {'os': ['aix'], 'optional': True}),
+    ]
+    for key, name, version, files, extra in specs:
+        tarball = mirror / tarball_name(name, version)
+        integrity = make_tarball(tarball, {'package.json': json.dumps({'name': name}), **files})
+        packages[key] = {'version': version, 'resolved': tarball.as_uri(), 'integrity': integrity, **extra}
+    (lock_dir / LOCKFILE).write_text(json.dumps({'lockfileVersion': 3, 'packages': packages}), encoding='utf-8')
+    (lock_dir / 'package.json').write_text('{"name": "deck"}', encoding='utf-8')
+    return mirror, lock_dir
+
+
+def test_offline_install_extracts_locked_tree(tmp_path):
+    mirror, lock_dir = make_mirror(tmp_path)
+    project = tmp_path / 'deck'
+    project.mkdir()
+
+    assert offline_install(project, mirror, lock_dir) == 3
+    modules = project / 'node_modules'
+    assert (modules / 'dep' / 'index.js').read_text(encoding='utf-8') == 'v2'
+    assert (modules / '@slidev' / 'cli' / 'node_modules' / 'dep' / 'index.js').read_text(encoding='utf-8') == 'v1'
+    assert not (modules / 'native-aix').exists()
+    assert os.readlink(modules / '.bin' / 'slidev') == '../@slidev/cli/bin/slidev.js'
+    assert os.access(modules / '.bin' / 'slidev', os.X_OK)
+    assert (project / LOCKFILE).exists()
+
+
+def test_offline_install_rejects_tampered_tarball(tmp_path):
+    mirror, lock_dir = make_mirror(tmp_path)
+    make_tarball(mirror / tarball_name('dep', '2.0.0'), {'index.js': 'tampered'})
+    with pytest.raises(RuntimeError, match='Integrity check failed'):
+        offline_install(tmp_path, mirror, lock_dir)
+    assert not (tmp_path / 'node_modules').exists()
+
+
+def test_refresh_mirror_downloads_missing_and_prunes(tmp_path):
+    source, lock_dir = make_mirror(tmp_path)
+    mirror = tmp_path / 'node-mirror'
+    mirror.mkdir()
+    (mirror / 'stale-0.1.0.tgz').write_bytes(b'')
+
+    assert refresh_mirror(mirror, lock_dir) == {'downloaded': 4, 'cached': 0, 'removed': 1}
+    assert verify_integrity(mirror / tarball_name('dep', '2.0.0'), json.loads(
+        (lock_dir / LOCKFILE).read_text(encoding='utf-8'))['packages']['node_modules/dep']['integrity'])
+    assert refresh_mirror(mirror, lock_dir) == {'downloaded': 0, 'cached': 4, 'removed': 0}
+
+
+def test_matches_platform():
+    assert matches_platform({})
+    assert not matches_platform({'os': ['aix']})
+    assert matches_platform({'os': ['!aix']})
+
+
+def test_shipped_lockfile_pins_every_package():
+    lock = read_lockfile()
+    if lock is None:
+        pytest.skip('assets/packages/package-lock.json not generated; run scaffold_cache.py --update-lock')
+    root, pins = lock['packages'][''], read_pins()
+    assert root.get('dependencies') == pins['dependencies']
+    assert root.get('devDependencies') == pins['devDependencies']
+    packages = locked_packages(lock)
+    assert packages
+    for key, entry in lock['packages'].items():
+        if key and not entry.get('link') and not entry.get('inBundle'):
+            assert entry.get('resolved', '').startswith('https://'), key
+            assert entry.get('integrity', '').startswith('sha512-'), key
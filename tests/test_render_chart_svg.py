@@ -0,0 +1,81 @@
+"""Tests for static SVG chart rendering."""
+
+import xml.dom.minidom
+
+import pytest
+
+from generate_charts import chart_defaults, chart_from_records, compact_config, generate_and_save, resolve_colors, sample_chart
+from render_chart_svg import format_number, nice_ticks, render_directory, render_svg
+from utils import save_json
+
+
+COLORS = resolve_colors('consulting')
+
+
+class TestNiceTicks:
+    def test_covers_range(self):
+        ticks = nice_ticks(-5, 120)
+        assert ticks[0] <= -5 and ticks[-1] >= 120
+        steps = {round(b - a, 6) for a, b in zip(ticks, ticks[1:])}
+        assert len(steps) == 1
+
+    def test_flat_range(self):
+        assert nice_ticks(0, 0) == [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+class TestFormatNumber:
+    def test_formats(self):
+        assert format_number(1500) == '1.5k'
+        assert format_number(2_000_000) == '2M'
+        assert format_number(12.0) == '12'
+        assert format_number(0.125) == '0.12'
+
+
+class TestRenderSvg:
+    @pytest.mark.parametrize('chart_type', ['line', 'bar', 'waterfall', 'pie', 'donut'])
+    def test_sample_charts_are_valid_svg(self, chart_type):
+        svg = render_svg(sample_chart(chart_type, COLORS))
+        xml.dom.minidom.parseString(svg)
+        assert COLORS['primary'] in svg
+
+    def test_waterfall_uses_accent_for_negative_steps(self):
+        svg = render_svg(sample_chart('waterfall', COLORS))
+        assert svg.count(f'fill="{COLORS["accent"]}"') == 1
+
+    def test_labels_are_escaped(self):
+        config = sample_chart('bar', COLORS)
+        config['data']['labels'][0] = 'R&D <core>'
+        svg = render_svg(config)
+        assert 'R&amp;D &lt;core&gt;' in svg
+
+    def test_time_axis_line_uses_date_ticks(self):
+        records = [{'date': f'2024-{m:02d}-01', 'sales': m * 10} for m in range(1, 13)]
+        config = chart_from_records('line', records, {'x_key': 'date', 'y_key': 'sales'}, COLORS)
+        svg = render_svg(config)
+        xml.dom.minidom.parseString(svg)
+        assert 'Jan 2024' in svg and 'Dec 2024' in svg
+
+
+class TestRenderDirectory:
+    def test_compact_configs_use_shared_defaults(self, tmp_path):
+        defaults = chart_defaults(COLORS)
+        save_json(tmp_path / 'chart-defaults.json', {'theme': 'consulting', 'types': defaults})
+        save_json(tmp_path / 'chart_1.json', compact_config(sample_chart('bar', COLORS), defaults))
+        assert render_directory(tmp_path) == 1
+        svg = (tmp_path / 'chart_1.svg').read_text(encoding='utf-8')
+        assert COLORS['grid'] in svg
+        assert not (tmp_path / 'chart-defaults.svg').exists()
+        assert render_directory(tmp_path) == 0
+
+    def test_generate_and_save_renders_svg(self, tmp_path, sample_analysis, sample_content):
+        analysis_path = tmp_path / 'analysis.json'
+        types_path = tmp_path / 'types.json'
+        content_path = tmp_path / 'content.json'
+        save_json(analysis_path, sample_analysis)
+        save_json(types_path, {'slide_3': 'line'})
+        save_json(content_path, sample_content)
+        out = tmp_path / 'data'
+        generate_and_save(str(analysis_path), str(types_path), str(content_path), str(out), compact=True, svg=True)
+        assert (out / 'chart_1.svg').exists()
+        generate_and_save(str(analysis_path), str(types_path), str(content_path), str(out))
+        assert not (out / 'chart_1.svg').exists()
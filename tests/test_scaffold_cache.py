@@ -0,0 +1,114 @@
+"""Tests for the prebuilt Slidev scaffold cache."""
+
+import json
+import os
+import re
+import subprocess
+
+import scaffold_cache
+from package_mirror import LOCKFILE, read_pins
+from scaffold_cache import (
+    DEPENDENCIES,
+    DEV_DEPENDENCIES,
+    LINK_MODES,
+    MANIFEST_FILE,
+    ensure_scaffold,
+    install_dependencies,
+    link_tree,
+    materialise_scaffold,
+    read_manifest,
+    scaffold_key,
+)
+
+
+def make_scaffold(root):
+    scaffold = root / f'scaffold-{scaffold_key()}'
+    package = scaffold / 'node_modules' / 'chart.js'
+    package.mkdir(parents=True)
+    (package / 'index.js').write_text('export {}', encoding='utf-8')
+    bin_dir = scaffold / 'node_modules' / '.bin'
+    bin_dir.mkdir()
+    os.symlink('../chart.js/index.js', bin_dir / 'chart')
+    (scaffold / 'package.json').write_text(json.dumps({'name': 'staging', 'dependencies': {'chart.js': '^4'}}), encoding='utf-8')
+    (scaffold / 'package-lock.json').write_text('{}', encoding='utf-8')
+    (scaffold / MANIFEST_FILE).write_text(json.dumps({'key': scaffold_key(), 'manager': 'npm'}), encoding='utf-8')
+    return scaffold
+
+
+def test_scaffold_key_tracks_dependencies():
+    assert scaffold_key() == scaffold_key()
+    assert scaffold_key(['@slidev/cli']) != scaffold_key()
+
+
+def test_incomplete_scaffold_not_reused(tmp_path):
+    scaffold = make_scaffold(tmp_path)
+    assert read_manifest(scaffold)['manager'] == 'npm'
+    assert ensure_scaffold(tmp_path) == scaffold
+    (scaffold / MANIFEST_FILE).unlink()
+    assert read_manifest(scaffold) is None
+
+
+def test_materialise_links_modules_and_copies_package_json(tmp_path):
+    scaffold = make_scaffold(tmp_path / 'cache')
+    deck = tmp_path / 'Q3_deck'
+    mode = materialise_scaffold(scaffold, deck)
+
+    assert mode in LINK_MODES
+    assert json.loads((deck / 'package.json').read_text(encoding='utf-8'))['name'] == 'q3_deck'
+    assert json.loads((scaffold / 'package.json').read_text(encoding='utf-8'))['name'] == 'staging'
+    assert (deck / 'package-lock.json').exists() and not (deck / MANIFEST_FILE).exists()
+    linked = deck / 'node_modules' / 'chart.js' / 'index.js'
+    assert linked.read_text(encoding='utf-8') == 'export {}'
+    if mode == 'hardlink':
+        assert os.path.samefile(linked, scaffold / 'node_modules' / 'chart.js' / 'index.js')
+    assert os.readlink(deck / 'node_modules' / '.bin' / 'chart') == '../chart.js/index.js'
+
+
+def test_link_tree_copy_mode(tmp_path):
+    scaffold = make_scaffold(tmp_path)
+    count = link_tree(scaffold / 'node_modules', tmp_path / 'out', 'copy')
+    assert count == 2
+    assert not os.path.samefile(tmp_path / 'out' / 'chart.js' / 'index.js', scaffold / 'node_modules' / 'chart.js' / 'index.js')
+
+
+def record_installs(monkeypatch, missing=()):
+    """Record package manager commands instead of running them; managers in `missing` are not found."""
+    commands = []
+
+    def run(command, **kwargs):
+        if command[0] in missing:
+            raise FileNotFoundError(command[0])
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0)
+
+    monkeypatch.setattr(scaffold_cache.subprocess, 'run', run)
+    return commands
+
+
+def test_shipped_pins_cover_dependencies_exactly():
+    pins = read_pins()
+    assert sorted(pins['dependencies']) == sorted(DEPENDENCIES)
+    assert sorted(pins['devDependencies']) == sorted(DEV_DEPENDENCIES)
+    versions = list(pins['dependencies'].values()) + list(pins['devDependencies'].values())
+    assert all(re.fullmatch(r'\d+\.\d+\.\d+', version) for version in versions)
+
+
+def test_install_uses_shipped_pins(tmp_path, monkeypatch):
+    commands = record_installs(monkeypatch)
+    project = tmp_path / 'project'
+    project.mkdir()
+    assert install_dependencies(project, mirror_dir=tmp_path / 'no-mirror') == 'bun'
+    assert commands == [['bun', 'install']]
+    assert json.loads((project / 'package.json').read_text(encoding='utf-8')) == read_pins()
+
+
+def test_install_prefers_lockfile_over_pins(tmp_path, monkeypatch):
+    commands = record_installs(monkeypatch, missing={'bun'})
+    lock_dir, project = tmp_path / 'packages', tmp_path / 'project'
+    lock_dir.mkdir()
+    project.mkdir()
+    (lock_dir / 'package.json').write_text('{"name": "deck"}', encoding='utf-8')
+    (lock_dir / LOCKFILE).write_text('{"lockfileVersion": 3, "packages": {}}', encoding='utf-8')
+    assert install_dependencies(project, mirror_dir=tmp_path / 'no-mirror', lock_dir=lock_dir) == 'npm'
+    assert commands == [['npm', 'ci']]
+    assert (project / LOCKFILE).exists()
@@ -4,7 +4,7 @@ import tempfile
 from pathlib import Path
 
 from utils import save_json
-from generate_speaker_notes import sentence
+from generate_speaker_notes import chart_notes, sentence
 
 
 class TestSentence:
@@ -49,3 +49,14 @@ class TestSpeakerNotesGeneration:
             content = output_path.read_text()
             assert 'Speaker Notes' in content
             assert 'Slide 1' in content
+
+
+class TestChartNotes:
+    def test_folded_categories_are_described(self):
+        meta = {'top_n': {'n': 5, 'categories': 40, 'folded': 35, 'other_label': 'Other'}}
+        notes = chart_notes(meta)
+        assert len(notes) == 1
+        assert '35 smaller categories of 40' in notes[0]
+
+    def test_no_meta(self):
+        assert chart_notes({}) == []
@@ -83,6 +83,48 @@ class TestInvalidPayloads:
         errors = validate_analysis_payload(payload)
         assert any('chart_type' in e for e in errors)
 
+    def test_chart_with_unknown_aggregation(self):
+        payload = {
+            'title': 'Deck',
+            'slides': [{
+                'layout': 'chart-full',
+                'title': 'Chart slide.',
+                'visual': {'type': 'chart', 'chart_type': 'bar', 'data_file': 'chart_1.json', 'agg': 'avg'},
+            }],
+        }
+        errors = validate_analysis_payload(payload)
+        assert any('visual.agg' in e for e in errors)
+
+    def test_chart_with_invalid_join(self):
+        payload = {
+            'title': 'Deck',
+            'slides': [{
+                'layout': 'chart-full',
+                'title': 'Chart slide.',
+                'visual': {
+                    'type': 'chart', 'chart_type': 'bar', 'data_file': 'chart_1.json',
+                    'join': {'source_file': 'hr.csv', 'on': 'quarter', 'how': 'outer'},
+                },
+            }],
+        }
+        errors = validate_analysis_payload(payload)
+        assert any('visual.join' in e for e in errors)
+
+    def test_chart_with_unsafe_expression(self):
+        payload = {
+            'title': 'Deck',
+            'slides': [{
+                'layout': 'chart-full',
+                'title': 'Chart slide.',
+                'visual': {
+                    'type': 'chart', 'chart_type': 'line', 'data_file': 'chart_1.json',
+                    'y_expr': "__import__('os').getcwd()",
+                },
+            }],
+        }
+        errors = validate_analysis_payload(payload)
+        assert any('visual.y_expr' in e for e in errors)
+
     def test_image_without_filename(self):
         payload = {
             'title': 'Deck',
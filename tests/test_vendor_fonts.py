@@ -0,0 +1,105 @@
+"""Tests for vendoring and declaring deck fonts."""
+
+import pytest
+
+from vendor_fonts import (
+    FONTS_CSS,
+    FONTS_DIR,
+    deck_font_families,
+    discover_faces,
+    disable_font_provider,
+    parse_font_file,
+    used_glyphs,
+    vendor_fonts,
+)
+from utils import save_json
+
+
+def make_deck(tmp_path):
+    deck = tmp_path / 'deck'
+    (deck / 'styles').mkdir(parents=True)
+    (deck / 'styles' / 'theme.css').write_text(
+        ".slidev-layout { font-family: 'Source Sans 3', 'Inter', system-ui, sans-serif; }\n"
+        "h1 { font-family: Georgia, serif; }\n",
+        encoding='utf-8',
+    )
+    (deck / 'slides.md').write_text(
+        '---\ntheme: none\nlayout: DeckTitle\nfonts:\n  sans: Inter\n  serif: Georgia\n---\n\nRevenue grew 12% → €4m\n',
+        encoding='utf-8',
+    )
+    return deck
+
+
+class TestFontDiscovery:
+    def test_families_from_theme_and_headmatter(self, tmp_path):
+        assert deck_font_families(make_deck(tmp_path)) == ['Source Sans 3', 'Inter', 'Georgia']
+
+    @pytest.mark.parametrize('name, expected', [
+        ('Inter-Regular.ttf', ('Inter', '400', 'normal')),
+        ('Inter-SemiBoldItalic.woff2', ('Inter', '600', 'italic')),
+        ('SourceSans3-Bold.otf', ('Source Sans 3', '700', 'normal')),
+        ('Inter[wght].ttf', ('Inter', '100 900', 'normal')),
+        ('Inter-VariableFont_wght.ttf', ('Inter', '100 900', 'normal')),
+    ])
+    def test_parse_font_file(self, tmp_path, name, expected):
+        face = parse_font_file(tmp_path / name, ['Inter', 'Source Sans 3'])
+        assert (face['family'], face['weight'], face['style']) == expected
+
+    def test_other_families_and_files_ignored(self, tmp_path):
+        assert parse_font_file(tmp_path / 'InterTight-Regular.ttf', ['Inter']) is None
+        assert parse_font_file(tmp_path / 'Inter-Regular.txt', ['Inter']) is None
+
+    def test_prefers_woff2_source(self, tmp_path):
+        for name in ('Inter-Regular.ttf', 'Inter-Regular.woff2'):
+            (tmp_path / name).write_bytes(b'font')
+        faces = discover_faces(tmp_path, ['Inter'])
+        assert [face['source'].name for face in faces] == ['Inter-Regular.woff2']
+
+
+def test_used_glyphs_include_slides_and_chart_labels(tmp_path):
+    deck = make_deck(tmp_path)
+    save_json(deck / 'public' / 'data' / 'chart_1.json', {'data': {'labels': ['Zürich']}})
+    glyphs = used_glyphs(deck)
+    assert {'→', '€', 'ü', 'A', '0'} <= glyphs
+    assert '\n' not in glyphs
+
+
+def test_disable_font_provider_is_idempotent(tmp_path):
+    slides_md = make_deck(tmp_path) / 'slides.md'
+    assert disable_font_provider(slides_md) is True
+    assert disable_font_provider(slides_md) is False
+    assert 'fonts:\n  provider: none\n  sans: Inter\n' in slides_md.read_text(encoding='utf-8')
+
+
+def test_vendor_fonts_writes_faces_css_and_preloads(tmp_path):
+    deck = make_deck(tmp_path)
+    fonts = tmp_path / 'fonts'
+    fonts.mkdir()
+    (fonts / 'Inter-Regular.woff2').write_bytes(b'inter')
+    (fonts / 'SourceSans3-BoldItalic.woff2').write_bytes(b'source')
+
+    # subset=False keeps the test independent of fontTools.
+    faces = vendor_fonts(deck, fonts, display='block', subset=False)
+
+    assert sorted(path.name for path in (deck / FONTS_DIR).iterdir()) == ['inter-400.woff2', 'sourcesans3-700-italic.woff2']
+    css = (deck / FONTS_CSS).read_text(encoding='utf-8')
+    assert css.count('@font-face') == len(faces) == 2
+    assert "font-family: 'Source Sans 3';" in css and 'font-display: block;' in css
+    assert "url('../fonts/inter-400.woff2') format('woff2')" in css
+    html = (deck / 'index.html').read_text(encoding='utf-8')
+    assert 'rel="preload" href="%BASE_URL%fonts/inter-400.woff2" as="font" type="font/woff2" crossorigin' in html
+    config = (deck / 'slidev.config.ts').read_text(encoding='utf-8')
+    assert "provider: 'none'" in config and "'styles/fonts.css'" in config
+
+
+def test_vendor_fonts_keeps_custom_index_html(tmp_path):
+    deck = make_deck(tmp_path)
+    (deck / 'index.html').write_text('<head><meta name="x"></head>\n', encoding='utf-8')
+    (tmp_path / 'fonts').mkdir()
+    vendor_fonts(deck, tmp_path / 'fonts', subset=False)
+    assert (deck / 'index.html').read_text(encoding='utf-8') == '<head><meta name="x"></head>\n'
+
+
+def test_vendor_fonts_rejects_missing_dir(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        vendor_fonts(make_deck(tmp_path), tmp_path / 'missing')